@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+"""
+Discord delivery benchmark / load test.
+
+Drives the real SchedulerCog, NewsCog and DedupeCog against fake channels
+and threads that simulate API latency and 429 rate limits (per-channel
+5 msgs / 5 s and a global 50 req/s bucket, retried the way discord.py does).
+State and sent-history live in a temp dir, so real data is never touched.
+
+    python -m benchmarks.bench_delivery --channels 2000 --concurrency 8 --output delivery.json
+    python -m benchmarks.bench_delivery --mode thread --articles 40
+"""
+import argparse
+import asyncio
+import json
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import state_store
+from cogs import dedupe, news, scheduler
+from cogs.scraper import ScraperCog
+from scraper.models import Article
+
+
+class FakeDiscord:
+    """Shared stand-in for Discord's REST API: latency plus rate-limit buckets."""
+
+    def __init__(
+        self,
+        latency_ms: float = 80,
+        jitter_ms: float = 40,
+        per_channel=(5, 5.0),
+        global_per_second: int = 50,
+        rate_limit_prob: float = 0.0,
+        seed: int = 1,
+    ):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.per_channel_limit, self.per_channel_window = per_channel
+        self.global_per_second = global_per_second
+        self.rate_limit_prob = rate_limit_prob
+        self.rng = random.Random(seed)
+        self._channel_sends = {}
+        self._global_sends = deque()
+        self.stats = {"requests": 0, "rate_limited": 0, "retry_wait_s": 0.0}
+
+    def _retry_after(self, channel_id: int):
+        now = time.monotonic()
+        while self._global_sends and now - self._global_sends[0] >= 1.0:
+            self._global_sends.popleft()
+        if len(self._global_sends) >= self.global_per_second:
+            return 1.0 - (now - self._global_sends[0])
+
+        sends = self._channel_sends.setdefault(channel_id, deque())
+        while sends and now - sends[0] >= self.per_channel_window:
+            sends.popleft()
+        if len(sends) >= self.per_channel_limit:
+            return self.per_channel_window - (now - sends[0])
+
+        if self.rate_limit_prob and self.rng.random() < self.rate_limit_prob:
+            return self.rng.uniform(0.1, 1.0)
+        return None
+
+    async def request(self, channel_id: int):
+        while True:
+            retry_after = self._retry_after(channel_id)
+            if retry_after is None:
+                break
+            # discord.py sleeps for retry_after and retries transparently on 429
+            self.stats["rate_limited"] += 1
+            self.stats["retry_wait_s"] += retry_after
+            await asyncio.sleep(retry_after)
+        now = time.monotonic()
+        self._global_sends.append(now)
+        self._channel_sends[channel_id].append(now)
+        self.stats["requests"] += 1
+        await asyncio.sleep(self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0))
+
+
+class FakeMessage:
+    def __init__(self, channel, content=None, embeds=()):
+        self.channel = channel
+        self.content = content
+        self.embeds = list(embeds)
+        self.id = id(self)
+
+    async def edit(self, **kwargs):
+        await self.channel.api.request(self.channel.id)
+
+    async def create_thread(self, name: str):
+        await self.channel.api.request(self.channel.id)
+        return FakeChannel(self.channel.api, self.id, name=name)
+
+
+class FakeChannel:
+    """Accepts the same send() kwargs the cogs use; threads are FakeChannels too."""
+
+    def __init__(self, api: FakeDiscord, channel_id: int, name: str = ""):
+        self.api = api
+        self.id = channel_id
+        self.name = name
+        self.messages = 0
+        self.embeds = 0
+
+    async def send(self, content=None, embed=None, embeds=None, view=None, file=None, **kwargs):
+        await self.api.request(self.id)
+        sent = [embed] if embed else list(embeds or [])
+        self.messages += 1
+        self.embeds += len(sent)
+        return FakeMessage(self, content, sent)
+
+
+class FakeBot:
+    def __init__(self):
+        self.cogs = {}
+        self.channels = {}
+
+    def get_cog(self, name):
+        return self.cogs.get(name)
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    async def wait_until_ready(self):
+        await asyncio.Event().wait()
+
+
+class SyntheticScraper(ScraperCog):
+    """ScraperCog serving generated articles; scraping and archive pruning are no-ops."""
+
+    def __init__(self, bot, articles_per_category: int, paragraphs: int, seed: int = 1):
+        super().__init__(bot)
+        # the base cog prunes the real data/archive and data/bodies; stop it before its first run
+        self.archive_prune_task.cancel()
+        rng = random.Random(seed)
+        today = datetime.now().isoformat(timespec="seconds")
+        words = "brunei ministry community national economy youth sultanate project officials".split()
+        self._articles = {
+            category: [
+                Article(
+                    url=f"https://example.invalid/{category}-{i}/",
+                    title=f"{category.title()} story {i}",
+                    date=today,
+                    content="\n".join(
+                        " ".join(rng.choice(words) for _ in range(40)).capitalize() + "." for _ in range(paragraphs)
+                    ),
+                    categories=[category],
+                )
+                for i in range(articles_per_category)
+            ]
+            for category in self.get_categories()
+        }
+
+    async def run_scraper(
+        self, force: bool = False, categories: list = None, progress_callback=None, article_callback=None
+    ):
+        return True
+
+    def load_articles(self):
+        return self._articles
+
+    async def load_articles_async(self):
+        return self._articles
+
+
+def _peak_memory(tracing: bool) -> dict:
+    result = {"max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)}
+    if tracing:
+        result["python_heap_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+    return result
+
+
+async def run_benchmark(args) -> dict:
+    tmp = Path(tempfile.mkdtemp(prefix="bb-delivery-"))
+    state_store._store = state_store.StateStore(tmp / "state.db")
+    scheduler.DELIVERY_CONCURRENCY = args.concurrency
+    scheduler.SEND_JITTER = (args.send_jitter_ms / 1000, args.send_jitter_ms / 1000)
+
+    api = FakeDiscord(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit_prob=args.rate_limit_prob,
+        seed=args.seed,
+    )
+    bot = FakeBot()
+    scraper_cog = SyntheticScraper(bot, args.articles, args.paragraphs, seed=args.seed)
+    news_cog = news.NewsCog(bot)
+    history = dedupe.SentHistory(dedupe.AppendLogBackend(tmp / "sent_history.json", tmp / "sent_history.log"))
+    dedupe_cog = dedupe.DedupeCog(bot, store=history)
+    bot.cogs.update({"ScraperCog": scraper_cog, "NewsCog": news_cog, "DedupeCog": dedupe_cog})
+    sched = scheduler.SchedulerCog(bot)
+    bot.cogs["SchedulerCog"] = sched
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    try:
+        if args.mode == "thread":
+            thread = FakeChannel(api, 1, name="bench-thread")
+            articles = scraper_cog.get_articles_for_category("national")
+            t0 = time.perf_counter()
+            await news_cog._post_articles_to_thread(thread, "national", articles)
+            seconds = time.perf_counter() - t0
+            workload = {"articles": len(articles), "messages": thread.messages, "embeds": thread.embeds}
+        else:
+            rng = random.Random(args.seed)
+            categories = scraper_cog.get_categories()
+            t_setup = time.perf_counter()
+            with sched.store.transaction() as tx:
+                for n in range(args.channels):
+                    guild_id, channel_id = str(n % args.guilds), str(10_000 + n)
+                    enabled = rng.sample(categories, rng.randint(1, args.max_categories))
+                    sched.schedule_state.setdefault(guild_id, {"channels": {}})["channels"][channel_id] = {
+                        cat: True for cat in enabled
+                    }
+                    sched._save_channel(tx, guild_id, channel_id)
+                    bot.channels[int(channel_id)] = FakeChannel(api, int(channel_id))
+            setup_seconds = time.perf_counter() - t_setup
+
+            t0 = time.perf_counter()
+            await sched._post_scheduled_news()
+            seconds = time.perf_counter() - t0
+            messages = sum(c.messages for c in bot.channels.values())
+            workload = {
+                "channels": args.channels,
+                "guilds": args.guilds,
+                "digests": messages,
+                "messages": messages,
+                "setup_seconds": round(setup_seconds, 3),
+            }
+    finally:
+        sched.daily_news_task.cancel()
+        await scraper_cog.cog_unload()
+        await dedupe_cog.cog_unload()
+
+    return {
+        "benchmark": "delivery",
+        "mode": args.mode,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "config": {
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "send_jitter_ms": args.send_jitter_ms,
+            "rate_limit_prob": args.rate_limit_prob,
+            "articles_per_category": args.articles,
+        },
+        "workload": workload,
+        "seconds": round(seconds, 3),
+        "messages_per_s": round(workload["messages"] / seconds, 2) if seconds else None,
+        "api": {
+            "requests": api.stats["requests"],
+            "rate_limited": api.stats["rate_limited"],
+            "retry_wait_s": round(api.stats["retry_wait_s"], 3),
+        },
+        "memory": _peak_memory(args.tracemalloc),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark digest delivery against a fake Discord")
+    parser.add_argument("--mode", choices=["scheduled", "thread"], default="scheduled")
+    parser.add_argument("--channels", type=int, default=1000)
+    parser.add_argument("--guilds", type=int, default=100)
+    parser.add_argument("--max-categories", type=int, default=3, help="Max categories enabled per channel")
+    parser.add_argument("--articles", type=int, default=10, help="Articles per category")
+    parser.add_argument("--paragraphs", type=int, default=12, help="Paragraphs per article body")
+    parser.add_argument("--concurrency", type=int, default=1, help="Channels delivered to concurrently")
+    parser.add_argument("--latency-ms", type=float, default=80, help="Simulated API latency")
+    parser.add_argument("--jitter-ms", type=float, default=40)
+    parser.add_argument("--send-jitter-ms", type=float, default=0, help="Scheduler pause between a channel's digests")
+    parser.add_argument("--rate-limit-prob", type=float, default=0.0, help="Chance of an injected 429 per request")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also report Python heap peak (slower)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="Write the JSON result here (also printed)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args))
+    payload = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+"""
+Offline scraper benchmark.
+
+Starts the local stand-in site, points the scrapers at it through
+BORNEO_BULLETIN_URL / BORNEO_DATA_DIR (a temp dir, so real data is never
+touched), then runs `scrape_links.main` and `scrape_all_articles` and
+reports wall time, throughput, Playwright protocol round-trips and peak RSS.
+
+    python -m benchmarks.bench_scraper --categories national,world --latency-ms 80 --output bench.json
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import platform
+import resource
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.standin_site import StandinSite
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _count_protocol_calls():
+    """
+    Count client -> driver messages, i.e. the round-trips each Playwright
+    call costs (which the driver turns into CDP commands). Returns a one-item
+    list used as a mutable counter, or None if the internals moved.
+    """
+    try:
+        from playwright._impl._connection import Connection
+    except ImportError:
+        return None
+    counter = [0]
+    for name in ("_send_message_to_server", "send_message_to_server"):
+        original = getattr(Connection, name, None)
+        if original is None:
+            continue
+
+        def counted(self, *args, _original=original, **kwargs):
+            counter[0] += 1
+            return _original(self, *args, **kwargs)
+
+        setattr(Connection, name, counted)
+        return counter
+    return None
+
+
+class RssSampler:
+    """Samples RSS of this process and its descendants (Chromium, the driver) from /proc."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_tree_kb = 0
+        self._task = None
+
+    @staticmethod
+    def _tree_rss_kb(root: int) -> int:
+        children = {}
+        for entry in Path("/proc").iterdir():
+            if not entry.name.isdigit():
+                continue
+            try:
+                stat = (entry / "stat").read_text()
+                ppid = int(stat.rsplit(")", 1)[1].split()[1])
+                children.setdefault(ppid, []).append(int(entry.name))
+            except Exception:
+                continue
+        total, stack = 0, [root]
+        while stack:
+            pid = stack.pop()
+            stack.extend(children.get(pid, []))
+            try:
+                for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+            except Exception:
+                continue
+        return total
+
+    async def _run(self):
+        while True:
+            self.peak_tree_kb = max(self.peak_tree_kb, self._tree_rss_kb(os.getpid()))
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if Path("/proc/self/status").exists():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+async def run_benchmark(args) -> dict:
+    port = _free_port()
+    data_dir = Path(tempfile.mkdtemp(prefix="bb-bench-"))
+    os.environ["BORNEO_BULLETIN_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["BORNEO_DATA_DIR"] = str(data_dir)
+
+    # import only after the environment points at the stand-in site
+    scrape_links = importlib.import_module("scraper.scrape_links")
+    scrape_articles = importlib.import_module("scraper.scrape_articles")
+    telemetry_mod = importlib.import_module("scraper.telemetry")
+
+    categories = [c.strip() for c in args.categories.split(",") if c.strip()] or list(scrape_links.CATEGORIES)
+    site = StandinSite(
+        {cat: info["pagination_tdi"] for cat, info in scrape_links.CATEGORIES.items()},
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        articles_per_page=args.articles_per_page,
+        today_pages=args.today_pages,
+        shared_ratio=args.shared_ratio,
+    )
+    await site.start(port=port)
+    protocol_calls = _count_protocol_calls()
+    sampler = RssSampler()
+    sampler.start()
+    telemetry = telemetry_mod.RunTelemetry(trigger="bench", categories=categories)
+
+    try:
+        t0 = time.perf_counter()
+        comparison = await scrape_links.main(categories=categories, telemetry=telemetry)
+        links_seconds = time.perf_counter() - t0
+        links_calls = protocol_calls[0] if protocol_calls else None
+        pages_after_links = site.stats["category_pages"] + site.stats["ajax_pages"]
+
+        t1 = time.perf_counter()
+        await scrape_articles.scrape_all_articles(
+            force_rescrape=True,
+            timeout=args.timeout,
+            retries=args.retries,
+            categories=categories,
+            telemetry=telemetry,
+        )
+        articles_seconds = time.perf_counter() - t1
+    finally:
+        await sampler.stop()
+        await site.stop()
+
+    with open(data_dir / "articles.json", "r", encoding="utf-8") as f:
+        stored = sum(len(v) for v in json.load(f).values())
+
+    total_seconds = links_seconds + articles_seconds
+    html_pages = site.stats["category_pages"] + site.stats["ajax_pages"] + site.stats["article_pages"]
+    self_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return {
+        "benchmark": "scraper",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": {
+            "categories": categories,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "articles_per_page": args.articles_per_page,
+            "today_pages": args.today_pages,
+            "shared_ratio": args.shared_ratio,
+            "fixtures": "recorded" if site.recorded else "synthetic",
+        },
+        "links": {
+            "seconds": round(links_seconds, 3),
+            "links_found": comparison["total_articles"],
+            "listing_pages": pages_after_links,
+            "pages_per_s": round(pages_after_links / links_seconds, 3) if links_seconds else None,
+            "protocol_round_trips": links_calls,
+        },
+        "articles": {
+            "seconds": round(articles_seconds, 3),
+            "fetched": site.stats["article_pages"],
+            "stored": stored,
+            "articles_per_s": round(site.stats["article_pages"] / articles_seconds, 3) if articles_seconds else None,
+            "protocol_round_trips": (protocol_calls[0] - links_calls) if protocol_calls else None,
+        },
+        "total": {
+            "seconds": round(total_seconds, 3),
+            "html_pages": html_pages,
+            "pages_per_s": round(html_pages / total_seconds, 3) if total_seconds else None,
+            "requests": site.stats["requests"],
+            "bytes_served": site.stats["bytes"],
+            # Playwright client -> driver calls; each maps onto one or more CDP commands
+            "cdp_round_trips": protocol_calls[0] if protocol_calls else None,
+        },
+        "peak_rss_mb": {
+            "python": round(self_kb / 1024, 1),
+            "largest_child": round(children_kb / 1024, 1),
+            "process_tree": round(sampler.peak_tree_kb / 1024, 1) if sampler.peak_tree_kb else None,
+        },
+        "stages": telemetry_mod.stage_stats([telemetry.to_dict()]),
+        "counters": telemetry.counters,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against a local stand-in site")
+    parser.add_argument("--categories", default="national,world", help="Comma-separated categories ('' for all)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Server latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Extra random latency per request")
+    parser.add_argument("--articles-per-page", type=int, default=8)
+    parser.add_argument("--today-pages", type=int, default=2, help="Paginated pages with today's articles")
+    parser.add_argument("--shared-ratio", type=float, default=0.0, help="Fraction of links shared across categories")
+    parser.add_argument("--timeout", type=int, default=15000)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--output", type=Path, help="Write the JSON result here (also printed)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args))
+    payload = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+
+
+if __name__ == "__main__":
+    main()
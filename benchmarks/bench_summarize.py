@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Summarizer throughput benchmark.
+
+Runs summarize_articles.summarize_batch() over synthetic news-like articles
+(Zipf-distributed vocabulary, varied sentence lengths) and reports
+articles/s and sentences/s for a cold batch and for a warm one served from
+the summary cache, with NumPy and with the pure-Python fallback. The cache
+lives in a temp dir, so real data is never touched.
+
+    python -m benchmarks.bench_summarize --articles 500 --sentences 30 --output summarize.json
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from scraper import summarize_articles
+from scraper.models import Article
+
+
+def synthetic_articles(count: int, sentences: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    stop = ["the", "of", "and", "to", "in", "said", "was"]
+    articles = []
+    for i in range(count):
+        topic = rng.sample(vocabulary[:500], 8)
+        paragraphs = []
+        for _ in range(max(1, sentences // 3)):
+            paragraph = []
+            for _ in range(3):
+                words = rng.choices(vocabulary, weights, k=rng.randint(8, 30))
+                words += rng.sample(topic, 2) + rng.sample(stop, 3)
+                rng.shuffle(words)
+                paragraph.append(" ".join(words).capitalize() + ".")
+            paragraphs.append(" ".join(paragraph))
+        articles.append(Article(url=f"https://example.invalid/{i}", title=f"Article {i}", content="\n".join(paragraphs)))
+    return articles
+
+
+def run(articles: list, cache_dir: Path, numpy: bool) -> dict:
+    saved = summarize_articles.np
+    if not numpy:
+        summarize_articles.np = None
+    try:
+        cache_path = cache_dir / f"cache-{'numpy' if numpy else 'python'}.json"
+        sentences = sum(len(summarize_articles.split_sentences(a.content)) for a in articles)
+        result = {}
+        for phase in ("cold", "warm"):
+            start = time.perf_counter()
+            stats = summarize_articles.summarize_batch(articles, summarize_articles.SummaryCache(cache_path))
+            seconds = time.perf_counter() - start
+            result[phase] = {
+                "seconds": round(seconds, 4),
+                "articles_per_s": round(len(articles) / seconds, 1),
+                "sentences_per_s": round(sentences / seconds, 1),
+                "summarized": stats["summarized"],
+                "cached": stats["cached"],
+            }
+        return result
+    finally:
+        summarize_articles.np = saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the extractive summarizer")
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--sentences", type=int, default=30, help="Sentences per article")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="Write the JSON result here (also printed)")
+    args = parser.parse_args()
+
+    result = {"articles": args.articles, "sentences_per_article": args.sentences, "backends": {}}
+    with tempfile.TemporaryDirectory(prefix="bench_summarize_") as tmp:
+        backends = ["numpy", "python"] if summarize_articles.np is not None else ["python"]
+        for backend in backends:
+            # fresh objects per backend so the cold run really summarises everything
+            articles = synthetic_articles(args.articles, args.sentences, args.seed)
+            result["backends"][backend] = run(articles, Path(tmp), backend == "numpy")
+    payload = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+
+
+if __name__ == "__main__":
+    main()
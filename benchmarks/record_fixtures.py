@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Record real category, pagination AJAX and article pages for the stand-in site.
+
+Run once on a machine that can reach the site:
+    python -m benchmarks.record_fixtures --categories national,world --pages 2 --articles 10
+
+Recordings land in benchmarks/fixtures/recorded/ and take precedence over the
+synthetic templates when the benchmark runs.
+"""
+import argparse
+import asyncio
+from urllib.parse import parse_qs, urlparse
+
+from playwright.async_api import async_playwright
+
+from benchmarks.standin_site import RECORDED_DIR
+from scraper.scrape_links import CATEGORIES, TOP_ARTICLES_SELECTOR
+
+
+def _slug(url: str) -> str:
+    return urlparse(url).path.strip("/").replace("/", "_")
+
+
+async def record(categories, pages: int, articles: int):
+    RECORDED_DIR.mkdir(parents=True, exist_ok=True)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+
+        for category in categories:
+            info = CATEGORIES[category]
+            ajax_bodies = []
+
+            async def on_response(resp):
+                if "admin-ajax.php" in resp.url and resp.request.method == "POST":
+                    form = parse_qs(resp.request.post_data or "")
+                    current = form.get("td_current_page", ["2"])[0]
+                    ajax_bodies.append((current, await resp.text()))
+
+            page.on("response", on_response)
+            await page.goto(info["url"])
+            await page.wait_for_selector(TOP_ARTICLES_SELECTOR)
+            (RECORDED_DIR / f"category_{category}.html").write_text(await page.content(), encoding="utf-8")
+
+            tdi = info["pagination_tdi"]
+            links = [await a.get_attribute("href") for a in await page.query_selector_all(f"{tdi} .td-module-thumb a")]
+            for _ in range(pages):
+                next_button = await page.query_selector(f"#next-page-{tdi[1:]}")
+                if not next_button:
+                    break
+                await next_button.evaluate("el => el.click()")
+                await page.wait_for_timeout(1500)
+            page.remove_listener("response", on_response)
+            for current, body in ajax_bodies:
+                (RECORDED_DIR / f"ajax_{category}_{current}.json").write_text(body, encoding="utf-8")
+            print(f"[{category}] recorded category page and {len(ajax_bodies)} AJAX page(s)")
+
+            for url in [u for u in links if u][:articles]:
+                await page.goto(url)
+                await page.wait_for_selector(".tdb-title-text")
+                (RECORDED_DIR / f"article_{_slug(url)}.html").write_text(await page.content(), encoding="utf-8")
+                print(f"[{category}] recorded {url}")
+
+        await browser.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record site fixtures for the offline scraper benchmark")
+    parser.add_argument("--categories", default="national", help="Comma-separated categories")
+    parser.add_argument("--pages", type=int, default=2, help="Pagination clicks to record per category")
+    parser.add_argument("--articles", type=int, default=10, help="Articles to record per category")
+    args = parser.parse_args()
+    asyncio.run(record([c.strip() for c in args.categories.split(",") if c.strip()], args.pages, args.articles))
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+"""
+Local stand-in for borneobulletin.com.bn used by the scraper benchmarks.
+
+Serves category pages (top block + `tdi_*` paginated block whose "next"
+button loads further pages over AJAX) and article pages with the same
+selectors the scrapers rely on. Pages come from `fixtures/recorded/` when
+recordings exist (see record_fixtures.py), otherwise they are generated
+from the templates in `fixtures/`.
+
+Run standalone: python -m benchmarks.standin_site --port 8765 --latency-ms 80
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from string import Template
+
+from aiohttp import web
+
+logger = logging.getLogger("standin_site")
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+RECORDED_DIR = FIXTURES_DIR / "recorded"
+REAL_SITE = "https://borneobulletin.com.bn"
+
+WORDS = (
+    "brunei minister said the bandar seri begawan ministry community youth "
+    "programme development economic national sultanate officials residents "
+    "project support initiative annual event students health digital"
+).split()
+
+
+def _load_template(name: str) -> Template:
+    return Template((FIXTURES_DIR / name).read_text(encoding="utf-8"))
+
+
+class StandinSite:
+    """
+    aiohttp app mimicking the site's structure, with configurable latency.
+
+    `today_pages` paginated pages carry "hours ago" articles; the page after
+    them is two days old so the link scraper stops paginating.
+    """
+
+    def __init__(
+        self,
+        pagination_tdi: dict,
+        latency_ms: float = 50,
+        jitter_ms: float = 0,
+        articles_per_page: int = 8,
+        today_pages: int = 2,
+        paragraphs: int = 12,
+        shared_ratio: float = 0.0,
+        seed: int = 1,
+        recorded_dir: Path = RECORDED_DIR,
+    ):
+        self.pagination_tdi = {cat: tdi.lstrip("#") for cat, tdi in pagination_tdi.items()}
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.articles_per_page = articles_per_page
+        self.today_pages = today_pages
+        self.paragraphs = paragraphs
+        # fraction of each category's links that point at another category's story
+        self.shared_ratio = shared_ratio
+        self.seed = seed
+        self.recorded_dir = recorded_dir
+        self.recorded = recorded_dir.exists() and any(recorded_dir.glob("category_*.html"))
+        self.base_url = None
+        self.stats = {"requests": 0, "category_pages": 0, "ajax_pages": 0, "article_pages": 0, "bytes": 0}
+        self._runner = None
+        self._category_tpl = _load_template("category.html")
+        self._module_tpl = _load_template("module.html")
+        self._article_tpl = _load_template("article.html")
+
+    # --- synthetic content -------------------------------------------------
+
+    def _slug(self, category: str, page: int, index: int) -> str:
+        if self.shared_ratio and index < int(self.articles_per_page * self.shared_ratio):
+            # same story listed under several categories
+            return f"shared-story-{page}-{index}"
+        return f"{category}-story-{page}-{index}"
+
+    def _module(self, category: str, page: int, index: int, today: bool) -> str:
+        slug = self._slug(category, page, index)
+        when = datetime.now() - (timedelta(hours=1 + index % 6) if today else timedelta(days=2))
+        return self._module_tpl.substitute(
+            url=f"{self.base_url}/{slug}/",
+            title=slug.replace("-", " ").title(),
+            datetime=when.isoformat(timespec="seconds"),
+            age=f"{1 + index % 6} hours ago" if today else "2 days ago",
+        )
+
+    def _modules(self, category: str, page: int) -> str:
+        today = page <= self.today_pages
+        return "\n".join(self._module(category, page, i, today) for i in range(self.articles_per_page))
+
+    def _category_html(self, category: str) -> str:
+        top = "\n".join(self._module(category, 0, i, True) for i in range(5))
+        return self._category_tpl.substitute(
+            category=category,
+            category_title=category.capitalize(),
+            tdi_id=self.pagination_tdi.get(category, "tdi_106"),
+            top_modules=top,
+            modules=self._modules(category, 1),
+        )
+
+    def _article_html(self, slug: str) -> str:
+        rng = random.Random(f"{self.seed}:{slug}")
+        paragraphs = "\n".join(
+            "      <p>" + " ".join(rng.choice(WORDS) for _ in range(rng.randint(25, 60))).capitalize() + ".</p>"
+            for _ in range(self.paragraphs)
+        )
+        now = datetime.now()
+        return self._article_tpl.substitute(
+            title=slug.replace("-", " ").title(),
+            datetime=now.isoformat(timespec="seconds"),
+            date_text=now.strftime("%B %d, %Y"),
+            image=f"{self.base_url}/wp-content/uploads/{slug}.jpg",
+            caption=f"Photo for {slug}",
+            paragraphs=paragraphs,
+        )
+
+    # --- recorded content --------------------------------------------------
+
+    def _recorded(self, name: str):
+        path = self.recorded_dir / name
+        if not path.exists():
+            return None
+        text = path.read_text(encoding="utf-8")
+        # inline theme config uses JSON-escaped URLs
+        text = text.replace(REAL_SITE.replace("/", "\\/"), self.base_url.replace("/", "\\/"))
+        return text.replace(REAL_SITE, self.base_url)
+
+    # --- handlers ----------------------------------------------------------
+
+    @web.middleware
+    async def _latency(self, request, handler):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            await asyncio.sleep(delay)
+        resp = await handler(request)
+        self.stats["requests"] += 1
+        if resp.body is not None:
+            self.stats["bytes"] += len(resp.body)
+        return resp
+
+    async def _category(self, request):
+        category = request.match_info["category"]
+        self.stats["category_pages"] += 1
+        html = self._recorded(f"category_{category}.html") if self.recorded else None
+        return web.Response(text=html or self._category_html(category), content_type="text/html")
+
+    async def _ajax(self, request):
+        category = request.match_info["category"]
+        page = int(request.query.get("page", "2"))
+        self.stats["ajax_pages"] += 1
+        return web.Response(text=self._modules(category, page), content_type="text/html")
+
+    async def _recorded_ajax(self, request):
+        # tagDiv's td_ajax_block endpoint; replay the recorded response for this category/page
+        form = await request.post()
+        referer = request.headers.get("Referer", "")
+        match = re.search(r"/category/([^/]+)/", referer)
+        category = match.group(1) if match else "national"
+        page = form.get("td_current_page", "2")
+        self.stats["ajax_pages"] += 1
+        body = self._recorded(f"ajax_{category}_{page}.json")
+        if body is None:
+            body = json.dumps({"td_data": "", "td_hide_next": True, "td_hide_prev": False})
+        return web.Response(text=body, content_type="application/json")
+
+    async def _article(self, request):
+        slug = request.match_info["slug"]
+        self.stats["article_pages"] += 1
+        html = self._recorded(f"article_{slug}.html") if self.recorded else None
+        return web.Response(text=html or self._article_html(slug), content_type="text/html")
+
+    async def _image(self, request):
+        return web.Response(body=b"\xff\xd8\xff\xd9", content_type="image/jpeg")
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._latency])
+        app.router.add_get("/category/{category}/", self._category)
+        app.router.add_get("/ajax/{category}", self._ajax)
+        app.router.add_post("/wp-admin/admin-ajax.php", self._recorded_ajax)
+        app.router.add_get("/wp-content/uploads/{name}", self._image)
+        app.router.add_get("/{slug}/", self._article)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{bound}"
+        logger.info("Stand-in site listening on %s (%s fixtures)", self.base_url, "recorded" if self.recorded else "synthetic")
+        return self.base_url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(args):
+    from scraper.scrape_links import CATEGORIES
+
+    site = StandinSite(
+        {cat: info["pagination_tdi"] for cat, info in CATEGORIES.items()},
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        articles_per_page=args.articles_per_page,
+        today_pages=args.today_pages,
+    )
+    await site.start(args.host, args.port)
+    print(f"Serving on {site.base_url} - set BORNEO_BULLETIN_URL={site.base_url} to scrape it. Ctrl+C to stop.")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await site.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+    parser = argparse.ArgumentParser(description="Serve a local stand-in of borneobulletin.com.bn")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--articles-per-page", type=int, default=8)
+    parser.add_argument("--today-pages", type=int, default=2)
+    asyncio.run(_serve(parser.parse_args()))
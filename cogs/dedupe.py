@@ -1,47 +1,223 @@
+import asyncio
 import json
+import logging
+import sqlite3
+import threading
 import time
-import tempfile
 import os
 from pathlib import Path
-from discord.ext import commands
+from discord.ext import commands, tasks
 
-FILE = Path(__file__).parent.parent / "data" / "sent_history.json"
+from scraper.persistence import DATA_DIR, run_io, write_json_atomic
+
+logger = logging.getLogger("dedupe_cog")
+
+FILE = DATA_DIR / "sent_history.json"
+LOG_FILE = FILE.with_suffix(".log")
+DB_FILE = FILE.with_suffix(".db")
+
+# Write-behind defaults: flush pending marks every FLUSH_INTERVAL seconds or
+# as soon as FLUSH_THRESHOLD marks are queued, whichever comes first. Digest
+# delivery also flushes after each send, so a crash can't re-send a digest.
+FLUSH_INTERVAL = 30
+FLUSH_THRESHOLD = 500
+
+# Retention policy: marks older than this are forgotten and reclaimed.
+DEFAULT_TTL = 7 * 24 * 3600
+PRUNE_INTERVAL_MINUTES = 60
+DAY = 24 * 3600
+
+
+class AppendLogBackend:
+    """
+    Snapshot file plus an append-only journal of marks.
+
+    Each flush appends one JSON line per mark to the journal. Expiring appends
+    a single tombstone line ({"expire_before": cutoff}); marks older than the
+    latest tombstone are skipped on load and counted as dead. Once journal
+    lines plus dead marks pass
+    `compact_every`, the live entries are rewritten into the snapshot and the
+    journal is truncated, so that rewrite is paid for by the marks it drops.
+    """
+
+    def __init__(self, snapshot_path: Path = FILE, log_path: Path = LOG_FILE, compact_every: int = 5000):
+        self._snapshot = snapshot_path
+        self._log = log_path
+        self._compact_every = compact_every
+        self._log_lines = 0
+        self._dead = 0
+
+    def load(self):
+        """Yield (target_key, article_key, ts) records from snapshot then journal."""
+        records = []
+        if self._snapshot.exists():
+            try:
+                with open(self._snapshot, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and "version" in data:
+                    records.extend(tuple(e) for e in data.get("entries", []))
+                elif isinstance(data, dict):
+                    # legacy format: {article_key: {target_key: ts}}
+                    for article_key, targets in data.items():
+                        for target_key, ts in targets.items():
+                            records.append((target_key, article_key, int(ts)))
+            except Exception as e:
+                logger.warning("Failed to load %s: %s", self._snapshot.name, e)
+
+        self._log_lines = 0
+        expire_before = 0
+        if self._log.exists():
+            with open(self._log, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except Exception:
+                        # torn write from a crash mid-append; ignore the tail
+                        logger.warning("Skipping corrupt line in %s", self._log.name)
+                        continue
+                    self._log_lines += 1
+                    if isinstance(entry, dict):
+                        expire_before = max(expire_before, int(entry.get("expire_before", 0)))
+                    else:
+                        records.append(tuple(entry))
+        if expire_before:
+            live = [r for r in records if int(r[2]) >= expire_before]
+            self._dead = len(records) - len(live)
+            records = live
+        return records
+
+    def append(self, records):
+        if not records:
+            return
+        self._log.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._log, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_lines += len(records)
+
+    def should_compact(self) -> bool:
+        return self._log_lines + self._dead >= self._compact_every
+
+    def compact(self, records):
+        write_json_atomic(self._snapshot, {"version": 2, "entries": [list(r) for r in records]})
+        try:
+            self._log.unlink()
+        except FileNotFoundError:
+            pass
+        self._log_lines = 0
+        self._dead = 0
+
+    def expire(self, cutoff: int, count: int):
+        # one tombstone line however many marks expire; the space comes back at the next compaction
+        self.append([{"expire_before": cutoff}])
+        self._dead += count
+
+
+class SqliteBackend:
+    """SQLite-backed store; each flush is a single upsert transaction."""
+
+    def __init__(self, path: Path = DB_FILE):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # flushes may run on the persistence thread pool
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sent ("
+            " target_key TEXT NOT NULL,"
+            " article_key TEXT NOT NULL,"
+            " ts INTEGER NOT NULL,"
+            " PRIMARY KEY (target_key, article_key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sent_ts ON sent (ts)")
+        self._conn.commit()
+
+    def load(self):
+        return self._conn.execute("SELECT target_key, article_key, ts FROM sent").fetchall()
+
+    def append(self, records):
+        if not records:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO sent (target_key, article_key, ts) VALUES (?, ?, ?) "
+                "ON CONFLICT(target_key, article_key) DO UPDATE SET ts = excluded.ts",
+                records,
+            )
+
+    def should_compact(self) -> bool:
+        return False
+
+    def compact(self, records):
+        with self._conn:
+            self._conn.execute("DELETE FROM sent")
+            self._conn.executemany("INSERT INTO sent (target_key, article_key, ts) VALUES (?, ?, ?)", list(records))
+
+    def expire(self, cutoff: int, count: int):
+        with self._conn:
+            self._conn.execute("DELETE FROM sent WHERE ts < ?", (cutoff,))
 
 
 class SentHistory:
-    def __init__(self):
-        self._path = FILE
+    def __init__(
+        self,
+        backend=None,
+        write_behind: bool = True,
+        flush_threshold: int = FLUSH_THRESHOLD,
+        ttl_seconds: int = DEFAULT_TTL,
+    ):
+        self._backend = backend or AppendLogBackend()
+        self._write_behind = write_behind
+        self._flush_threshold = flush_threshold
+        self.ttl_seconds = ttl_seconds
         self._data = {}
+        # day number -> [(target_key, article_key)] marked that day; pruning
+        # pops whole expired days instead of scanning every target
+        self._buckets = {}
+        self._pending = []
+        # flush_async() started by mark_sent_many(), referenced until it finishes
+        self._flush_task = None
+        # serialises backend writes between the event loop and the I/O thread pool
+        self._io_lock = threading.Lock()
+        # bumped on every journal write; a snapshot taken at an older generation
+        # may miss marks the journal holds, so it must not replace the journal
+        self._generation = 0
+        # one background compaction at a time
+        self._compact_lock = asyncio.Lock()
         self._load()
 
     def _load(self):
-        if self._path.exists():
-            try:
-                with open(self._path, "r", encoding="utf-8") as f:
-                    self._data = json.load(f)
-            except Exception:
-                self._data = {}
-        else:
-            self._data = {}
-
-    def _atomic_write(self, data):
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        fd, tmp = tempfile.mkstemp(prefix=self._path.stem, suffix=".tmp", dir=str(self._path.parent))
+        # target_key -> {article_key: ts}; keyed by target so a digest's
+        # membership checks are one dict lookup per article
+        self._data = {}
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            os.replace(tmp, str(self._path))
-        except Exception:
-            try:
-                os.remove(tmp)
-            except Exception:
-                pass
-            raise
+            records = self._backend.load()
+        except Exception as e:
+            logger.warning("Failed to load sent history: %s", e)
+            records = []
+        cutoff = int(time.time()) - self.ttl_seconds
+        for target_key, article_key, ts in records:
+            ts = int(ts)
+            if ts < cutoff:
+                continue
+            self._data.setdefault(target_key, {})[article_key] = ts
+        self._buckets = {}
+        for target_key, article_key, ts in self._records():
+            self._buckets.setdefault(ts // DAY, []).append((target_key, article_key))
 
-    def has_been_sent(self, target_key: str, article_key: str, ttl_seconds: int = 7 * 24 * 3600) -> bool:
+    def _records(self):
+        for target_key, articles in self._data.items():
+            for article_key, ts in articles.items():
+                yield (target_key, article_key, ts)
+
+    def has_been_sent(self, target_key: str, article_key: str, ttl_seconds: int = None) -> bool:
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
         now = int(time.time())
-        sent = self._data.get(article_key, {})
-        t = sent.get(target_key)
+        t = self._data.get(target_key, {}).get(article_key)
         if not t:
             return False
         if now - int(t) > ttl_seconds:
@@ -49,42 +225,171 @@ class SentHistory:
             return False
         return True
 
+    def filter_unsent(self, target_key: str, article_keys, ttl_seconds: int = None) -> list:
+        """Return the subset of `article_keys` not yet sent to `target_key`, preserving order."""
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        cutoff = int(time.time()) - ttl_seconds
+        sent = self._data.get(target_key)
+        if not sent:
+            return list(article_keys)
+        return [k for k in article_keys if sent.get(k, 0) < cutoff]
+
     def mark_sent(self, target_key: str, article_key: str):
+        self.mark_sent_many(target_key, [article_key])
+
+    def mark_sent_many(self, target_key: str, article_keys):
         now = int(time.time())
-        if article_key not in self._data:
-            self._data[article_key] = {}
-        self._data[article_key][target_key] = now
-        # atomic save
+        sent = self._data.setdefault(target_key, {})
+        bucket = self._buckets.setdefault(now // DAY, [])
+        for article_key in article_keys:
+            sent[article_key] = now
+            bucket.append((target_key, article_key))
+            self._pending.append((target_key, article_key, now))
+        if not self._write_behind or len(self._pending) >= self._flush_threshold:
+            self._flush_soon()
+
+    def _flush_soon(self):
+        """Flush now, off the event loop when called from one."""
         try:
-            self._atomic_write(self._data)
-        except Exception:
-            pass
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # no loop (scripts, startup): a blocking flush is fine
+            self.flush()
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self.flush_async())
 
-    def prune_older_than(self, seconds: int):
-        now = int(time.time())
-        changed = False
-        for a, targets in list(self._data.items()):
-            for t, ts in list(targets.items()):
-                if now - int(ts) > seconds:
-                    del self._data[a][t]
-                    changed = True
-            if not self._data[a]:
-                del self._data[a]
-                changed = True
-        if changed:
-            try:
-                self._atomic_write(self._data)
-            except Exception:
-                pass
+    def flush(self):
+        """Persist queued marks; compacts the backend when it asks for it."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        if not self._write(pending, self._records):
+            # keep the marks queued so the next flush retries them
+            self._pending = pending + self._pending
+
+    async def flush_async(self):
+        """flush() with the disk work on the persistence thread pool."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        if not await run_io(self._write, pending, None):
+            self._pending = pending + self._pending
+            return
+        await self._compact_if_due()
 
+    async def _compact_if_due(self):
+        async with self._compact_lock:
+            if not self._backend.should_compact():
+                return
+            # snapshot live records now; the dicts keep changing on the event loop
+            generation = self._generation
+            snapshot = list(self._records())
+            await run_io(self._compact, lambda: snapshot, generation)
+
+    def _write(self, pending, records) -> bool:
+        """Append `pending`; with `records`, also compact right away if the backend asks for it."""
+        try:
+            with self._io_lock:
+                self._backend.append(pending)
+                self._generation += 1
+                if records is not None and self._backend.should_compact():
+                    self._backend.compact(records())
+            return True
+        except Exception as e:
+            logger.warning("Failed to flush sent history: %s", e)
+            return False
+
+    def prune_expired(self, max_age: int = None) -> int:
+        """
+        Drop marks older than `max_age` (default: the retention TTL).
+
+        Only the day buckets that have fully expired are visited, so the cost is
+        proportional to the number of expired marks. Returns how many were reclaimed.
+        """
+        cutoff = int(time.time()) - (self.ttl_seconds if max_age is None else max_age)
+        reclaimed = self._reclaim(cutoff)
+        if reclaimed:
+            self.flush()
+            self._expire(cutoff, reclaimed, self._records)
+        return reclaimed
+
+    async def prune_expired_async(self, max_age: int = None) -> int:
+        """prune_expired() with the disk rewrite on the persistence thread pool."""
+        cutoff = int(time.time()) - (self.ttl_seconds if max_age is None else max_age)
+        reclaimed = self._reclaim(cutoff)
+        if reclaimed:
+            await self.flush_async()
+            await run_io(self._expire, cutoff, reclaimed, None)
+            await self._compact_if_due()
+        return reclaimed
+
+    def _reclaim(self, cutoff: int) -> int:
+        reclaimed = 0
+        for day in [d for d in self._buckets if (d + 1) * DAY <= cutoff]:
+            for target_key, article_key in self._buckets.pop(day):
+                sent = self._data.get(target_key)
+                ts = sent.get(article_key) if sent else None
+                # skip entries re-marked since; their live copy sits in a newer bucket
+                if ts is None or ts // DAY != day:
+                    continue
+                del sent[article_key]
+                if not sent:
+                    del self._data[target_key]
+                reclaimed += 1
+        return reclaimed
+
+    def _expire(self, cutoff: int, reclaimed: int, records):
+        """Expire on disk; with `records`, also compact right away if the backend asks for it."""
+        try:
+            with self._io_lock:
+                self._backend.expire(cutoff, reclaimed)
+                self._generation += 1
+        except Exception as e:
+            logger.warning("Failed to expire sent history on disk: %s", e)
+        if records is not None and self._backend.should_compact():
+            self._compact(records)
+
+    def _compact(self, records, generation: int = None):
+        """Rewrite the backend from `records`, unless taken before the journal's last write (`generation`)."""
+        try:
+            with self._io_lock:
+                if generation is not None and generation != self._generation:
+                    # stale snapshot; the next flush compacts from a fresh one
+                    return
+                self._backend.compact(records())
+        except Exception as e:
+            logger.warning("Failed to compact sent history: %s", e)
+
+    def prune_older_than(self, seconds: int) -> int:
+        return self.prune_expired(max_age=seconds)
 
 
 class DedupeCog(commands.Cog):
     """Cog wrapper to expose SentHistory when extension is loaded."""
 
-    def __init__(self, bot):
+    def __init__(self, bot, store: SentHistory = None):
         self.bot = bot
-        self.store = SentHistory()
+        self.store = store or SentHistory()
+        self.flush_task.start()
+        self.prune_task.start()
+
+    async def cog_unload(self):
+        self.flush_task.cancel()
+        self.prune_task.cancel()
+        await self.store.flush_async()
+
+    @tasks.loop(seconds=FLUSH_INTERVAL)
+    async def flush_task(self):
+        """Periodically persist write-behind marks."""
+        await self.store.flush_async()
+
+    @tasks.loop(minutes=PRUNE_INTERVAL_MINUTES)
+    async def prune_task(self):
+        """Reclaim marks that have outlived the retention TTL."""
+        reclaimed = await self.store.prune_expired_async()
+        if reclaimed:
+            logger.info("Pruned %d expired sent-history entries.", reclaimed)
 
 
 async def setup(bot):
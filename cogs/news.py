@@ -3,8 +3,7 @@ News cog: /get_todays_news, /latest, /categories commands.
 Includes pagination for large result sets.
 """
 import discord
-from discord.ext import commands
-from discord import ui
+from discord.ext import commands, tasks
 from discord import ui
 import logging
 from datetime import datetime
@@ -14,19 +13,167 @@ import io
 import hashlib
 import mimetypes
 import aiohttp
-import uuid
-import time
-import uuid
 import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from scraper import bodies, enrich
+from scraper.near_duplicates import collapse, story_key
+from scraper.persistence import run_io
+from scraper.search_index import get_search_index
+from state_store import get_state_store
 
 logger = logging.getLogger("news_cog")
 
+SEARCH_RESULTS = 8
+# Minimum seconds between edits of a status message (Discord allows ~5 edits per 5s per channel)
+STATUS_EDIT_INTERVAL = 2.0
+# Digest button state: recently used digests stay in memory, all of them on disk
+DIGEST_NAMESPACE = "digests"
+DIGEST_CACHE_SIZE = 256
+DIGEST_CACHE_TTL = 3600
+DIGEST_RETENTION_DAYS = int(os.getenv("DIGEST_RETENTION_DAYS", "7"))
+DIGEST_PRUNE_INTERVAL_HOURS = 12
+# Discord allows 25 options per select menu
+DIGEST_SELECT_LIMIT = 25
+# title suffix of the second and later embeds of a digest split across messages
+DIGEST_CONTINUED = " (continued)"
+
+
+class StatusMessage:
+    """A status message whose edits are rate limited; the newest text wins and is flushed at the end."""
+
+    def __init__(self, message, interval: float = STATUS_EDIT_INTERVAL):
+        self.message = message
+        self.interval = interval
+        self._shown = message.content if message else None
+        self._pending = None
+        self._last_edit = 0.0
+
+    async def update(self, content: str, force: bool = False):
+        self._pending = content
+        if force or time.monotonic() - self._last_edit >= self.interval:
+            await self.flush()
+
+    async def flush(self):
+        if self._pending is None or self._pending == self._shown or self.message is None:
+            return
+        content, self._pending = self._pending, None
+        try:
+            await self.message.edit(content=content)
+            self._shown = content
+        except Exception as e:
+            logger.debug("Status edit failed: %s", e)
+        self._last_edit = time.monotonic()
+
+
+class DigestStore:
+    """
+    Compact digest state behind the digest buttons: category, day and the
+    article urls, resolved against the article store when a button is used.
+
+    Ids are derived from the content, so a digest posted to many channels is
+    stored once. Recently used digests are kept in a TTL/LRU-bounded dict;
+    every digest is also persisted in the state store, so buttons keep
+    working after eviction or a restart until DIGEST_RETENTION_DAYS pass.
+    """
+
+    def __init__(self, store=None, max_entries: int = DIGEST_CACHE_SIZE, ttl: float = DIGEST_CACHE_TTL):
+        self._store = store or get_state_store()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._cache = OrderedDict()  # digest_id -> (last used, record)
+
+    @staticmethod
+    def make_id(category: str, day: str, urls) -> str:
+        return hashlib.sha1("\n".join([category, day, *urls]).encode("utf-8")).hexdigest()[:16]
+
+    def __len__(self):
+        return len(self._cache)
+
+    def _cached(self, digest_id: str):
+        entry = self._cache.get(digest_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl:
+            del self._cache[digest_id]
+            return None
+        self._remember(digest_id, entry[1])
+        return entry[1]
+
+    def _remember(self, digest_id: str, record: dict):
+        now = time.monotonic()
+        self._cache[digest_id] = (now, record)
+        self._cache.move_to_end(digest_id)
+        # least recently used first: drop expired entries and anything over the size bound
+        while self._cache:
+            oldest_id, (used, _) = next(iter(self._cache.items()))
+            if len(self._cache) <= self.max_entries and now - used <= self.ttl:
+                break
+            del self._cache[oldest_id]
+
+    def _persist(self, digest_id: str, record: dict):
+        try:
+            with self._store.transaction() as tx:
+                tx.put(DIGEST_NAMESPACE, digest_id, record)
+        except Exception as e:
+            logger.warning("Failed to persist digest %s: %s", digest_id, e)
+
+    async def put(self, category: str, day: str, urls: list) -> str:
+        """Store a digest (if new) and return its id."""
+        digest_id = self.make_id(category, day, urls)
+        if self._cached(digest_id) is None:
+            record = {"category": category, "day": day, "urls": list(urls), "ts": time.time()}
+            self._remember(digest_id, record)
+            await run_io(self._persist, digest_id, record)
+        return digest_id
+
+    async def get(self, digest_id: str):
+        """The digest's record, from memory or disk; None once it has been pruned."""
+        record = self._cached(digest_id)
+        if record is None:
+            record = await run_io(self._store.get, DIGEST_NAMESPACE, digest_id)
+            if record is not None:
+                self._remember(digest_id, record)
+        return record
+
+    def prune(self, retention_days: int = DIGEST_RETENTION_DAYS) -> int:
+        """Delete persisted digests older than `retention_days`. Blocking."""
+        cutoff = time.time() - retention_days * 86400
+        expired = [k for k, record in self._store.load(DIGEST_NAMESPACE).items() if record.get("ts", 0) < cutoff]
+        if expired:
+            with self._store.transaction() as tx:
+                for digest_id in expired:
+                    tx.delete(DIGEST_NAMESPACE, digest_id)
+            for digest_id in expired:
+                self._cache.pop(digest_id, None)
+        return len(expired)
+
 
 class NewsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        # small in-memory cache for digest state (short-lived)
-        self._digest_cache = {}
+        # article urls behind each digest's buttons (bounded in memory, persisted on disk)
+        self.digests = DigestStore()
+
+    async def cog_load(self):
+        # digest buttons are matched by custom_id, so they work on messages sent before a restart
+        self.bot.add_dynamic_items(ReadFullButton, ArticleSelect)
+        self.digest_prune_task.start()
+
+    async def cog_unload(self):
+        self.digest_prune_task.cancel()
+        self.bot.remove_dynamic_items(ReadFullButton, ArticleSelect)
+
+    @tasks.loop(hours=DIGEST_PRUNE_INTERVAL_HOURS)
+    async def digest_prune_task(self):
+        """Forget digests whose buttons are older than the retention window."""
+        try:
+            pruned = await run_io(self.digests.prune)
+            if pruned:
+                logger.info("Pruned %d expired digests.", pruned)
+        except Exception as e:
+            logger.warning("Digest prune failed: %s", e)
 
     async def get_scraper_cog(self):
         """Get the scraper cog instance."""
@@ -34,135 +181,267 @@ class NewsCog(commands.Cog):
 
 
 
-    def _build_digest_embed(self, articles, category):
-        """Build a compact digest embed with all today's articles (title + short desc)."""
-        embed = discord.Embed(
-            title=f"📰 {category.capitalize()} - Today's News",
-            color=discord.Color.blue(),
-        )
-        for i, article in enumerate(articles, 1):
-            title = article.get("title", "No title")[:256]
-            url = article.get("url", "")
-            short = article.get("excerpt", "") or (article.get("content", "") or "")[:100]
-            embed.add_field(name=f"{i}. {title}", value=(f"{short}\n[Link]({url})" if url else short), inline=False)
+    def _build_digest_embeds(self, articles, category, day: str = None):
+        """
+        Compact digest embeds with all today's (or `day`'s) articles (title + short desc).
+        Large digests are split across several embeds, one message each, to stay
+        within Discord's per-message limits (25 fields, 6000 characters).
+        """
+        title = f"📰 {category.capitalize()} - " + (f"News for {day}" if day else "Today's News")
+        footer = f"📖 Use `/read_full {category}` to read full articles in a thread • {len(articles)} articles {'on ' + day if day else 'today'}"
+        pages = enrich.digest_pages(articles, len(title) + len(DIGEST_CONTINUED) + len(footer))
+
+        embeds = []
+        for page in pages:
+            embed = discord.Embed(title=title + (DIGEST_CONTINUED if embeds else ""), color=discord.Color.blue())
+            for name, value in page:
+                embed.add_field(name=name, value=value, inline=False)
+            embeds.append(embed)
 
         # thumbnail: use first article image if available
-        first_image = articles[0].get("featured_image") if articles else None
-        proxy_base = os.getenv("IMAGE_PROXY_BASE")
-        if first_image:
-            if proxy_base:
-                embed.set_thumbnail(url=proxy_base.rstrip("/") + "/image?url=" + quote_plus(first_image))
-            else:
-                embed.set_thumbnail(url=first_image)
+        first_image = articles[0].featured_image if articles else None
+        if first_image and embeds:
+            embeds[0].set_thumbnail(url=self._image_url(first_image))
+        if embeds:
+            embeds[-1].set_footer(text=footer)
+        return embeds
 
-        embed.set_footer(text=f"📖 Use `/read_full {category}` to read full articles in a thread • {len(articles)} articles today")
-        return embed
+    def _sent_history(self):
+        """Return the shared SentHistory store, or None if the dedupe cog isn't loaded."""
+        dedupe = self.bot.get_cog("DedupeCog")
+        return dedupe.store if dedupe else None
 
-    async def send_digest(self, channel, category, articles):
-        """Send a compact digest message to `channel` with interactive view."""
+    async def send_digest(self, channel, category, articles, dedupe: bool = True, day: str = None):
+        """
+        Send a compact digest message to `channel` with interactive view.
+
+        With `dedupe`, articles already delivered to this channel are dropped
+        and the rest are recorded as sent, and flushed to disk, once the
+        message goes out. `day` labels an archived (non-today) digest.
+        Near-duplicate stories are collapsed and deduped by their canonical
+        url, so a wire story filed under several categories reaches a channel
+        once.
+        """
+        history = self._sent_history() if dedupe else None
+        target_key = str(channel.id)
+        articles = collapse(articles)
+        if history and articles:
+            unsent = set(history.filter_unsent(target_key, [story_key(a) for a in articles]))
+            articles = [a for a in articles if story_key(a) in unsent]
         if not articles:
             return None
 
-        digest_id = str(uuid.uuid4())
-        embed = self._build_digest_embed(articles, category)
-        view = DigestView(self, digest_id, articles, category)
-        # cache articles briefly for the view lifetime
-        self._digest_cache[digest_id] = {"articles": articles, "ts": time.time()}
+        embeds = self._build_digest_embeds(articles, category, day)
+        digest_id = await self.digests.put(
+            category, day or datetime.now().strftime("%Y-%m-%d"), [a.url for a in articles if a.url]
+        )
+        view = DigestView(digest_id, articles)
+        for embed in embeds[:-1]:
+            await channel.send(embed=embed)
+        # the buttons go under the last part of the digest
         try:
-            msg = await channel.send(embed=embed, view=view)
+            msg = await channel.send(embed=embeds[-1], view=view)
         except Exception:
             # fallback: send without view
-            msg = await channel.send(embed=embed)
+            msg = await channel.send(embed=embeds[-1])
+        if history:
+            history.mark_sent_many(target_key, [story_key(a) for a in articles if a.url])
+            # persist now: a crash before the next periodic flush would re-send this digest
+            await history.flush_async()
         return msg
 
-    async def _scrape_and_get_articles(self, ctx, scraper, category):
-        """Scrape a category and return today's articles, or None if scrape failed."""
-        status_msg = await ctx.send(f"🔄 No cached articles for today. Scraping **{category}**...\n_(This may take 30-60 seconds)_")
-        
-        async def update_progress(message):
-            try:
-                if "[SCRAPER]" in message or "Step" in message or "completed" in message.lower():
-                    await status_msg.edit(content=f"🔄 Scraping **{category}**...\n```\n{message}\n```")
-            except:
-                pass
-        
-        success = await scraper.run_scraper(force=False, categories=[category], progress_callback=update_progress)
-        if not success:
-            await status_msg.edit(content="❌ Scraping failed. Try again later.")
-            return None
-        
-        articles = scraper.get_articles_for_category(category)
-        today_articles = [a for a in articles if scraper.is_today(a.get("date", ""))]
-        
-        if today_articles:
-            await status_msg.edit(content="✅ Scraping complete!")
-            return today_articles
+    async def _stream_scrape_to_thread(self, ctx, thread, scraper, category):
+        """
+        Scrape a category and post each of today's articles to `thread` as soon
+        as it is extracted. Returns the number of articles posted.
+        """
+        status = StatusMessage(
+            await ctx.send(f"🔄 No cached articles for today. Scraping **{category}**...\n_(Articles appear in the thread as they are fetched)_")
+        )
+        posted = set()
+        step = ""
+        ok = False
+
+        async for kind, payload in scraper.stream_scrape(categories=[category]):
+            if kind == "progress":
+                if "[SCRAPER]" in payload or "Step" in payload or "completed" in payload.lower():
+                    step = payload
+            elif kind == "article":
+                url = payload.url
+                if (
+                    not url
+                    or url in posted
+                    or category not in (payload.categories or [category])
+                    or not payload.is_today()
+                ):
+                    continue
+                if not posted:
+                    await thread.send(f"Reading {category.capitalize()} articles as they are scraped...")
+                posted.add(url)
+                await self._post_article(thread, payload, f"Article {len(posted)}")
+            elif kind == "done":
+                ok = payload
+                break
+            await status.update(
+                f"🔄 Scraping **{category}**... {len(posted)} article(s) posted so far"
+                + (f"\n```\n{step}\n```" if step else "")
+            )
+
+        # stories already cached under another category are merged in without being re-fetched
+        if ok:
+            articles = await scraper.get_articles_for_category_async(category)
+            for article in articles:
+                if article.is_today() and article.url not in posted:
+                    if not posted:
+                        await thread.send(f"Reading {category.capitalize()} articles today...")
+                    posted.add(article.url)
+                    await self._post_article(thread, article, f"Article {len(posted)}")
+
+        if posted:
+            await status.update(f"✅ Scraping complete! Posted {len(posted)} article(s).", force=True)
+        elif not ok:
+            await status.update("❌ Scraping failed. Try again later.", force=True)
         else:
-            await status_msg.edit(content="❌ No articles found after scraping.")
-            return None
+            await status.update("❌ No articles found after scraping.", force=True)
+        return len(posted)
 
     async def _post_articles_to_thread(self, thread, category, articles):
         """Post article digests to a thread."""
         await thread.send(f"Reading **{len(articles)}** articles from {category.capitalize()} today...")
         for i, article in enumerate(articles, 1):
-            title = article.get("title", "No title")[:256]
-            url = article.get("url", "")
-            content = article.get("content", "") or ""
-            description = content[:4096]
-            
-            date_raw = article.get("date", "Unknown date")
-            date_text = date_raw
+            await self._post_article(thread, article, f"Article {i}/{len(articles)}")
+
+    async def resolve_digest(self, digest_id: str):
+        """Return (record, articles) for a digest, articles in digest order; (None, []) if it expired."""
+        record = await self.digests.get(digest_id)
+        if record is None:
+            return None, []
+        scraper = await self.get_scraper_cog()
+        if not scraper:
+            return record, []
+        category, day = record["category"], record["day"]
+        if day == datetime.now().strftime("%Y-%m-%d"):
+            # a story may be filed under another category since the digest went out
+            by_url = {a.url: a for items in (await scraper.load_articles_async()).values() for a in items}
+        else:
+            by_url = {a.url: a for a in await run_io(scraper.articles_for, category, day)}
+        return record, [by_url[url] for url in record["urls"] if url in by_url]
+
+    async def _full_article_embeds(self, article, position: str):
+        """_article_embeds() with the body read off the event loop and released again afterwards."""
+        if not article.content_loaded:
+            await run_io(bodies.preload, (article,))
+        embeds = self._article_embeds(article, position)
+        # the headline stays cached by the scraper cog; its body does not
+        article.release_content()
+        return embeds
+
+    def _article_embeds(self, article, position: str):
+        """
+        Full-article embeds without an image (callers attach one to the first):
+        one per precomputed body chunk, so long articles are not cut off.
+        """
+        title = article.embed_title or enrich.embed_title(article)
+        date_text = article.date_label or enrich.date_label(article)
+        chunks = enrich.body_chunks(article) or [""]
+
+        embeds = []
+        for i, chunk in enumerate(chunks, 1):
+            embed = discord.Embed(description=chunk, color=discord.Color.blue())
+            if i == 1:
+                embed.title = title
+                embed.url = article.url
+            part = f" • Part {i}/{len(chunks)}" if len(chunks) > 1 else ""
+            embed.set_footer(text=f"{date_text} • {position}{part}")
+            embeds.append(embed)
+        return embeds
+
+    def _image_url(self, image: str) -> str:
+        """URL Discord should fetch `image` from (through IMAGE_PROXY_BASE when set)."""
+        proxy_base = os.getenv("IMAGE_PROXY_BASE")
+        if proxy_base:
+            return proxy_base.rstrip("/") + "/image?url=" + quote_plus(image)
+        return image
+
+    async def _post_article(self, thread, article, position: str):
+        """Post one full article (with its featured image when possible), one message per body chunk."""
+        url = article.url
+        embeds = await self._full_article_embeds(article, position)
+        embed = embeds[0]
+        file_obj = None
+
+        # Add featured image (normalized to an absolute URL at scrape time) - try to
+        # attach image bytes so Discord will always show it.
+        image = article.featured_image
+        if image:
             try:
-                dt = datetime.fromisoformat(date_raw)
-                date_text = dt.strftime("%d/%m/%Y")
-            except Exception:
-                pass
-            
-            embed = discord.Embed(
-                title=title,
-                description=description,
-                color=discord.Color.blue(),
-                url=url
-            )
-            embed.set_footer(text=f"{date_text} • Article {i}/{len(articles)}")
-            
-            # Add featured image - try to attach image bytes so Discord will always show it.
-            image = article.get("featured_image")
-            attached = False
-            if image and isinstance(image, str) and image.strip():
-                # First try: download image and send as attachment (attachment://filename)
-                try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(image, headers={"User-Agent": "Mozilla/5.0"}, timeout=20) as resp:
-                            if resp.status == 200:
-                                img_bytes = await resp.read()
-                                ctype = resp.headers.get("Content-Type", "application/octet-stream")
-                                ext = mimetypes.guess_extension(ctype.split(";")[0].strip()) or ".jpg"
-                                fname = hashlib.sha1(image.encode("utf-8")).hexdigest() + ext
-                                file_obj = discord.File(io.BytesIO(img_bytes), filename=fname)
-                                embed.set_image(url=f"attachment://{fname}")
-                                await thread.send(embed=embed, file=file_obj)
-                                attached = True
-                except Exception as e:
-                    logger.debug("Could not download image for article %d: %s", i, e)
-
-            if attached:
-                # already sent with attachment
-                continue
-
-            # Fallback: if proxy is configured, use proxy URL so Discord can fetch it
-            proxy_base = os.getenv("IMAGE_PROXY_BASE")
-            if image and proxy_base:
-                try:
-                    proxied = proxy_base.rstrip("/") + "/image?url=" + quote_plus(image)
-                    embed.set_image(url=proxied)
-                except Exception as e:
-                    logger.warning("Failed to set proxied image for article %d: %s", i, e)
-
-            # Add caption if available
-            caption = article.get("featured_caption", "")
-            if caption:
-                embed.add_field(name="Caption", value=caption[:1024], inline=True)
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(image, headers={"User-Agent": "Mozilla/5.0"}, timeout=20) as resp:
+                        if resp.status == 200:
+                            img_bytes = await resp.read()
+                            ctype = resp.headers.get("Content-Type", "application/octet-stream")
+                            ext = mimetypes.guess_extension(ctype.split(";")[0].strip()) or ".jpg"
+                            fname = hashlib.sha1(image.encode("utf-8")).hexdigest() + ext
+                            file_obj = discord.File(io.BytesIO(img_bytes), filename=fname)
+                            embed.set_image(url=f"attachment://{fname}")
+            except Exception as e:
+                logger.debug("Could not download image for %s: %s", url, e)
+
+        # Fallback: if proxy is configured, use proxy URL so Discord can fetch it
+        if image and file_obj is None and os.getenv("IMAGE_PROXY_BASE"):
+            embed.set_image(url=self._image_url(image))
+
+        # Add caption if available
+        caption = article.featured_caption
+        if caption:
+            embed.add_field(name="Caption", value=caption[:1024], inline=True)
+
+        if file_obj is not None:
+            await thread.send(embed=embed, file=file_obj)
+        else:
+            await thread.send(embed=embed)
+        for continued in embeds[1:]:
+            await thread.send(embed=continued)
+
+    async def open_digest_thread(self, interaction: discord.Interaction, digest_id: str):
+        """'Read full' button: post the digest's full articles in a thread on the digest message."""
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        record, articles = await self.resolve_digest(digest_id)
+        if record is None:
+            await interaction.followup.send("⌛ This digest has expired. Use `/read_full` instead.", ephemeral=True)
+            return
+        if not articles:
+            await interaction.followup.send("❌ These articles are no longer available.", ephemeral=True)
+            return
+        existing = interaction.message.thread if interaction.message else None
+        if existing is not None:
+            await interaction.followup.send(f"📖 Already open in {existing.mention}", ephemeral=True)
+            return
+        try:
+            thread = await interaction.message.create_thread(name=f"📖 {record['category'].capitalize()} - Full Articles")
+        except Exception as e:
+            logger.debug("Digest thread creation failed: %s", e)
+            await interaction.followup.send("🔖 Could not create a thread here (missing permissions?).", ephemeral=True)
+            return
+        await interaction.followup.send(f"📖 Posting {len(articles)} articles in {thread.mention}", ephemeral=True)
+        await self._post_articles_to_thread(thread, record["category"], articles)
+
+    async def show_digest_article(self, interaction: discord.Interaction, digest_id: str, index: int):
+        """Article picker: show one full article privately to whoever picked it."""
+        record, articles = await self.resolve_digest(digest_id)
+        urls = record["urls"] if record else []
+        article = None
+        if 0 <= index < len(urls):
+            article = next((a for a in articles if a.url == urls[index]), None)
+        if article is None:
+            await interaction.response.send_message("⌛ This article is no longer available.", ephemeral=True)
+            return
+        embeds = await self._full_article_embeds(article, f"Article {index + 1}/{len(urls)}")
+        if article.featured_image:
+            embeds[0].set_image(url=self._image_url(article.featured_image))
+        await interaction.response.send_message(embed=embeds[0], ephemeral=True)
+        for continued in embeds[1:]:
+            await interaction.followup.send(embed=continued, ephemeral=True)
 
     @commands.hybrid_command(name="read_full", description="Read full articles for today in a threaded discussion.")
     @discord.app_commands.describe(category="Article category (e.g., 'national')")
@@ -187,6 +466,8 @@ class NewsCog(commands.Cog):
             await ctx.send(f"❌ Category '{category}' not found. Available: {', '.join(available)}")
             return
 
+        scraper.note_demand([category])
+
         # Create thread first (upfront)
         thread = None
         try:
@@ -198,14 +479,13 @@ class NewsCog(commands.Cog):
             thread = ctx.channel
 
         # Get articles for category
-        articles = scraper.get_articles_for_category(category)
-        today_articles = [a for a in articles if scraper.is_today(a.get("date", ""))]
+        articles = await scraper.get_articles_for_category_async(category)
+        today_articles = [a for a in articles if a.is_today()]
 
-        # If no articles, scrape and retry
+        # If no articles, scrape and post them to the thread as they arrive
         if not today_articles:
-            today_articles = await self._scrape_and_get_articles(ctx, scraper, category)
-            if not today_articles:
-                return
+            await self._stream_scrape_to_thread(ctx, thread, scraper, category)
+            return
 
         # Post articles to thread
         await self._post_articles_to_thread(thread, category, today_articles)
@@ -226,8 +506,11 @@ class NewsCog(commands.Cog):
             await ctx.send("❌ No categories available. Try scraping first.")
 
     @commands.hybrid_command(name="send_digest", description="Send digest(s) to this channel. If no category provided, send all subscribed categories.")
-    @discord.app_commands.describe(category="Article category (e.g., 'national') or leave empty for all subscribed")
-    async def send_digest_cmd(self, ctx, category: str = None):
+    @discord.app_commands.describe(
+        category="Article category (e.g., 'national') or leave empty for all subscribed",
+        days_ago="Catch up on an earlier day from the archive (1 = yesterday)",
+    )
+    async def send_digest_cmd(self, ctx, category: str = None, days_ago: int = 0):
         """Manually send digest(s) to the current channel."""
         scraper = await self.get_scraper_cog()
         if not scraper:
@@ -256,11 +539,26 @@ class NewsCog(commands.Cog):
                 return
             categories_to_send = [category]
 
+        if days_ago > 0:
+            day = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+            sent_count = 0
+            for cat in categories_to_send:
+                articles = await run_io(scraper.articles_for, cat, day)
+                if articles and await self.send_digest(ctx.channel, cat, articles, day=day):
+                    sent_count += 1
+            if sent_count:
+                await ctx.send(f"✅ Sent {sent_count} digest(s) for {day}!", delete_after=5)
+            else:
+                await ctx.send(f"ℹ️ No new archived articles for {day}.")
+            return
+
+        scraper.note_demand(categories_to_send)
+
         # Prepare categories that need scraping (no cached articles)
         need_scrape = []
         for cat in categories_to_send:
-            articles = scraper.get_articles_for_category(cat)
-            today_articles = [a for a in articles if scraper.is_today(a.get("date", ""))]
+            articles = await scraper.get_articles_for_category_async(cat)
+            today_articles = [a for a in articles if a.is_today()]
             if not today_articles:
                 need_scrape.append(cat)
         
@@ -275,8 +573,8 @@ class NewsCog(commands.Cog):
         # Send digests for all categories
         sent_count = 0
         for cat in categories_to_send:
-            articles = scraper.get_articles_for_category(cat)
-            today_articles = [a for a in articles if scraper.is_today(a.get("date", ""))]
+            articles = await scraper.get_articles_for_category_async(cat)
+            today_articles = [a for a in articles if a.is_today()]
             
             if today_articles:
                 msg = await self.send_digest(ctx.channel, cat, today_articles)
@@ -286,16 +584,115 @@ class NewsCog(commands.Cog):
         if sent_count > 0:
             await ctx.send(f"✅ Sent {sent_count} digest(s)!", delete_after=5)
         else:
-            await ctx.send(f"❌ No articles found for the requested categor{'ies' if len(categories_to_send) > 1 else 'y'}.")
+            await ctx.send(f"ℹ️ No new articles for the requested categor{'ies' if len(categories_to_send) > 1 else 'y'} since the last digest in this channel.")
 
+    @commands.hybrid_command(name="search", description="Search recent articles by keyword.")
+    @discord.app_commands.describe(
+        query="Words to look for in titles and article text",
+        category="Only search this category",
+        days="How many days back to search (default 7)",
+    )
+    async def search(self, ctx, query: str, category: str = None, days: int = 7):
+        scraper = await self.get_scraper_cog()
+        if category and scraper and category.lower() not in [c.lower() for c in scraper.get_categories()]:
+            await ctx.send(f"❌ Category '{category}' not found. Available: {', '.join(scraper.get_categories())}")
+            return
 
-class DigestView(ui.View):
-    def __init__(self, cog: NewsCog, digest_id: str, articles, category, timeout=900):
-        super().__init__(timeout=timeout)
-        self.cog = cog
+        start = time.perf_counter()
+        try:
+            results = await run_io(
+                lambda: get_search_index().search(
+                    query, category=category.lower() if category else None, days=max(1, days), limit=SEARCH_RESULTS
+                )
+            )
+        except Exception as e:
+            logger.warning("Search failed for %r: %s", query, e)
+            await ctx.send("❌ Search failed. Try different keywords.")
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if not results:
+            await ctx.send(f"🔍 No articles matching **{query}** in the last {days} day(s).")
+            return
+
+        embed = discord.Embed(title=f"🔍 Results for \"{query[:200]}\"", color=discord.Color.blue())
+        for result in results:
+            day = (result.get("date") or "")[:10]
+            embed.add_field(
+                name=(result.get("title") or "No title")[:256],
+                value=f"{result['category']} • {day}\n{result['snippet'][:800]}\n[Link]({result['url']})"[:1024],
+                inline=False,
+            )
+        embed.set_footer(text=f"{len(results)} result(s) • {elapsed_ms:.0f} ms")
+        await ctx.send(embed=embed)
+
+
+class ReadFullButton(ui.DynamicItem[ui.Button], template=r"digest:read:(?P<digest_id>[0-9a-f]{16})"):
+    def __init__(self, digest_id: str):
+        super().__init__(
+            ui.Button(
+                label="Read full articles",
+                emoji="📖",
+                style=discord.ButtonStyle.primary,
+                custom_id=f"digest:read:{digest_id}",
+            )
+        )
         self.digest_id = digest_id
-        self.articles = articles
-        self.category = category
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["digest_id"])
+
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("NewsCog")
+        if cog:
+            await cog.open_digest_thread(interaction, self.digest_id)
+
+
+class ArticleSelect(ui.DynamicItem[ui.Select], template=r"digest:pick:(?P<digest_id>[0-9a-f]{16})"):
+    def __init__(self, digest_id: str, options: list):
+        super().__init__(
+            ui.Select(placeholder="Read one article…", options=options, custom_id=f"digest:pick:{digest_id}")
+        )
+        self.digest_id = digest_id
+
+    @staticmethod
+    def options_for(articles) -> list:
+        """
+        Select options for a digest's articles. Values are positions in the
+        digest record's `urls`, so articles without a url are skipped exactly
+        as they are there; labels keep the numbering of the digest embed.
+        """
+        linked = [(i, article) for i, article in enumerate(articles) if article.url]
+        return [
+            discord.SelectOption(
+                label=enrich.clip(f"{i + 1}. {article.title or 'No title'}", 100),
+                description=enrich.clip(article.excerpt, 100) or None,
+                value=str(position),
+            )
+            for position, (i, article) in enumerate(linked[:DIGEST_SELECT_LIMIT])
+        ]
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        # the options come back with the message, so nothing is looked up to rebuild the menu
+        return cls(match["digest_id"], item.options)
+
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("NewsCog")
+        if cog and self.item.values:
+            await cog.show_digest_article(interaction, self.digest_id, int(self.item.values[0]))
+
+
+class DigestView(ui.View):
+    """Digest buttons; persistent, since every item is a DynamicItem keyed by the digest id."""
+
+    def __init__(self, digest_id: str, articles):
+        super().__init__(timeout=None)
+        self.add_item(ReadFullButton(digest_id))
+        options = ArticleSelect.options_for(articles)
+        if options:
+            self.add_item(ArticleSelect(digest_id, options))
 
 async def setup(bot):
     await bot.add_cog(NewsCog(bot))
@@ -5,40 +5,86 @@ import discord
 from discord.ext import commands, tasks
 import asyncio
 import random
-import json
 import logging
-from pathlib import Path
 from datetime import datetime, timezone, timedelta
 
+from scraper import enrich
+from scraper.near_duplicates import collapse, story_key
+from scraper.persistence import DATA_DIR
+from state_store import InvertedIndex, get_state_store
+
 logger = logging.getLogger("scheduler_cog")
 
-SCHEDULE_STATE_FILE = Path(__file__).parent.parent / "data" / "schedule_state.json"
+SCHEDULE_STATE_FILE = DATA_DIR / "schedule_state.json"
+NAMESPACE = "schedule"
+
+# Delivery tuning: channels posted to concurrently, and the pause (seconds,
+# uniform range) between one channel's digests to avoid bursts.
+DELIVERY_CONCURRENCY = 1
+SEND_JITTER = (0.5, 1.5)
+
+
+def _legacy_schedule_items(data):
+    """Flatten legacy schedule_state.json into {"guild/channel": config} rows."""
+    return {
+        f"{guild_id}/{channel_id}": config
+        for guild_id, guild_config in data.items()
+        for channel_id, config in guild_config.get("channels", {}).items()
+    }
 
 
 class SchedulerCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.store = get_state_store()
         self.schedule_state = self._load_schedule_state()
+        # category -> {(guild_id, channel_id)}, kept in step with every toggle
+        self.channel_index = InvertedIndex()
+        for guild_id, guild_config in self.schedule_state.items():
+            for channel_id, config in guild_config.get("channels", {}).items():
+                self.channel_index.set((guild_id, channel_id), [cat for cat, on in config.items() if on])
         self.daily_news_task.start()
 
     def _load_schedule_state(self):
-        """Load schedule_state.json from disk."""
-        if SCHEDULE_STATE_FILE.exists():
-            try:
-                with open(SCHEDULE_STATE_FILE, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning("Failed to load schedule_state.json: %s", e)
-        return {}
-
-    def _save_schedule_state(self):
-        """Save schedule_state.json to disk."""
-        try:
-            SCHEDULE_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(SCHEDULE_STATE_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.schedule_state, f, indent=2)
-        except Exception as e:
-            logger.warning("Failed to save schedule_state.json: %s", e)
+        """Load schedule state from the state store (importing the legacy JSON once)."""
+        self.store.migrate_json(NAMESPACE, SCHEDULE_STATE_FILE, _legacy_schedule_items)
+        state = {}
+        for key, config in self.store.load(NAMESPACE).items():
+            guild_id, _, channel_id = key.partition("/")
+            state.setdefault(guild_id, {"channels": {}})["channels"][channel_id] = config
+        return state
+
+    def _save_channel(self, tx, guild_id: str, channel_id: str):
+        """Write one channel's config inside transaction `tx` and update the index."""
+        config = self.schedule_state.get(guild_id, {}).get("channels", {}).get(channel_id)
+        if config is None:
+            tx.delete(NAMESPACE, f"{guild_id}/{channel_id}")
+            self.channel_index.discard((guild_id, channel_id))
+        else:
+            tx.put(NAMESPACE, f"{guild_id}/{channel_id}", config)
+            self.channel_index.set((guild_id, channel_id), [cat for cat, on in config.items() if on])
+
+    def active_categories(self) -> set:
+        """Categories enabled in at least one channel."""
+        return self.channel_index.keys()
+
+    def plan_delivery(self):
+        """
+        Return {(guild_id, channel_id): [categories]} for every channel with
+        something enabled, built from the index in O(subscribed channels).
+        """
+        plan = {}
+        for category in sorted(self.channel_index.keys()):
+            for member in self.channel_index.members(category):
+                plan.setdefault(member, []).append(category)
+        return plan
+
+    def clear_channel(self, tx, guild_id: str, channel_id: str):
+        """Disable every category for a channel (no-op if it was never configured)."""
+        channels = self.schedule_state.get(guild_id, {}).get("channels", {})
+        if channel_id in channels:
+            channels[channel_id] = {}
+            self._save_channel(tx, guild_id, channel_id)
 
     @commands.hybrid_command(name="toggle_scheduled_news", description="Turn scheduled news ON or OFF.")
     @discord.app_commands.describe(state="'on' to enable scheduled news or 'off' to disable")
@@ -95,12 +141,13 @@ class SchedulerCog(commands.Cog):
             user_subs = subscription.subscriptions[user_id]
             for cat in user_subs:
                 channel_config[cat] = True
-            self._save_schedule_state()
+            with self.store.transaction() as tx:
+                self._save_channel(tx, guild_id, channel_id)
             await ctx.send(f"✅ Scheduled news enabled for {len(user_subs)} subscribed categories.")
         else:  # state.lower() == "off"
             # Disable all categories
-            channel_config.clear()
-            self._save_schedule_state()
+            with self.store.transaction() as tx:
+                self.clear_channel(tx, guild_id, channel_id)
             await ctx.send("❌ Scheduled news disabled.")
 
     @tasks.loop(minutes=1)
@@ -123,76 +170,105 @@ class SchedulerCog(commands.Cog):
             logger.warning("Scraper cog not loaded; skipping scheduled news.")
             return
 
-        # Trigger full scrape once at the start
-        success = await scraper.run_scraper(force=False)
-        if not success:
-            logger.warning("Scraper failed during scheduled task.")
-            return
+        # Scrape once at the start, only the categories someone will receive
+        categories = await scraper.plan_categories(self.active_categories())
+        if categories:
+            success = await scraper.run_scraper(force=False, categories=categories)
+            if not success:
+                logger.warning("Scraper failed during scheduled task.")
+                return
 
-        for guild_id, guild_config in self.schedule_state.items():
-            for channel_id_str, channel_config in guild_config.get("channels", {}).items():
+        plan = self.plan_delivery()
+        # Channels that were configured but have everything toggled off get a reminder
+        for member in self.channel_index.idle():
+            plan.setdefault(member, [])
+        logger.info("Delivering scheduled digests to %d channel(s).", len(plan))
+
+        # Load each category's articles once instead of once per channel
+        articles_by_category = {}
+        for category in self.active_categories():
+            articles = await scraper.get_articles_for_category_async(category)
+            articles_by_category[category] = [a for a in articles if a.is_today()]
+
+        semaphore = asyncio.Semaphore(max(1, DELIVERY_CONCURRENCY))
+
+        async def deliver(channel_id_str, enabled_categories):
+            async with semaphore:
+                await self._deliver_to_channel(scraper, news_cog, channel_id_str, enabled_categories, articles_by_category)
+
+        await asyncio.gather(*(deliver(channel_id_str, cats) for (_, channel_id_str), cats in plan.items()))
+        dedupe = self.bot.get_cog("DedupeCog")
+        if dedupe:
+            # retry any marks whose per-digest flush failed
+            await dedupe.store.flush_async()
+
+    async def _deliver_to_channel(self, scraper, news_cog, channel_id_str, enabled_categories, articles_by_category):
+        """Post one channel's scheduled digests (or a reminder if nothing is enabled)."""
+        try:
+            channel_id = int(channel_id_str)
+            channel = self.bot.get_channel(channel_id)
+            if not channel:
+                logger.warning("Channel %d not found.", channel_id)
+                return
+
+            # If no categories are subscribed, send a helpful message
+            if not enabled_categories:
+                available = scraper.get_categories()
+                embed = discord.Embed(
+                    title="📰 No Subscriptions Active",
+                    description="This channel has no categories toggled for scheduled digests.",
+                    color=discord.Color.orange(),
+                )
+                embed.add_field(
+                    name="Available Categories",
+                    value="\n".join([f"• {cat}" for cat in available]),
+                    inline=False,
+                )
+                embed.set_footer(text="Use `/toggle_scheduled_news [category]` to enable digests.")
                 try:
-                    channel_id = int(channel_id_str)
-                    channel = self.bot.get_channel(channel_id)
-                    if not channel:
-                        logger.warning("Channel %d not found.", channel_id)
-                        continue
-
-                    enabled_categories = [cat for cat, enabled in channel_config.items() if enabled]
-                    
-                    # If no categories are subscribed, send a helpful message
-                    if not enabled_categories:
-                        available = scraper.get_categories()
-                        embed = discord.Embed(
-                            title="📰 No Subscriptions Active",
-                            description="This channel has no categories toggled for scheduled digests.",
-                            color=discord.Color.orange(),
-                        )
-                        embed.add_field(
-                            name="Available Categories",
-                            value="\n".join([f"• {cat}" for cat in available]),
-                            inline=False,
-                        )
-                        embed.set_footer(text="Use `/toggle_scheduled_news [category]` to enable digests.")
+                    await channel.send(embed=embed)
+                except Exception as e:
+                    logger.warning("Could not send subscription reminder to channel %d: %s", channel_id, e)
+                return
+
+            for category in enabled_categories:
+                today_articles = articles_by_category.get(category, [])
+
+                if today_articles:
+                    # Send digest using NewsCog (if available)
+                    if news_cog:
                         try:
-                            await channel.send(embed=embed)
+                            await news_cog.send_digest(channel, category, today_articles)
                         except Exception as e:
-                            logger.warning("Could not send subscription reminder to channel %d: %s", channel_id, e)
-                        continue
-
-                    for category in enabled_categories:
-                        articles = scraper.get_articles_for_category(category)
-                        today_articles = [a for a in articles if scraper.is_today(a.get("date", ""))]
-
-                        if today_articles:
-                            # Send digest using NewsCog (if available)
-                            if news_cog:
-                                try:
-                                    await news_cog.send_digest(channel, category, today_articles)
-                                except Exception as e:
-                                    logger.exception("Error sending digest to channel %d for %s: %s", channel_id, category, e)
-                            else:
-                                # Fallback: send plain embed
-                                embed = discord.Embed(
-                                    title=f"📰 {category.capitalize()} - Today's News",
-                                    color=discord.Color.blue(),
-                                )
-                                for i, article in enumerate(today_articles, 1):
-                                    title = article.get("title", "No title")[:256]
-                                    url = article.get("url", "")
-                                    short = article.get("excerpt", "") or (article.get("content", "") or "")[:100]
-                                    embed.add_field(
-                                        name=f"{i}. {title}",
-                                        value=(f"{short}\n[Link]({url})" if url else short),
-                                        inline=False,
-                                    )
-                                embed.set_footer(text=f"📖 Use `/read_full {category}` to read full articles in a thread • {len(today_articles)} articles today")
-                                await channel.send(embed=embed)
-
-                        # small jitter between sends to avoid bursts
-                        await asyncio.sleep(random.uniform(0.5, 1.5))
-                except Exception as e:
-                    logger.exception("Error posting scheduled news to channel %s: %s", channel_id_str, e)
+                            logger.exception("Error sending digest to channel %d for %s: %s", channel_id, category, e)
+                    else:
+                        # Fallback: send plain embed, still skipping already-delivered articles
+                        dedupe = self.bot.get_cog("DedupeCog")
+                        today_articles = collapse(today_articles)
+                        if dedupe:
+                            unsent = set(dedupe.store.filter_unsent(channel_id_str, [story_key(a) for a in today_articles]))
+                            today_articles = [a for a in today_articles if story_key(a) in unsent]
+                            if not today_articles:
+                                continue
+                        title = f"📰 {category.capitalize()} - Today's News"
+                        footer = f"📖 Use `/read_full {category}` to read full articles in a thread • {len(today_articles)} articles today"
+                        # split across messages to stay within Discord's 25 fields / 6000 characters
+                        pages = enrich.digest_pages(today_articles, len(title) + len(footer))
+                        for number, page in enumerate(pages, 1):
+                            embed = discord.Embed(title=title, color=discord.Color.blue())
+                            for name, value in page:
+                                embed.add_field(name=name, value=value, inline=False)
+                            if number == len(pages):
+                                embed.set_footer(text=footer)
+                            await channel.send(embed=embed)
+                        if dedupe:
+                            dedupe.store.mark_sent_many(channel_id_str, [story_key(a) for a in today_articles if a.url])
+                            await dedupe.store.flush_async()
+
+                # small jitter between sends to avoid bursts
+                await asyncio.sleep(random.uniform(*SEND_JITTER))
+        except Exception as e:
+            logger.exception("Error posting scheduled news to channel %s: %s", channel_id_str, e)
 
     @daily_news_task.before_loop
     async def before_daily_news_task(self):
@@ -2,31 +2,127 @@
 Scraper cog: wraps scrape_links.py and scrape_articles.py.
 Prevents concurrent scrapes with asyncio.Lock.
 Supports progress logging and category-specific scraping.
+
+Scrapes are handed to the scraper worker process (scraper/worker.py) when
+one is available, keeping Chromium and big file writes off the bot's event
+loop; otherwise they run in-process.
 """
 import asyncio
-import json
+import discord
 import logging
+import os
+import sys
+import time
 from pathlib import Path
-from datetime import datetime
-from discord.ext import commands
+from datetime import date, datetime
+from discord.ext import commands, tasks
 
 
 logger = logging.getLogger("scraper_cog")
 
-DATA_DIR = Path(__file__).parent.parent / "data"
+# Categories requested on demand within this window are included in scheduled scrapes
+DEMAND_WINDOW_SECONDS = 3 * 24 * 3600
+# Rough wall-clock cost of crawling one category (links + articles)
+EST_CATEGORY_SECONDS = 60
+ARCHIVE_PRUNE_INTERVAL_HOURS = 12
+# "spawn": the bot starts and supervises a worker process; "external": a worker
+# runs on its own (e.g. a separate container sharing data/); "off": scrape in-process
+WORKER_MODE = os.getenv("SCRAPER_WORKER", "spawn").lower()
+WORKER_START_TIMEOUT = 20
+# a worker job running longer than this is treated as hung: the worker is
+# restarted and the scrape runs in-process instead
+WORKER_SCRAPE_TIMEOUT = int(os.getenv("SCRAPER_WORKER_TIMEOUT", "1800"))
+
+from scraper.scrape_links import CATEGORIES
+from scraper import archive, bodies, worker
+from scraper.models import decode_articles
+from scraper.persistence import DATA_DIR, io_stats, read_json, run_io
+from scraper.pipeline import run_pipeline
+from scraper.telemetry import RunTelemetry, load_runs, stage_stats
+
 ARTICLES_FILE = DATA_DIR / "articles.json"
 TODAY_LINKS_FILE = DATA_DIR / "today_links.json"
 
-from scraper.scrape_links import main as scrape_links_main
-from scraper.scrape_articles import main_async as scrape_articles_main_async
-from scraper.scrape_links import CATEGORIES
 
 class ScraperCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self._scrape_lock = asyncio.Lock()
+        # category -> last time a user asked for it via /read_full or /send_digest
+        self._recent_demand = {}
+        self.worker_mode = WORKER_MODE if worker.IPC_AVAILABLE else "off"
+        self._worker_proc = None
+        # (mtime, parsed articles.json); reparsed only when the file changes
+        self._articles_cache = (None, {})
+        # scrapes started by stream_scrape(), referenced until they finish
+        self._stream_tasks = set()
+        self.archive_prune_task.start()
+
+    async def cog_unload(self):
+        self.archive_prune_task.cancel()
+        await self._stop_worker()
 
-    async def run_scraper(self, force: bool = False, categories: list = None, progress_callback=None):
+    async def _stop_worker(self):
+        """Terminate the spawned worker (killing it if it does not exit); external workers are left alone."""
+        if self._worker_proc and self._worker_proc.returncode is None:
+            self._worker_proc.terminate()
+            try:
+                await asyncio.wait_for(self._worker_proc.wait(), timeout=10)
+            except asyncio.TimeoutError:
+                self._worker_proc.kill()
+                await self._worker_proc.wait()
+
+    @tasks.loop(hours=ARCHIVE_PRUNE_INTERVAL_HOURS)
+    async def archive_prune_task(self):
+        """Drop archive shards and article bodies that fell out of the retention window."""
+        try:
+            await run_io(archive.prune)
+            today = [a.url for items in (await self.load_articles_async()).values() for a in items]
+            await run_io(bodies.prune, archive.RETENTION_DAYS, today)
+        except Exception as e:
+            logger.warning("Archive prune failed: %s", e)
+
+    def note_demand(self, categories):
+        """Record on-demand use of categories so scheduled scrapes keep them warm."""
+        now = time.time()
+        for category in categories:
+            self._recent_demand[category] = now
+
+    async def plan_categories(self, scheduled) -> list:
+        """
+        Return the categories worth crawling: those enabled for scheduled
+        delivery plus any requested on demand recently. Logs what is skipped.
+        """
+        cutoff = time.time() - DEMAND_WINDOW_SECONDS
+        recent = {c for c, ts in self._recent_demand.items() if ts >= cutoff}
+        wanted = set(scheduled) | recent
+        planned = [c for c in CATEGORIES if c in wanted]
+        skipped = [c for c in CATEGORIES if c not in wanted]
+        if skipped:
+            logger.info(
+                "Scrape plan: %d/%d categories (%s); skipping %s, saving ~%ds",
+                len(planned),
+                len(CATEGORIES),
+                ", ".join(planned) or "none",
+                ", ".join(skipped),
+                len(skipped) * await self._estimate_category_seconds(),
+            )
+        return planned
+
+    async def _estimate_category_seconds(self) -> float:
+        """Average seconds per category over recent successful runs (fallback: a constant)."""
+        per_category = []
+        for run in await run_io(load_runs, 20):
+            if run.get("ok") and run.get("trigger", "") in ("bot", "worker"):
+                count = len(run.get("categories") or CATEGORIES)
+                per_category.append(run.get("duration", 0) / max(count, 1))
+        if not per_category:
+            return EST_CATEGORY_SECONDS
+        return sum(per_category) / len(per_category)
+
+    async def run_scraper(
+        self, force: bool = False, categories: list = None, progress_callback=None, article_callback=None
+    ):
         """
         Run scraper pipeline (links → articles). Prevent concurrent runs with lock.
         
@@ -34,85 +130,107 @@ class ScraperCog(commands.Cog):
             force: Force rescrape all articles
             categories: List of categories to scrape, or None for all
             progress_callback: Async function(message) for progress updates
+            article_callback: Async function(article) called as each article is extracted
         """
         async with self._scrape_lock:
-            try:
-                target = f"categories: {', '.join(categories)}" if categories else "all categories"
-                msg = f"[SCRAPER] Starting scrape for {target}..."
-                logger.info(msg)
-                if progress_callback:
-                    await progress_callback(msg)
-                
-                # Step 1: Fetch links
-                msg = f"[SCRAPER] Step 1/2: Fetching links for {target}..."
-                logger.info(msg)
-                if progress_callback:
-                    await progress_callback(msg)
-                
-                try:
-                    # Call scrape_links directly
-                    comparison = await scrape_links_main(categories=categories)
-                    
-                    msg = f"[SCRAPER] Found {comparison['total_articles']} articles ({comparison['new_articles']} new)"
-                    logger.info(msg)
-                    if progress_callback:
-                        await progress_callback(msg)
-                        
-                except Exception as e:
-                    error_msg = f"[SCRAPER] Links fetch failed: {str(e)}"
-                    logger.error(error_msg, exc_info=True)
-                    if progress_callback:
-                        await progress_callback(error_msg)
-                    return False
-
-                # Step 2: Scrape articles
-                msg = f"[SCRAPER] Step 2/2: Scraping article content for {target}..."
-                logger.info(msg)
-                if progress_callback:
-                    await progress_callback(msg)
-
+            if self.worker_mode != "off" and await self._ensure_worker():
                 try:
-                    # Call scrape_articles async function directly (no asyncio.run)
-                    await scrape_articles_main_async(
-                        force=force,
-                        categories=categories
+                    ok = await asyncio.wait_for(
+                        worker.request_scrape(force, categories, progress_callback, article_callback=article_callback),
+                        timeout=WORKER_SCRAPE_TIMEOUT,
                     )
-                    
-                    msg = "[SCRAPER] Article scraping completed!"
-                    logger.info(msg)
-                    if progress_callback:
-                        await progress_callback(msg)
-                        
-                except Exception as e:
-                    error_msg = f"[SCRAPER] Article scrape failed: {str(e)}"
-                    logger.error(error_msg, exc_info=True)
-                    if progress_callback:
-                        await progress_callback(error_msg)
-                    return False
-
-                msg = "[SCRAPER] Scrape completed successfully!"
-                logger.info(msg)
-                if progress_callback:
-                    await progress_callback(msg)
-                return True
-                
+                except asyncio.TimeoutError:
+                    # a wedged worker would otherwise hold _scrape_lock, and every later scrape, forever
+                    logger.error("Scraper worker did not finish within %ds; restarting it", WORKER_SCRAPE_TIMEOUT)
+                    await self._stop_worker()
+                    ok = None
+                if ok is not None:
+                    return ok
+            if self.worker_mode != "off":
+                logger.warning("Scraper worker unavailable; scraping in the bot process instead")
+            telemetry = RunTelemetry(trigger="bot", categories=categories)
+            ok = await run_pipeline(force, categories, progress_callback, telemetry, article_callback)
+            telemetry.save(ok=ok)
+            return ok
+
+    async def stream_scrape(self, force: bool = False, categories: list = None):
+        """
+        Run a scrape and yield its events as they happen: ("progress", message),
+        ("article", article) for each extracted article, then ("done", ok).
+        The scrape runs to completion even if the consumer stops early.
+        """
+        events = asyncio.Queue()
+
+        async def progress(message):
+            events.put_nowait(("progress", message))
+
+        async def article(entry):
+            events.put_nowait(("article", entry))
+
+        async def run():
+            ok = False
+            try:
+                ok = await self.run_scraper(force, categories, progress, article)
             except Exception as e:
-                error_msg = f"[SCRAPER] Error: {str(e)}"
-                logger.exception(error_msg)
-                if progress_callback:
-                    await progress_callback(error_msg)
+                logger.exception("Streamed scrape failed: %s", e)
+            finally:
+                events.put_nowait(("done", ok))
+
+        task = asyncio.create_task(run())
+        self._stream_tasks.add(task)
+        task.add_done_callback(self._stream_tasks.discard)
+        while True:
+            event = await events.get()
+            yield event
+            if event[0] == "done":
+                return
+
+    async def _ensure_worker(self) -> bool:
+        """Make sure a worker answers on the socket, (re)starting it in spawn mode."""
+        if await worker.ping():
+            return True
+        if self.worker_mode != "spawn":
+            return False
+        if self._worker_proc is None or self._worker_proc.returncode is not None:
+            logger.info("Starting scraper worker process")
+            self._worker_proc = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "scraper.worker", cwd=str(Path(__file__).parent.parent)
+            )
+        deadline = time.monotonic() + WORKER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._worker_proc.returncode is not None:
+                logger.error("Scraper worker exited with code %s", self._worker_proc.returncode)
                 return False
+            if await worker.ping():
+                return True
+            await asyncio.sleep(0.5)
+        logger.error("Scraper worker did not come up within %ds", WORKER_START_TIMEOUT)
+        return False
+
+    def _articles_mtime(self):
+        try:
+            return ARTICLES_FILE.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_articles(self, mtime):
+        # headlines only; each body is read from the body store when first used
+        articles = decode_articles(read_json(ARTICLES_FILE, {}), content_loader=bodies.load) if mtime else {}
+        self._articles_cache = (mtime, articles)
 
     def load_articles(self):
-        """Load articles.json from disk. Return dict or empty dict on error."""
-        if ARTICLES_FILE.exists():
-            try:
-                with open(ARTICLES_FILE, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning("Failed to load articles.json: %s", e)
-                return {}
-        return {}
+        """Return articles.json as {category: [Article]} (cached until the file changes), or {} if missing/unreadable."""
+        mtime = self._articles_mtime()
+        if mtime != self._articles_cache[0]:
+            self._read_articles(mtime)
+        return self._articles_cache[1]
+
+    async def load_articles_async(self):
+        """load_articles(), parsing a changed file on the persistence thread pool."""
+        mtime = self._articles_mtime()
+        if mtime != self._articles_cache[0]:
+            await run_io(self._read_articles, mtime)
+        return self.load_articles()
 
     def get_categories(self):
         """Return list of available categories."""
@@ -124,6 +242,22 @@ class ScraperCog(commands.Cog):
         articles = self.load_articles()
         return articles.get(category, [])
 
+    async def get_articles_for_category_async(self, category: str):
+        """get_articles_for_category() without parsing on the event loop."""
+        articles = await self.load_articles_async()
+        return articles.get(category, [])
+
+    def articles_for(self, category: str, day) -> list:
+        """
+        Articles for `category` published on `day` (date, datetime or
+        'YYYY-MM-DD'). Today's come from articles.json, earlier days from the
+        archive on disk; nothing is scraped.
+        """
+        key = day.isoformat()[:10] if isinstance(day, (date, datetime)) else str(day)[:10]
+        if key == datetime.now().strftime("%Y-%m-%d"):
+            return [a for a in self.get_articles_for_category(category) if a.is_today()]
+        return archive.articles_for(category, key)
+
     def is_today(self, date_str: str) -> bool:
         """Check if date string contains today's date (simple check)."""
         if not date_str:
@@ -131,6 +265,62 @@ class ScraperCog(commands.Cog):
         today = datetime.now().strftime("%Y-%m-%d")
         return today in date_str
 
+    @commands.hybrid_command(name="scrape_stats", description="Show per-stage scrape timings over recent runs (admin only).")
+    @commands.has_permissions(administrator=True)
+    @discord.app_commands.describe(runs="Number of recent runs to summarise (default 20)")
+    async def scrape_stats(self, ctx, runs: int = 20):
+        history = await run_io(load_runs, max(1, min(runs, 200)))
+        if not history:
+            await ctx.send("ℹ️ No scrape runs recorded yet.")
+            return
+
+        stats = stage_stats(history)
+        lines = [f"{'stage':<18}{'n':>6}{'p50':>9}{'p95':>9}"]
+        for stage, row in sorted(stats.items(), key=lambda kv: -kv[1]["total"]):
+            lines.append(f"{stage:<18}{row['count']:>6}{row['p50']:>8.2f}s{row['p95']:>8.2f}s")
+
+        failed = sum(1 for run in history if not run.get("ok"))
+        embed = discord.Embed(
+            title="📊 Scrape Stats",
+            description="```\n" + "\n".join(lines) + "\n```",
+            color=discord.Color.dark_teal(),
+        )
+        last = history[-1]
+        counters = ", ".join(f"{k}={v}" for k, v in sorted(last.get("counters", {}).items())) or "none"
+        embed.add_field(
+            name="Last run",
+            value=(
+                f"{datetime.fromtimestamp(last['started_at']).strftime('%Y-%m-%d %H:%M')} • "
+                f"{last.get('duration', 0):.1f}s • {'ok' if last.get('ok') else 'failed'}\n"
+                f"Counters: {counters}"
+            ),
+            inline=False,
+        )
+        limiter = last.get("state", {}).get("throttle")
+        if limiter:
+            embed.add_field(
+                name="Fetch throttle (last run)",
+                value=(
+                    f"{limiter['state']} • concurrency {limiter['limit']:.1f} ({limiter['min']}-{limiter['max']}) • "
+                    f"latency {limiter['latency_ewma'] or 0:.1f}s • errors {limiter['error_rate']:.0%}\n"
+                    f"{limiter['increases']} up, {limiter['decreases']} down, "
+                    f"{limiter['trips']} breaker trip(s), paused {limiter['paused_seconds']:.0f}s"
+                ),
+                inline=False,
+            )
+        writes = io_stats()
+        if writes:
+            embed.add_field(
+                name="Bot file writes",
+                value="\n".join(
+                    f"{name}: {row['writes']}× avg {row['seconds'] / row['writes'] * 1000:.0f} ms, max {row['max_seconds'] * 1000:.0f} ms"
+                    for name, row in sorted(writes.items(), key=lambda kv: -kv[1]["seconds"])[:8]
+                )[:1024],
+                inline=False,
+            )
+        embed.set_footer(text=f"{len(history)} run(s), {failed} failed • sorted by total time")
+        await ctx.send(embed=embed)
+
 
 async def setup(bot):
     await bot.add_cog(ScraperCog(bot))
\ No newline at end of file
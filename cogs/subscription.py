@@ -1,46 +1,45 @@
 """
 Subscription cog: /subscribe, /unsubscribe, /subscriptions commands.
-Stores user subscriptions in memory and optionally persists to JSON.
+Stores user subscriptions in memory and persists each change to the shared state store.
 """
 import discord
 from discord.ext import commands
-import json
 import logging
-from pathlib import Path
+
+from scraper.persistence import DATA_DIR
+from state_store import InvertedIndex, get_state_store
 
 logger = logging.getLogger("subscription_cog")
 
-SUBSCRIPTIONS_FILE = Path(__file__).parent.parent / "data" / "user_subscriptions.json"
+SUBSCRIPTIONS_FILE = DATA_DIR / "user_subscriptions.json"
+NAMESPACE = "subscriptions"
 
 
 class SubscriptionCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.store = get_state_store()
         # user_id -> set of categories
         self.subscriptions = self._load_subscriptions()
+        # category -> user_ids, kept in step with every change
+        self.subscribers = InvertedIndex()
+        for user_id, cats in self.subscriptions.items():
+            self.subscribers.set(user_id, cats)
 
     def _load_subscriptions(self):
-        """Load user subscriptions from JSON if exists."""
-        if SUBSCRIPTIONS_FILE.exists():
-            try:
-                with open(SUBSCRIPTIONS_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # Convert lists back to sets
-                    return {user_id: set(cats) for user_id, cats in data.items()}
-            except Exception as e:
-                logger.warning("Failed to load subscriptions: %s", e)
-        return {}
-
-    def _save_subscriptions(self):
-        """Save subscriptions to JSON."""
-        try:
-            SUBSCRIPTIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-            # Convert sets to lists for JSON serialization
-            data = {user_id: list(cats) for user_id, cats in self.subscriptions.items()}
-            with open(SUBSCRIPTIONS_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.warning("Failed to save subscriptions: %s", e)
+        """Load user subscriptions from the state store (importing the legacy JSON once)."""
+        self.store.migrate_json(NAMESPACE, SUBSCRIPTIONS_FILE, lambda data: {u: sorted(c) for u, c in data.items()})
+        return {user_id: set(cats) for user_id, cats in self.store.load(NAMESPACE).items()}
+
+    def _save_subscriptions(self, tx, user_id: str):
+        """Write one user's subscriptions inside transaction `tx` and update the index."""
+        cats = self.subscriptions.get(user_id)
+        if cats:
+            tx.put(NAMESPACE, user_id, sorted(cats))
+            self.subscribers.set(user_id, cats)
+        else:
+            tx.delete(NAMESPACE, user_id)
+            self.subscribers.discard(user_id)
 
     @commands.hybrid_command(name="subscribe", description="Subscribe to news updates for a category or 'all'.")
     @discord.app_commands.describe(category="Category to subscribe to (e.g., 'national') or 'all' for all categories")
@@ -59,9 +58,10 @@ class SubscriptionCog(commands.Cog):
             # Subscribe to all categories
             already_subscribed = self.subscriptions[user_id].copy()
             self.subscriptions[user_id].update(available)
-            self._save_subscriptions()
             new_subs = self.subscriptions[user_id] - already_subscribed
             if new_subs:
+                with self.store.transaction() as tx:
+                    self._save_subscriptions(tx, user_id)
                 await ctx.send(f"✅ Subscribed to all categories ({len(self.subscriptions[user_id])} total).")
             else:
                 await ctx.send(f"ℹ️ Already subscribed to all {len(available)} categories.")
@@ -74,7 +74,8 @@ class SubscriptionCog(commands.Cog):
                 await ctx.send(f"ℹ️ You are already subscribed to '{category}'.")
             else:
                 self.subscriptions[user_id].add(category)
-                self._save_subscriptions()
+                with self.store.transaction() as tx:
+                    self._save_subscriptions(tx, user_id)
                 await ctx.send(f"✅ Subscribed to '{category}'. You now have {len(self.subscriptions[user_id])} subscriptions.")
 
     @commands.hybrid_command(name="unsubscribe", description="Unsubscribe from news updates for a category.")
@@ -86,19 +87,19 @@ class SubscriptionCog(commands.Cog):
             return
 
         self.subscriptions[user_id].discard(category)
-        self._save_subscriptions()
-        
-        # Auto-disable toggle if subscriptions become empty
+        remaining = len(self.subscriptions[user_id])
+
+        # Subscription change and auto-disabling the channel toggle commit together
         scheduler = self.bot.get_cog("SchedulerCog")
-        if scheduler and not self.subscriptions[user_id]:
-            guild_id = str(ctx.guild.id) if ctx.guild else "default"
-            channel_id = str(ctx.channel.id)
-            if guild_id in scheduler.schedule_state and "channels" in scheduler.schedule_state[guild_id]:
-                if channel_id in scheduler.schedule_state[guild_id]["channels"]:
-                    scheduler.schedule_state[guild_id]["channels"][channel_id] = {}
-                    scheduler._save_schedule_state()
-        
-        await ctx.send(f"✅ Unsubscribed from '{category}'. You now have {len(self.subscriptions[user_id])} subscriptions.")
+        with self.store.transaction() as tx:
+            self._save_subscriptions(tx, user_id)
+            if scheduler and not remaining:
+                guild_id = str(ctx.guild.id) if ctx.guild else "default"
+                scheduler.clear_channel(tx, guild_id, str(ctx.channel.id))
+        if not remaining:
+            del self.subscriptions[user_id]
+
+        await ctx.send(f"✅ Unsubscribed from '{category}'. You now have {remaining} subscriptions.")
 
     @commands.hybrid_command(name="subscriptions", description="Show your current category subscriptions.")
     async def subscriptions(self, ctx):
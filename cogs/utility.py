@@ -22,6 +22,7 @@ class UtilityCog(commands.Cog):
             name="📰 News Commands",
             value=(
                 "`/read_full [category]` - Read full articles in a thread for discussion\n"
+                "`/search query [category] [days]` - Search recent articles by keyword\n"
                 "`/categories` - List all available categories\n"
                 "*Scheduled posts send compact digests at 9 AM GMT+8; click 'Show more' to browse or 'Start thread' to discuss*"
             ),
@@ -51,6 +52,7 @@ class UtilityCog(commands.Cog):
             name="🛠️ Utility Commands",
             value=(
                 "`/ping` - Check bot latency\n"
+                "`/scrape_stats [runs]` - Scrape timings per stage (admin)\n"
                 "`/commands` - Show this help message"
             ),
             inline=False,
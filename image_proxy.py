@@ -18,10 +18,11 @@ from urllib.parse import unquote_plus
 import aiohttp
 from aiohttp import web
 
+from scraper.persistence import DATA_DIR
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 logger = logging.getLogger("image_proxy")
 
-DATA_DIR = Path(__file__).parent / "data"
 CACHE_DIR = DATA_DIR / "image_cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -0,0 +1,175 @@
+"""
+Rolling multi-day article archive.
+
+Articles are kept in one gzip-compressed JSON shard per publication day
+(`data/archive/YYYY-MM-DD.json.gz`, {category: [article dict, ...]}) plus a small
+`index.json` of {date: {"categories": {category: count}, "bytes": size}}.
+Shards older than the retention window are pruned.
+
+Shards hold headlines only; an article's url is its reference into the
+body store (`data/bodies/`, kept as long as the archive), so bodies are not
+stored twice. `articles_for()` loads them on first use. Shards written
+before bodies were stored separately still carry `content`; it is used when
+the body store has no copy and dropped once it does.
+"""
+import gzip
+import json
+import logging
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict
+
+try:
+    from scraper import bodies, enrich
+    from scraper.models import decode_articles
+    from scraper.persistence import DATA_DIR
+except ImportError:  # run as a script from scraper/
+    import bodies
+    import enrich
+    from models import decode_articles
+    from persistence import DATA_DIR
+
+logger = logging.getLogger("scrape_archive")
+
+ARCHIVE_DIR = DATA_DIR / "archive"
+INDEX_FILE = ARCHIVE_DIR / "index.json"
+RETENTION_DAYS = int(os.getenv("BORNEO_ARCHIVE_DAYS", "14"))
+
+
+def _day_key(value) -> str:
+    """Normalise a date, datetime or ISO string to 'YYYY-MM-DD'."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10]
+
+
+def _shard_path(day: str) -> Path:
+    return ARCHIVE_DIR / f"{day}.json.gz"
+
+
+def _atomic_write_bytes(path: Path, payload: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, str(path))
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def load_index() -> Dict[str, Any]:
+    if not INDEX_FILE.exists():
+        return {}
+    try:
+        with open(INDEX_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning("Failed to load archive index: %s", e)
+        return {}
+
+
+def _save_index(index: Dict[str, Any]):
+    _atomic_write_bytes(INDEX_FILE, json.dumps(index, indent=2, sort_keys=True).encode("utf-8"))
+
+
+def _load_shard(day) -> Dict[str, list]:
+    """The raw {category: [article dicts]} shard for `day`, or {} if none."""
+    path = _shard_path(_day_key(day))
+    if not path.exists():
+        return {}
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning("Failed to read archive shard %s: %s", path.name, e)
+        return {}
+
+
+def load_day(day) -> Dict[str, list]:
+    """Return {category: [Article]} archived for `day`, or {} if none."""
+    return decode_articles(_load_shard(day), content_loader=bodies.load)
+
+
+def articles_for(category: str, day) -> list:
+    """Archived `category` articles of `day`, with bodies loaded only when used."""
+    items = _load_shard(_day_key(day)).get(category, [])
+    # bodies inlined by older shards, taken out so decoding stays lazy
+    inline = {item.get("url"): item.pop("content") for item in items if item.get("content")}
+
+    def load_body(article) -> str:
+        return bodies.load(article) or inline.get(article.url, "")
+
+    articles = decode_articles({category: items}, content_loader=load_body)[category]
+    for article in articles:
+        # archived before articles were enriched at scrape time
+        if not enrich.is_enriched(article):
+            enrich.enrich(article)
+        article.release_content()
+    return articles
+
+
+def available_dates() -> list:
+    """Archived days, newest first."""
+    return sorted(load_index(), reverse=True)
+
+
+def store_articles(articles: Dict[str, list]) -> int:
+    """
+    Merge {category: [Article]} into the per-day shards, keyed by each
+    article's publication date; an article already archived under the same
+    url is replaced. Bodies are left out: store them with `bodies.store()`
+    first. Returns the number of shards written.
+    """
+    by_day = {}
+    for category, items in articles.items():
+        for article in items:
+            day = article.day
+            if day:
+                by_day.setdefault(day, {}).setdefault(category, []).append(article)
+    if not by_day:
+        return 0
+
+    index = load_index()
+    for day, categories in by_day.items():
+        shard = _load_shard(day)
+        for category, items in categories.items():
+            incoming = {a.url: a.to_dict(content=False) for a in items}
+            kept = [a for a in shard.get(category, []) if a.get("url") not in incoming]
+            for item in kept:
+                if "content" in item and item.get("url") and bodies.body_path(item["url"]).exists():
+                    del item["content"]
+            shard[category] = kept + list(incoming.values())
+        payload = gzip.compress(json.dumps(shard, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        _atomic_write_bytes(_shard_path(day), payload)
+        index[day] = {
+            "categories": {category: len(items) for category, items in shard.items()},
+            "bytes": len(payload),
+        }
+    _save_index(index)
+    return len(by_day)
+
+
+def prune(retention_days: int = RETENTION_DAYS) -> list:
+    """Delete shards older than `retention_days`; returns the pruned days."""
+    cutoff = (datetime.now().date() - timedelta(days=retention_days)).isoformat()
+    index = load_index()
+    on_disk = {p.name[: -len(".json.gz")] for p in ARCHIVE_DIR.glob("*.json.gz")} if ARCHIVE_DIR.exists() else set()
+    pruned = sorted(day for day in set(index) | on_disk if day < cutoff)
+    for day in pruned:
+        try:
+            _shard_path(day).unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning("Failed to delete archive shard %s: %s", day, e)
+            continue
+        index.pop(day, None)
+    if pruned:
+        _save_index(index)
+        logger.info("Pruned %d archive shard(s) older than %s", len(pruned), cutoff)
+    return pruned
@@ -0,0 +1,106 @@
+"""
+Article bodies, stored apart from the headline index.
+
+articles.json holds what listings and digests need (title, url, date,
+excerpt, image); each article's full text is a UTF-8 file under
+`data/bodies/`, named by a hash of its url. Articles decoded with
+`content_loader=bodies.load` read their body only when `content` is first
+used (a /read_full thread, the article picker), so loading the index costs
+headline size, not body size.
+
+Bodies are kept for the archive retention window so archived digests can
+still be read in full; `prune()` drops older ones.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable
+
+try:
+    from scraper.persistence import DATA_DIR
+except ImportError:  # run as a script from scraper/
+    from persistence import DATA_DIR
+
+logger = logging.getLogger("scrape_bodies")
+
+BODIES_DIR = DATA_DIR / "bodies"
+
+
+def body_path(url: str) -> Path:
+    return BODIES_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:20]}.txt"
+
+
+def load(article) -> str:
+    """The stored body of `article`, or '' if there is none. Blocking."""
+    if not article.url:
+        return ""
+    try:
+        return body_path(article.url).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return ""
+    except Exception as e:
+        logger.warning("Failed to read body of %s: %s", article.url, e)
+        return ""
+
+
+def preload(articles: Iterable):
+    """Read the bodies of `articles` now (call through run_io before using `content` on the loop)."""
+    for article in articles:
+        article.content
+
+
+def _write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=path.stem, suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, str(path))
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def store(articles: Iterable, changed: Iterable[str] = ()) -> int:
+    """
+    Write the bodies of `articles` whose url is in `changed`, plus any
+    loaded body not on disk yet (articles.json written before bodies were
+    split out). Bodies that were never loaded are left alone. Returns the
+    number of files written. Blocking.
+    """
+    changed = set(changed)
+    written = 0
+    for article in articles:
+        if not article.url or not article.content_loaded or not article.content:
+            continue
+        path = body_path(article.url)
+        if article.url not in changed and path.exists():
+            continue
+        _write(path, article.content)
+        written += 1
+    return written
+
+
+def prune(retention_days: int, keep: Iterable[str] = ()) -> int:
+    """Delete bodies untouched for `retention_days`, except those of the urls in `keep`."""
+    if not BODIES_DIR.exists():
+        return 0
+    cutoff = time.time() - retention_days * 86400
+    kept = {body_path(url).name for url in keep}
+    removed = 0
+    for path in BODIES_DIR.glob("*.txt"):
+        try:
+            if path.name not in kept and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            logger.warning("Failed to prune body %s: %s", path.name, e)
+    if removed:
+        logger.info("Pruned %d article bodies older than %d days", removed, retention_days)
+    return removed
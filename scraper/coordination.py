@@ -0,0 +1,113 @@
+"""
+Cross-process coordination for scrapes sharing data/.
+
+FileLock is an advisory lock on a file (fcntl.flock on POSIX, msvcrt on
+Windows). The OS drops it when the holding process exits or crashes, so
+there are no stale lockfiles to clean up and no pid checks that break when
+pids are reused (e.g. pid 1 in every Docker container). Waiting is
+async-friendly: the lock is polled without blocking the event loop until
+it is free or the timeout passes.
+
+    lock = FileLock(DATA_DIR / "scrape_links.lock")
+    async with lock.hold(timeout=300):
+        ...
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger("scrape_coordination")
+
+POLL_INTERVAL = 0.5
+
+
+class LockTimeout(Exception):
+    """Raised by FileLock.hold() when another process keeps the lock past the timeout."""
+
+
+class FileLock:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd = None
+
+    @property
+    def locked(self) -> bool:
+        """True while this instance holds the lock."""
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        """Try to take the lock without waiting; returns whether it was taken."""
+        if self._fd is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        # informational only: who holds it, for people looking at data/
+        try:
+            os.ftruncate(fd, 0)
+            os.write(fd, json.dumps({"pid": os.getpid(), "ts": time.time()}).encode("utf-8"))
+        except OSError:
+            pass
+        return True
+
+    async def acquire_async(self, timeout: float = None) -> bool:
+        """Wait (without blocking the loop) up to `timeout` seconds; None waits forever."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        logged = False
+        while not self.acquire():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            if not logged:
+                logger.info("Waiting for %s held by %s", self.path.name, self.holder() or "another process")
+                logged = True
+            await asyncio.sleep(POLL_INTERVAL)
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def holder(self):
+        """Best-effort {"pid", "ts"} of the current holder, as it recorded itself."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    @asynccontextmanager
+    async def hold(self, timeout: float = None):
+        """Hold the lock for the block, waiting up to `timeout`; raises LockTimeout."""
+        if not await self.acquire_async(timeout):
+            raise LockTimeout(f"{self.path.name} is held by {self.holder() or 'another process'}")
+        try:
+            yield self
+        finally:
+            self.release()
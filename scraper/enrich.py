@@ -0,0 +1,163 @@
+"""
+Embed-ready fields, computed once when an article is scraped.
+
+Digests, threads and the article picker render the same article many times
+(once per channel, per reader), and none of what they show changes after
+scraping. `enrich()` works it out up front and stores it on the article:
+
+- `excerpt`: whole sentences up to EXCERPT_CHARS (cut at a word otherwise)
+- `embed_title`: the title clipped to Discord's embed title limit
+- `date_label`: the publication date as shown in embed footers
+- `featured_image`: an absolute http(s) URL, or None
+- `body_chunks`: end offsets splitting the body into embed-sized chunks at
+  paragraph/sentence/word boundaries, so long articles span several embeds
+  instead of being cut off. Offsets (not text) are stored, so the headline
+  index stays small and bodies stay in the body store.
+"""
+import re
+from typing import List
+from urllib.parse import quote, urljoin, urlsplit
+
+# digest excerpts; summarize_articles fills them with a summary of this length
+EXCERPT_CHARS = 200
+# Discord embed limits
+TITLE_LIMIT = 256
+DESCRIPTION_LIMIT = 4096
+FIELD_VALUE_LIMIT = 1024
+EMBED_FIELDS_LIMIT = 25
+# title + description + fields + footer of all embeds in one message
+EMBED_TOTAL_LIMIT = 6000
+DATE_FORMAT = "%d/%m/%Y"
+
+ELLIPSIS = "…"
+# a sentence ends at . ! or ? (plus closing quotes/brackets) followed by whitespace
+SENTENCE_END_RE = re.compile(r"[.!?][\"'”’)\]]*(?=\s)")
+URL_SAFE = ":/?#[]@!$&'()*+,;=%~"
+
+
+def clip(text: str, limit: int) -> str:
+    """`text` cut to at most `limit` characters at a word boundary, with an ellipsis if cut."""
+    text = text or ""
+    if len(text) <= limit:
+        return text
+    cut = text[: limit - len(ELLIPSIS)]
+    space = cut.rfind(" ")
+    if space > limit // 2:
+        cut = cut[:space]
+    return cut.rstrip(" ,;:-") + ELLIPSIS
+
+
+def sentence_ends(text: str) -> List[int]:
+    """Offsets just past each sentence in `text`."""
+    return [m.end() for m in SENTENCE_END_RE.finditer(text)]
+
+
+def make_excerpt(text: str, limit: int = EXCERPT_CHARS) -> str:
+    """The leading whole sentences of `text` that fit in `limit` characters."""
+    text = " ".join((text or "").split())
+    if len(text) <= limit:
+        return text
+    fitting = [end for end in sentence_ends(text) if end <= limit]
+    if fitting:
+        return text[: fitting[-1]]
+    return clip(text, limit)
+
+
+def split_offsets(text: str, limit: int = DESCRIPTION_LIMIT) -> List[int]:
+    """
+    End offsets of consecutive chunks of `text`, each at most `limit`
+    characters, preferring to break after a paragraph, then a sentence,
+    then a word.
+    """
+    ends = []
+    start = 0
+    while len(text) - start > limit:
+        window = text[start : start + limit]
+        cut = window.rfind("\n")
+        if cut < limit // 2:
+            sentences = [end for end in sentence_ends(window) if end >= limit // 2]
+            cut = sentences[-1] if sentences else window.rfind(" ")
+        if cut < limit // 2:
+            cut = limit
+        start += cut
+        ends.append(start)
+    ends.append(len(text))
+    return ends
+
+
+def body_chunks(article) -> List[str]:
+    """The body split into embed descriptions (from the stored offsets when present)."""
+    text = article.content
+    offsets = article.body_chunks if article.body_chunks and article.body_chunks[-1] == len(text) else None
+    chunks = []
+    start = 0
+    for end in offsets or split_offsets(text):
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end
+    return chunks
+
+
+def normalize_image(url: str, base: str = None) -> str | None:
+    """`url` as an absolute, percent-encoded http(s) URL, or None if it is not one."""
+    url = (url or "").strip()
+    if not url or url.startswith("data:"):
+        return None
+    if url.startswith("//"):
+        url = "https:" + url
+    elif base:
+        url = urljoin(base, url)
+    if urlsplit(url).scheme not in ("http", "https"):
+        return None
+    return quote(url, safe=URL_SAFE)
+
+
+def embed_title(article) -> str:
+    return clip(article.title or "No title", TITLE_LIMIT)
+
+
+def date_label(article) -> str:
+    return article.published.strftime(DATE_FORMAT) if article.published else (article.date or "Unknown date")
+
+
+def digest_field(article, position: int) -> tuple:
+    """(name, value) of one digest entry: the title, then the excerpt and a link."""
+    title = article.embed_title or embed_title(article)
+    short = article.excerpt if article.excerpt is not None else make_excerpt(article.content)
+    value = f"{short}\n[Link]({article.url})" if article.url else short
+    return clip(f"{position}. {title}", TITLE_LIMIT), clip(value, FIELD_VALUE_LIMIT) or "\u200b"
+
+
+def digest_pages(articles: list, reserved: int) -> List[list]:
+    """
+    Digest fields for `articles`, split into pages that each fit one embed:
+    at most EMBED_FIELDS_LIMIT fields and EMBED_TOTAL_LIMIT characters,
+    `reserved` of which go to the embed's title and footer.
+    """
+    pages = [[]]
+    used = reserved
+    for position, article in enumerate(articles, 1):
+        name, value = digest_field(article, position)
+        size = len(name) + len(value)
+        if pages[-1] and (len(pages[-1]) >= EMBED_FIELDS_LIMIT or used + size > EMBED_TOTAL_LIMIT):
+            pages.append([])
+            used = reserved
+        pages[-1].append((name, value))
+        used += size
+    return pages if pages[0] else []
+
+
+def is_enriched(article) -> bool:
+    return article.body_chunks is not None
+
+
+def enrich(article):
+    """Compute the article's embed-ready fields from its title, date, image and body."""
+    text = article.content
+    article.excerpt = make_excerpt(text)
+    article.embed_title = embed_title(article)
+    article.date_label = date_label(article)
+    article.featured_image = normalize_image(article.featured_image, article.url)
+    article.body_chunks = split_offsets(text)
+    return article
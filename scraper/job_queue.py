@@ -0,0 +1,160 @@
+"""
+Persistent work queue for article scraping.
+
+Every URL a run intends to fetch is a row in `data/scrape_queue.db` with its
+categories, state and attempt count. A fetched article is committed to its
+row as soon as it is extracted, so a crash, restart or cancellation loses at
+most the page in flight: the next run merges finished rows into
+articles.json and only fetches what is still pending. URLs that keep
+failing across runs are quarantined instead of being retried forever.
+
+States: pending -> done -> (merged, row deleted); pending -> failed (retry
+next run) -> quarantined after MAX_ATTEMPTS.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from scraper.persistence import DATA_DIR
+except ImportError:  # run as a script from scraper/
+    from persistence import DATA_DIR
+
+logger = logging.getLogger("scrape_queue")
+
+QUEUE_DB = DATA_DIR / "scrape_queue.db"
+MAX_ATTEMPTS = 3
+
+
+class ScrapeQueue:
+    def __init__(self, path: Path = QUEUE_DB, max_attempts: int = MAX_ATTEMPTS):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " url TEXT PRIMARY KEY,"
+            " categories TEXT NOT NULL,"
+            " state TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " last_error TEXT,"
+            " result TEXT,"
+            " day TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def discard_stale(self) -> int:
+        """Drop rows queued on earlier days (their links are no longer today's)."""
+        with self._lock:
+            return self._conn.execute("DELETE FROM jobs WHERE day < ?", (self._today(),)).rowcount
+
+    def enqueue(self, url_categories: dict, reset: bool = False):
+        """
+        Queue {url: [categories]}. Rows already queued keep their progress and
+        gain any new categories; with `reset`, finished/failed rows go back
+        to pending (quarantined rows are left alone).
+        """
+        now = time.time()
+        with self._lock:
+            existing = {
+                url: json.loads(cats)
+                for url, cats in self._conn.execute("SELECT url, categories FROM jobs").fetchall()
+            }
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for url, cats in url_categories.items():
+                    if url in existing:
+                        merged = existing[url] + [c for c in cats if c not in existing[url]]
+                        self._conn.execute(
+                            "UPDATE jobs SET categories = ?, updated_at = ? WHERE url = ?",
+                            (json.dumps(merged), now, url),
+                        )
+                        if reset:
+                            self._conn.execute(
+                                "UPDATE jobs SET state = 'pending', result = NULL"
+                                " WHERE url = ? AND state IN ('done', 'failed')",
+                                (url,),
+                            )
+                    else:
+                        self._conn.execute(
+                            "INSERT INTO jobs (url, categories, day, updated_at) VALUES (?, ?, ?, ?)",
+                            (url, json.dumps(list(cats)), self._today(), now),
+                        )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def pending(self) -> list:
+        """URLs still to fetch (new or failed below the attempt limit), oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM jobs WHERE state IN ('pending', 'failed') ORDER BY updated_at, rowid"
+            ).fetchall()
+        return [url for (url,) in rows]
+
+    def complete(self, url: str, article: dict):
+        """Commit a fetched article immediately."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = 'done', result = ?, last_error = NULL, updated_at = ? WHERE url = ?",
+                (json.dumps(article, ensure_ascii=False), time.time(), url),
+            )
+
+    def fail(self, url: str, error: str) -> bool:
+        """Record a failed attempt; returns True if the URL is now quarantined."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET attempts = attempts + 1, last_error = ?, updated_at = ?,"
+                " state = CASE WHEN attempts + 1 >= ? THEN 'quarantined' ELSE 'failed' END"
+                " WHERE url = ?",
+                (error, time.time(), self.max_attempts, url),
+            )
+            row = self._conn.execute("SELECT state FROM jobs WHERE url = ?", (url,)).fetchone()
+        return bool(row and row[0] == "quarantined")
+
+    def finished(self) -> list:
+        """[(url, categories, article)] fetched but not yet merged into articles.json."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, categories, result FROM jobs WHERE state = 'done' ORDER BY updated_at"
+            ).fetchall()
+        return [(url, json.loads(cats), json.loads(result)) for url, cats, result in rows]
+
+    def mark_merged(self, urls):
+        """Forget rows whose articles are now safely in articles.json."""
+        with self._lock:
+            self._conn.executemany("DELETE FROM jobs WHERE url = ? AND state = 'done'", [(u,) for u in urls])
+
+    def quarantined(self) -> list:
+        """[(url, attempts, last_error)] currently quarantined."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT url, attempts, last_error FROM jobs WHERE state = 'quarantined' ORDER BY url"
+            ).fetchall()
+
+    def release_quarantined(self) -> int:
+        """Give quarantined URLs a fresh set of attempts."""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET state = 'pending', attempts = 0 WHERE state = 'quarantined'"
+            ).rowcount
+
+    def counts(self) -> dict:
+        with self._lock:
+            return dict(self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,203 @@
+"""
+The Article record shared by the scraper, archive, search index and cogs.
+
+Storage formats (articles.json, archive shards, the scrape queue, worker
+messages) stay plain JSON objects; `Article.from_dict()` and `to_dict()` are
+the codec between the two. In memory an Article uses __slots__ instead of a
+per-object dict, keeps its publication date parsed, shares interned category
+names (and identical category tuples) across articles, and can defer its body:
+with a `content_loader`, `content` is only read when first used.
+"""
+import sys
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+
+# identical category lists share one tuple of interned names
+_CATEGORY_TUPLES = {}
+
+
+def intern_categories(categories: Iterable[str]) -> tuple:
+    key = tuple(sys.intern(str(c)) for c in categories or ())
+    return _CATEGORY_TUPLES.setdefault(key, key)
+
+
+def parse_date(text: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(text)
+    except (TypeError, ValueError):
+        return None
+
+
+class Article:
+    __slots__ = (
+        "url",
+        "title",
+        "published",
+        "_date_text",
+        "_content",
+        "_content_loader",
+        "excerpt",
+        "embed_title",
+        "date_label",
+        "body_chunks",
+        "featured_image",
+        "featured_caption",
+        "fingerprint",
+        "modified_time",
+        "etag",
+        "last_modified",
+        "_categories",
+        "duplicate_of",
+    )
+
+    # optional fields, written to storage only when set; the embed-ready ones
+    # (excerpt, embed_title, date_label, body_chunks) come from scraper.enrich
+    _OPTIONAL = (
+        "excerpt",
+        "embed_title",
+        "date_label",
+        "body_chunks",
+        "featured_image",
+        "featured_caption",
+        "fingerprint",
+        "modified_time",
+        "etag",
+        "last_modified",
+        "duplicate_of",
+    )
+
+    def __init__(
+        self,
+        url: str,
+        title: str = "",
+        date: str = "",
+        content: str = None,
+        content_loader: Callable[["Article"], str] = None,
+        categories: Iterable[str] = (),
+        **fields,
+    ):
+        self.url = url
+        self.title = title or ""
+        self.date = date
+        self._content = content
+        self._content_loader = content_loader
+        self.categories = categories
+        for name in self._OPTIONAL:
+            setattr(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError(f"Unknown Article field(s): {', '.join(fields)}")
+
+    def __repr__(self):
+        return f"Article({self.url!r}, {self.title[:40]!r})"
+
+    @property
+    def date(self) -> str:
+        """The publication date as stored (ISO 8601 when the site provides one)."""
+        if self._date_text is not None:
+            return self._date_text
+        return self.published.isoformat() if self.published else ""
+
+    @date.setter
+    def date(self, value: str):
+        self.published = parse_date(value)
+        # keep the original text only when isoformat() would not reproduce it
+        if self.published is not None and self.published.isoformat() == value:
+            self._date_text = None
+        else:
+            self._date_text = value or ""
+
+    @property
+    def categories(self) -> tuple:
+        return self._categories
+
+    @categories.setter
+    def categories(self, value: Iterable[str]):
+        self._categories = intern_categories(value)
+
+    @property
+    def day(self) -> str:
+        """'YYYY-MM-DD' of publication ('' if unknown)."""
+        if self.published is not None:
+            return self.published.date().isoformat()
+        text = (self._date_text or "")[:10]
+        return text if parse_date(text) else ""
+
+    def is_today(self) -> bool:
+        return self.day == datetime.now().strftime("%Y-%m-%d")
+
+    @property
+    def content(self) -> str:
+        """The article body, loaded on first access when the article was decoded lazily."""
+        if self._content is None and self._content_loader is not None:
+            self._content = self._content_loader(self) or ""
+        return self._content or ""
+
+    @content.setter
+    def content(self, value: str):
+        self._content = value
+
+    @property
+    def content_loaded(self) -> bool:
+        return self._content is not None
+
+    def release_content(self):
+        """Drop a lazily loaded body again (it is reloaded on the next access)."""
+        if self._content_loader is not None:
+            self._content = None
+
+    @classmethod
+    def from_dict(cls, data: Dict, content_loader: Callable[["Article"], str] = None) -> "Article":
+        """Decode a stored article. With `content_loader`, a missing body is fetched on demand."""
+        return cls(
+            url=data.get("url") or "",
+            title=data.get("title") or "",
+            date=data.get("date") or "",
+            content=data.get("content"),
+            content_loader=content_loader,
+            categories=data.get("categories") or (),
+            **{name: data.get(name) for name in cls._OPTIONAL},
+        )
+
+    def to_dict(self, content: bool = True) -> Dict:
+        """Encode for storage; `content=False` leaves the body out."""
+        data = {"url": self.url, "title": self.title, "date": self.date}
+        if content:
+            data["content"] = self.content
+        for name in self._OPTIONAL:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        if self.categories:
+            data["categories"] = list(self.categories)
+        return data
+
+
+def decode_articles(data: Dict, content_loader: Callable[[Article], str] = None) -> Dict[str, list]:
+    """
+    Decode stored {category: [article dicts]}. A story listed under several
+    categories becomes one shared Article object.
+    """
+    by_url = {}
+    result = {}
+    for category, items in (data or {}).items():
+        decoded = []
+        for item in items or ():
+            if isinstance(item, Article):
+                decoded.append(item)
+                continue
+            if not isinstance(item, dict):
+                continue
+            url = item.get("url")
+            article = by_url.get(url) if url else None
+            if article is None:
+                article = Article.from_dict(item, content_loader)
+                if url:
+                    by_url[url] = article
+            decoded.append(article)
+        result[sys.intern(category)] = decoded
+    return result
+
+
+def encode_articles(articles: Dict[str, list], content: bool = True) -> Dict[str, list]:
+    """Encode {category: [Article]} for storage."""
+    return {category: [a.to_dict(content) for a in items] for category, items in articles.items()}
@@ -0,0 +1,161 @@
+"""
+Near-duplicate story detection across categories.
+
+Each article body is reduced to hashed word shingles, summarised as a
+MinHash signature, and bucketed with LSH (bands of rows), so candidate
+pairs are found in roughly linear time instead of comparing every pair.
+Candidates whose estimated Jaccard similarity clears the threshold are
+linked to one canonical article via a `duplicate_of` url.
+
+Signatures are cached per url together with the article's content
+fingerprint (`data/minhash_signatures.json`), so a run only shingles and
+hashes new or changed articles; unchanged ones are linked without reading
+their bodies.
+"""
+import logging
+import random
+import re
+import zlib
+from pathlib import Path
+
+try:
+    from scraper.persistence import DATA_DIR, read_json, write_json_atomic
+except ImportError:  # run as a script from scraper/
+    from persistence import DATA_DIR, read_json, write_json_atomic
+
+logger = logging.getLogger("near_duplicates")
+
+SIGNATURES_FILE = DATA_DIR / "minhash_signatures.json"
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: pairs around 0.5+ similarity become candidates
+SHINGLE_WORDS = 5
+THRESHOLD = 0.8
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> set:
+    """Hashed word n-grams of `text` (lowercased)."""
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i : i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+
+def minhash(shingle_set: set) -> tuple:
+    """MinHash signature with NUM_PERM universal hash permutations."""
+    if not shingle_set:
+        return ()
+    return tuple(min([(a * s + b) % _PRIME for s in shingle_set]) & _MAX_HASH for a, b in _PERMUTATIONS)
+
+
+def similarity(sig_a: tuple, sig_b: tuple) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def signature(article, cache: dict = None) -> tuple:
+    """MinHash of the article's title and body, reused from `cache` while its fingerprint is unchanged."""
+    key = article.fingerprint
+    if cache is not None and key:
+        hit = cache.get(article.url)
+        if hit and hit[0] == key:
+            return tuple(hit[1])
+    sig = minhash(shingles(f"{article.title} {article.content}"))
+    if cache is not None and key:
+        cache[article.url] = [key, list(sig)]
+    return sig
+
+
+def link_duplicates(articles: dict, threshold: float = THRESHOLD, cache: dict = None) -> int:
+    """
+    Annotate {category: [Article]} in place: near-duplicates of an earlier
+    article get `duplicate_of` set to that canonical article's url (the first
+    one seen, in category order). `cache` ({url: [fingerprint, signature]})
+    supplies and collects signatures. Returns the number of articles linked.
+    """
+    rows = NUM_PERM // BANDS
+    buckets = {}
+    canonical = []  # (url, signature)
+    signatures = {}
+    linked = 0
+
+    for items in articles.values():
+        for article in items:
+            url = article.url
+            article.duplicate_of = None
+            if not url:
+                continue
+            if url in signatures:
+                # same story listed under another category: identical by definition
+                if signatures[url][0] != url:
+                    article.duplicate_of = signatures[url][0]
+                continue
+            sig = signature(article, cache)
+            if not sig:
+                signatures[url] = (url, sig)
+                continue
+
+            match = None
+            candidates = set()
+            for band in range(BANDS):
+                key = (band, sig[band * rows : (band + 1) * rows])
+                candidates.update(buckets.get(key, ()))
+            for index in sorted(candidates):
+                other_url, other_sig = canonical[index]
+                if similarity(sig, other_sig) >= threshold:
+                    match = other_url
+                    break
+
+            if match:
+                article.duplicate_of = match
+                signatures[url] = (match, sig)
+                linked += 1
+                continue
+
+            index = len(canonical)
+            canonical.append((url, sig))
+            signatures[url] = (url, sig)
+            for band in range(BANDS):
+                buckets.setdefault((band, sig[band * rows : (band + 1) * rows]), []).append(index)
+    return linked
+
+
+def link_duplicates_cached(articles: dict, path: Path = SIGNATURES_FILE) -> int:
+    """
+    link_duplicates() with signatures cached in `path`; the cache keeps only
+    the urls in `articles`. Blocking (run it through run_io).
+    """
+    cache = read_json(path, {}) or {}
+    linked = link_duplicates(articles, cache=cache)
+    urls = {a.url for items in articles.values() for a in items}
+    try:
+        write_json_atomic(path, {url: entry for url, entry in cache.items() if url in urls})
+    except Exception as e:
+        logger.warning("Failed to save MinHash signatures: %s", e)
+    return linked
+
+
+def story_key(article) -> str:
+    """Key identifying the story an article tells (canonical url when linked)."""
+    return article.duplicate_of or article.url
+
+
+def collapse(articles: list) -> list:
+    """Keep the first article of each story."""
+    seen = set()
+    result = []
+    for article in articles:
+        key = story_key(article)
+        if key in seen:
+            continue
+        seen.add(key)
+        result.append(article)
+    return result
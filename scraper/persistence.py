@@ -0,0 +1,130 @@
+"""
+JSON persistence off the event loop.
+
+Serialisation and file I/O run on a small dedicated thread pool so the bot
+(and the scrapers' Playwright loop) keep running while large files are
+written. orjson is used when installed, falling back to the stdlib json
+module. Machine-read files are written compact; pass `pretty=True` for
+files people open by hand.
+
+Every write is timed; `io_stats()` returns per-file counters for this
+process.
+
+Callers must hand over data they will not mutate while the write runs
+(a fresh dict or a snapshot), because serialisation happens on another
+thread.
+"""
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+logger = logging.getLogger("persistence")
+
+# the bot, the scraper worker, CLI runs and benchmarks all read and write here
+DATA_DIR = Path(os.getenv("BORNEO_DATA_DIR") or Path(__file__).parent.parent / "data")
+
+IO_WORKERS = 2
+# writes slower than this are logged at INFO so stalls show up in normal logs
+SLOW_WRITE_SECONDS = 0.5
+
+_executor = None
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="persist")
+    return _executor
+
+
+def dumps(data: Any, pretty: bool = False) -> bytes:
+    """Serialise to UTF-8 JSON bytes (non-ASCII kept as-is)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(payload) -> Any:
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def record_write(name: str, seconds: float, size: int = 0):
+    """Add one timed write of `name` to the stats (also used for SQLite commits)."""
+    with _stats_lock:
+        row = _stats.setdefault(name, {"writes": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes": 0})
+        row["writes"] += 1
+        row["seconds"] += seconds
+        row["max_seconds"] = max(row["max_seconds"], seconds)
+        row["bytes"] = size
+    level = logging.INFO if seconds >= SLOW_WRITE_SECONDS else logging.DEBUG
+    logger.log(level, "Wrote %s (%d bytes) in %.3fs", name, size, seconds)
+
+
+def io_stats() -> dict:
+    """{file name: {"writes", "seconds", "max_seconds", "bytes"}} since process start."""
+    with _stats_lock:
+        return {name: dict(row) for name, row in _stats.items()}
+
+
+def write_json_atomic(path: Path, data: Any, pretty: bool = False):
+    """Serialise `data` and atomically replace `path` (temp file + os.replace). Blocking."""
+    start = time.perf_counter()
+    payload = dumps(data, pretty)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=path.stem, suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, str(path))
+    except Exception:
+        try:
+            os.remove(tmp)
+        except Exception:
+            pass
+        raise
+    record_write(path.name, time.perf_counter() - start, len(payload))
+
+
+def read_json(path: Path, default: Any = None) -> Any:
+    """Parse `path`, returning `default` if it is missing or unreadable. Blocking."""
+    try:
+        with open(path, "rb") as f:
+            return loads(f.read())
+    except FileNotFoundError:
+        return default
+    except Exception as e:
+        logger.warning("Failed to read %s: %s", path.name, e)
+        return default
+
+
+async def run_io(func, *args):
+    """Run a blocking persistence call on the I/O thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), func, *args)
+
+
+async def write_json(path: Path, data: Any, pretty: bool = False):
+    """write_json_atomic on the I/O thread pool."""
+    await run_io(write_json_atomic, path, data, pretty)
+
+
+async def load_json(path: Path, default: Any = None) -> Any:
+    """read_json on the I/O thread pool."""
+    return await run_io(read_json, path, default)
@@ -0,0 +1,88 @@
+"""
+The scrape pipeline (links -> articles) shared by the bot's in-process
+fallback and the standalone scraper worker.
+"""
+import logging
+
+from scraper.scrape_articles import main_async as scrape_articles_main_async
+from scraper.scrape_links import main as scrape_links_main
+from scraper.telemetry import RunTelemetry
+
+logger = logging.getLogger("scrape_pipeline")
+
+
+async def run_pipeline(
+    force: bool, categories, progress_callback, telemetry: RunTelemetry, article_callback=None
+) -> bool:
+    """
+    Run links → articles once, recording spans into `telemetry`. Returns success.
+    `article_callback(article)` is awaited for each article as it is extracted.
+    """
+    try:
+        target = f"categories: {', '.join(categories)}" if categories else "all categories"
+        msg = f"[SCRAPER] Starting scrape for {target}..."
+        logger.info(msg)
+        if progress_callback:
+            await progress_callback(msg)
+        
+        # Step 1: Fetch links
+        msg = f"[SCRAPER] Step 1/2: Fetching links for {target}..."
+        logger.info(msg)
+        if progress_callback:
+            await progress_callback(msg)
+        
+        try:
+            # Call scrape_links directly
+            comparison = await scrape_links_main(categories=categories, telemetry=telemetry)
+            
+            msg = f"[SCRAPER] Found {comparison['total_articles']} articles ({comparison['new_articles']} new)"
+            logger.info(msg)
+            if progress_callback:
+                await progress_callback(msg)
+                
+        except Exception as e:
+            error_msg = f"[SCRAPER] Links fetch failed: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            if progress_callback:
+                await progress_callback(error_msg)
+            return False
+
+        # Step 2: Scrape articles
+        msg = f"[SCRAPER] Step 2/2: Scraping article content for {target}..."
+        logger.info(msg)
+        if progress_callback:
+            await progress_callback(msg)
+
+        try:
+            # Call scrape_articles async function directly (no asyncio.run)
+            await scrape_articles_main_async(
+                force=force,
+                categories=categories,
+                telemetry=telemetry,
+                on_article=article_callback,
+            )
+            
+            msg = "[SCRAPER] Article scraping completed!"
+            logger.info(msg)
+            if progress_callback:
+                await progress_callback(msg)
+                
+        except Exception as e:
+            error_msg = f"[SCRAPER] Article scrape failed: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            if progress_callback:
+                await progress_callback(error_msg)
+            return False
+
+        msg = "[SCRAPER] Scrape completed successfully!"
+        logger.info(msg)
+        if progress_callback:
+            await progress_callback(msg)
+        return True
+        
+    except Exception as e:
+        error_msg = f"[SCRAPER] Error: {str(e)}"
+        logger.exception(error_msg)
+        if progress_callback:
+            await progress_callback(error_msg)
+        return False
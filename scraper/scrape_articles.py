@@ -1,20 +1,42 @@
 import argparse
 import asyncio
-import atexit
-import json
+import hashlib
 import logging
-import os
-import tempfile
+import re
 import time
-from datetime import datetime
-from pathlib import Path
 from typing import Dict, Any
 
+import aiohttp
 from playwright.async_api import (
     async_playwright,
     TimeoutError as PlaywrightTimeoutError,
 )
 
+try:
+    from scraper import archive, bodies, enrich, near_duplicates, summarize_articles
+    from scraper.coordination import FileLock
+    from scraper.job_queue import ScrapeQueue
+    from scraper.models import Article, decode_articles, encode_articles
+    from scraper.persistence import DATA_DIR, load_json, run_io, write_json
+    from scraper.search_index import get_search_index
+    from scraper.telemetry import RunTelemetry
+    from scraper import throttle
+    from scraper.throttle import AdaptiveThrottle
+except ImportError:  # run as a script from scraper/
+    import archive
+    import bodies
+    import enrich
+    import near_duplicates
+    import summarize_articles
+    from coordination import FileLock
+    from job_queue import ScrapeQueue
+    from models import Article, decode_articles, encode_articles
+    from persistence import DATA_DIR, load_json, run_io, write_json
+    from search_index import get_search_index
+    from telemetry import RunTelemetry
+    import throttle
+    from throttle import AdaptiveThrottle
+
 try:
     import jsonschema
     from jsonschema import validate
@@ -23,68 +45,17 @@ try:
 except Exception:
     JSONSCHEMA_AVAILABLE = False
 
-DATA_DIR = Path(__file__).parent.parent / "data"
 TODAY_LINKS_FILE = DATA_DIR / "today_links.json"
 ARTICLES_FILE = DATA_DIR / "articles.json"
 ARTICLES_META_FILE = DATA_DIR / "articles_meta.json"
 LOCK_FILE = DATA_DIR / "scrape_articles.lock"
+# How long to wait for another process's article scrape before giving up
+LOCK_WAIT_SECONDS = 15 * 60
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 logger = logging.getLogger("scrape_articles")
 
 
-def atomic_write(path: Path, data: Any):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    fd, tmp = tempfile.mkstemp(prefix=path.stem, suffix=".tmp", dir=str(path.parent))
-    try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        os.replace(tmp, str(path))
-    except Exception:
-        if os.path.exists(tmp):
-            try:
-                os.remove(tmp)
-            except Exception:
-                pass
-        raise
-
-
-def check_and_create_lock():
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    if LOCK_FILE.exists():
-        try:
-            with open(LOCK_FILE, "r", encoding="utf-8") as f:
-                payload = json.load(f)
-            pid = int(payload.get("pid", 0))
-            if pid:
-                # check if process exists
-                try:
-                    os.kill(pid, 0)
-                    logger.error(
-                        "Lockfile exists and process %d is still running. Exiting.", pid
-                    )
-                    return False
-                except OSError:
-                    logger.info("Stale lockfile found (pid %d). Overwriting.", pid)
-        except Exception:
-            logger.info("Could not read existing lockfile, overwriting.")
-
-    with open(LOCK_FILE, "w", encoding="utf-8") as f:
-        json.dump({"pid": os.getpid(), "ts": time.time()}, f)
-    return True
-
-
-def remove_lock():
-    try:
-        if LOCK_FILE.exists():
-            LOCK_FILE.unlink()
-    except Exception:
-        pass
-
-
-atexit.register(remove_lock)
-
-
 def validate_today_links(data: Dict[str, Any]):
     if not JSONSCHEMA_AVAILABLE:
         return True
@@ -100,39 +71,146 @@ def validate_today_links(data: Dict[str, Any]):
         return False
 
 
-def is_today_article(date_str: str) -> bool:
-    """Check if article date is from today."""
-    if not date_str:
+class SiteStatusError(Exception):
+    """The site answered an article request with an HTTP error status."""
+
+    def __init__(self, url: str, status: int, retry_after: str = None):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def fetch_outcome(error: Exception) -> str:
+    """Classify a failed fetch for the throttle: overload (timeout/429/5xx) or a page error."""
+    if isinstance(error, PlaywrightTimeoutError):
+        return throttle.TIMEOUT
+    if isinstance(error, SiteStatusError):
+        if error.status == 429:
+            return throttle.THROTTLED
+        if error.status >= 500:
+            return throttle.SERVER_ERROR
+    return throttle.ERROR
+
+
+def parse_retry_after(value) -> float | None:
+    """Seconds from a Retry-After header in its delta-seconds form (HTTP dates are ignored)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+async def load_cached_articles() -> Dict[str, list]:
+    """{category: [Article]} from articles.json; bodies load from the body store when used."""
+    return decode_articles(await load_json(ARTICLES_FILE, {}), content_loader=bodies.load)
+
+
+def content_fingerprint(article: Article) -> str:
+    """Hash of the fields a reader sees; changes when an article is edited."""
+    parts = (article.title, article.content, article.featured_image or "")
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def fill_fingerprints(articles):
+    """Fingerprint articles saved before fingerprints were stored; reads their bodies. Blocking."""
+    for article in articles:
+        if not article.fingerprint:
+            article.fingerprint = content_fingerprint(article)
+            article.release_content()
+
+
+META_TAG_RE = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+META_CONTENT_RE = re.compile(r"""content\s*=\s*["']([^"']*)["']""", re.IGNORECASE)
+PROBE_HEADERS = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36"}
+
+
+def extract_modified_time(html: str) -> str | None:
+    """Return the article:modified_time meta value from raw HTML, if present."""
+    for tag in META_TAG_RE.findall(html):
+        if "article:modified_time" in tag:
+            match = META_CONTENT_RE.search(tag)
+            if match:
+                return match.group(1)
+    return None
+
+
+async def probe_unchanged(session: aiohttp.ClientSession, article: Article, timeout: int) -> bool:
+    """
+    Cheaply check whether a cached article is unchanged, without a browser.
+
+    Sends a conditional GET (ETag / Last-Modified from the last extraction);
+    a 304, or a page whose article:modified_time matches the cached one,
+    counts as unchanged. Anything else (including errors) means re-extract.
+    """
+    headers = dict(PROBE_HEADERS)
+    if article.etag:
+        headers["If-None-Match"] = article.etag
+    if article.last_modified:
+        headers["If-Modified-Since"] = article.last_modified
+    try:
+        async with session.get(
+            article.url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout / 1000)
+        ) as resp:
+            if resp.status == 304:
+                return True
+            if resp.status != 200:
+                return False
+            html = await resp.text()
+    except Exception as e:
+        logger.debug("Refresh probe failed for %s: %s", article.url, e)
         return False
-    today = datetime.now().strftime("%Y-%m-%d")
-    return today in date_str
+    modified = extract_modified_time(html)
+    return bool(modified and modified == article.modified_time)
 
 
-def load_cached_articles():
-    if ARTICLES_FILE.exists():
-        try:
-            with open(ARTICLES_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.warning("Failed to load cached articles: %s", e)
-            return {}
-    return {}
+async def find_stale_articles(cached: list, timeout: int, concurrency: int = 5) -> set:
+    """Probe cached articles concurrently; return the URLs that need re-extraction."""
+    semaphore = asyncio.Semaphore(concurrency)
+    stale = set()
+
+    async def probe(session, article):
+        async with semaphore:
+            if not await probe_unchanged(session, article, timeout):
+                stale.add(article.url)
+
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(probe(session, a) for a in cached))
+    return stale
+
+
+def article_entry(article: Article, categories: list) -> Article:
+    """Finish a freshly extracted article for articles.json: categories, fingerprint and embed-ready fields."""
+    article.categories = categories
+    article.fingerprint = content_fingerprint(article)
+    return enrich.enrich(article)
+
+
+async def emit_article(on_article, entry: Article):
+    """Hand an extracted article to the caller's callback; its failures never stop the scrape."""
+    if on_article is None:
+        return
+    try:
+        await on_article(entry)
+    except Exception as e:
+        logger.warning("Article callback failed for %s: %s", entry.url, e)
 
 
 def get_cached_url_titles(articles: Dict[str, Any]):
     cached = set()
     for category_articles in articles.values():
         for article in category_articles:
-            url = article.get("url") if isinstance(article, dict) else None
-            if url:
-                cached.add(url)
+            if article.url:
+                cached.add(article.url)
     return cached
 
 
 async def fetch_article_details(
     page, url: str, timeout: int = 15000
-) -> Dict[str, Any] | None:
-    await page.goto(url, timeout=timeout)
+) -> Article | None:
+    response = await page.goto(url, timeout=timeout)
+    headers = response.headers if response else {}
+    if response is not None and response.status >= 400:
+        raise SiteStatusError(url, response.status, headers.get("retry-after"))
     await page.wait_for_selector(".tdb-title-text", timeout=5000)
     title_el = await page.query_selector(".tdb-title-text")
     title_text = (await title_el.inner_text()).strip() if title_el else ""
@@ -169,23 +247,59 @@ async def fetch_article_details(
         if figcap:
             featured_caption = await figcap.inner_text()
 
-    return {
-        "title": title_text,
-        "date": datetime_attr,
-        "content": content_text,
-        "featured_image": featured_image_url,
-        "featured_caption": featured_caption,
-    }
+    modified_el = await page.query_selector('meta[property="article:modified_time"]')
+    modified_time = await modified_el.get_attribute("content") if modified_el else None
+
+    return Article(
+        url=url,
+        title=title_text,
+        date=datetime_attr,
+        content=content_text,
+        featured_image=featured_image_url,
+        featured_caption=featured_caption,
+        modified_time=modified_time,
+        etag=headers.get("etag"),
+        last_modified=headers.get("last-modified"),
+    )
 
 
 async def fetch_with_retries(
-    page, url: str, retries: int = 2, backoff_base: float = 1.0, timeout: int = 15000
+    page,
+    url: str,
+    retries: int = 2,
+    backoff_base: float = 1.0,
+    timeout: int = 15000,
+    telemetry: RunTelemetry = None,
+    limiter: AdaptiveThrottle = None,
 ):
+    """
+    Fetch one article, retrying transient failures with exponential backoff.
+    With a shared `limiter`, every attempt waits for a slot and reports its
+    latency and outcome, so site-wide trouble slows all workers down.
+    """
+    telemetry = telemetry or RunTelemetry()
     attempt = 0
     while True:
         try:
-            return await fetch_article_details(page, url, timeout=timeout)
+            if limiter is None:
+                with telemetry.span("article_fetch", attempt=attempt + 1):
+                    return await fetch_article_details(page, url, timeout=timeout)
+            async with limiter.slot():
+                start = time.perf_counter()
+                try:
+                    with telemetry.span("article_fetch", attempt=attempt + 1):
+                        article = await fetch_article_details(page, url, timeout=timeout)
+                except Exception as e:
+                    limiter.record(
+                        fetch_outcome(e),
+                        time.perf_counter() - start,
+                        retry_after=parse_retry_after(getattr(e, "retry_after", None)),
+                    )
+                    raise
+                limiter.record(throttle.OK, time.perf_counter() - start)
+                return article
         except PlaywrightTimeoutError as e:
+            telemetry.count("timeouts")
             attempt += 1
             if attempt > retries:
                 logger.exception("Timeout fetching %s after %d attempts", url, attempt)
@@ -205,8 +319,11 @@ async def fetch_with_retries(
                 attempt,
                 retries,
             )
-            await asyncio.sleep(wait)
+            telemetry.count("retries")
+            with telemetry.span("retry_backoff"):
+                await asyncio.sleep(wait)
         except Exception as e:
+            telemetry.count("errors")
             attempt += 1
             if attempt > retries:
                 logger.exception(
@@ -222,7 +339,71 @@ async def fetch_with_retries(
                 retries,
                 e,
             )
-            await asyncio.sleep(wait)
+            telemetry.count("retries")
+            with telemetry.span("retry_backoff"):
+                await asyncio.sleep(wait)
+
+
+async def fetch_pool(
+    browser,
+    work: list,
+    queue: ScrapeQueue,
+    retries: int,
+    timeout: int,
+    telemetry: RunTelemetry,
+    url_categories: dict = None,
+    on_article=None,
+):
+    """
+    Fetch `work` with a pool of workers, one browser context each, sharing an
+    AdaptiveThrottle that decides how many fetch at once. Results go straight
+    into the scrape queue (and to `on_article` as they arrive); the
+    throttle's final state goes into telemetry.
+    """
+    url_categories = url_categories or {}
+    limiter = AdaptiveThrottle()
+    links = asyncio.Queue()
+    for item in enumerate(work, 1):
+        links.put_nowait(item)
+
+    async def worker():
+        context = None
+        try:
+            while not links.empty():
+                index, link = links.get_nowait()
+                if context is None:
+                    context = await browser.new_context()
+                    page = await context.new_page()
+                logger.info("Scraping %d/%d: %s", index, len(work), link)
+
+                # Clear cookies before each article to bypass paywall
+                await context.clear_cookies()
+
+                article = await fetch_with_retries(
+                    page, link, retries=retries, timeout=timeout, telemetry=telemetry, limiter=limiter
+                )
+                if article:
+                    queue.complete(link, article.to_dict())
+                    await emit_article(on_article, article_entry(article, url_categories.get(link, [])))
+                elif queue.fail(link, "fetch failed after retries"):
+                    telemetry.count("quarantined")
+                    logger.warning(
+                        "Quarantined %s after %d failed runs; use --retry-quarantined to try again",
+                        link,
+                        queue.max_attempts,
+                    )
+        finally:
+            if context is not None:
+                await context.close()
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for _ in range(min(limiter.maximum, len(work))):
+                group.create_task(worker())
+    finally:
+        telemetry.set_state("throttle", limiter.snapshot())
+        if limiter.trips:
+            telemetry.count("breaker_trips", limiter.trips)
 
 
 async def scrape_all_articles(
@@ -230,16 +411,55 @@ async def scrape_all_articles(
     timeout: int = 15000,
     retries: int = 2,
     categories: list = None,
+    telemetry: RunTelemetry = None,
+    refresh: bool = False,
+    retry_quarantined: bool = False,
+    on_article=None,
+):
+    """
+    Scrape article pages listed in today_links.json into articles.json.
+
+    `on_article`, an async callable, receives each article entry as soon as
+    it is extracted (before articles.json is written), so callers can show
+    results while the rest of the run is still fetching.
+
+    With `refresh`, cached articles are probed cheaply and only those that
+    look edited are re-extracted; entries are rewritten only when their
+    content fingerprint changed. Progress is checkpointed per article in
+    the scrape queue, so an interrupted run resumes where it stopped.
+
+    Only one article scrape runs at a time across processes; a second one
+    waits up to LOCK_WAIT_SECONDS and then raises LockTimeout.
+
+    Spans are recorded into `telemetry`; when it is omitted the run is recorded
+    and appended to the run history by this call.
+    """
+    owns_telemetry = telemetry is None
+    if owns_telemetry:
+        telemetry = RunTelemetry(trigger="cli:articles", categories=categories)
+    ok = False
+    try:
+        async with FileLock(LOCK_FILE).hold(timeout=LOCK_WAIT_SECONDS):
+            result = await _scrape_all_articles(
+                force_rescrape, timeout, retries, categories, telemetry, refresh, retry_quarantined, on_article
+            )
+        ok = True
+        return result
+    finally:
+        if owns_telemetry:
+            telemetry.save(ok=ok)
+
+
+async def _scrape_all_articles(
+    force_rescrape, timeout, retries, categories, telemetry, refresh=False, retry_quarantined=False, on_article=None
 ):
     if not TODAY_LINKS_FILE.exists():
         logger.error("Missing %s - run scrape_links.py first", TODAY_LINKS_FILE)
         return
 
-    try:
-        with open(TODAY_LINKS_FILE, "r", encoding="utf-8") as f:
-            today_links = json.load(f)
-    except Exception as e:
-        logger.error("Failed to read today links: %s", e)
+    today_links = await load_json(TODAY_LINKS_FILE)
+    if today_links is None:
+        logger.error("Failed to read today links from %s", TODAY_LINKS_FILE)
         return
 
     # Filter by categories if specified
@@ -254,112 +474,241 @@ async def scrape_all_articles(
         logger.error("today_links.json failed validation. Aborting.")
         return
 
-    # create lockfile
-    if not check_and_create_lock():
-        return
-
-    cached_articles = load_cached_articles()
+    cached_articles = await load_cached_articles()
     cached_urls = get_cached_url_titles(cached_articles)
+    cached_by_url = {a.url: a for arts in cached_articles.values() for a in arts if a.url}
 
     # Flatten links preserving category
     all_tasks = [(cat, url) for cat, urls in today_links.items() for url in urls]
 
     if not all_tasks:
         logger.info("No links found in %s", TODAY_LINKS_FILE)
-        remove_lock()
         return
 
+    # A story listed under several categories is fetched once and fanned out
+    url_categories = {}
+    for cat, url in all_tasks:
+        cats = url_categories.setdefault(url, [])
+        if cat not in cats:
+            cats.append(cat)
+    unique_urls = list(url_categories)
+    saved_fetches = len(all_tasks) - len(unique_urls)
+    if saved_fetches:
+        logger.info(
+            "%d links across categories point at %d unique articles (%d fetches saved)",
+            len(all_tasks),
+            len(unique_urls),
+            saved_fetches,
+        )
+
+    unchanged = 0
     if force_rescrape:
-        to_scrape = all_tasks
+        to_scrape = unique_urls
         logger.info("Force rescrape enabled: scraping %d articles", len(to_scrape))
+    elif refresh:
+        new = [u for u in unique_urls if u not in cached_urls]
+        candidates = [u for u in unique_urls if u in cached_urls]
+        with telemetry.span("refresh_probe", urls=len(candidates)):
+            stale = await find_stale_articles([cached_by_url[u] for u in candidates], timeout)
+        unchanged = len(candidates) - len(stale)
+        to_scrape = new + [u for u in candidates if u in stale]
+        logger.info(
+            "Refresh: %d new, %d cached probed, %d possibly changed, %d unchanged",
+            len(new),
+            len(candidates),
+            len(to_scrape) - len(new),
+            unchanged,
+        )
     else:
-        to_scrape = [(c, u) for (c, u) in all_tasks if u not in cached_urls]
-        skipped = len(all_tasks) - len(to_scrape)
+        to_scrape = [u for u in unique_urls if u not in cached_urls]
+        skipped = len(unique_urls) - len(to_scrape)
         logger.info(
-            "Found %d total links, %d new to scrape, %d cached (skipped)",
-            len(all_tasks),
+            "Found %d unique links, %d new to scrape, %d cached (skipped)",
+            len(unique_urls),
             len(to_scrape),
             skipped,
         )
 
-    if not to_scrape:
-        logger.info("Nothing to scrape. Use --force to rescrape cached items.")
-        remove_lock()
+    telemetry.count("fetches_saved", saved_fetches)
+
+    cached_listed = {
+        (cat, a.url) for cat, arts in cached_articles.items() for a in arts
+    }
+    needs_fanout = any(
+        (cat, url) not in cached_listed for cat, url in all_tasks if url in cached_by_url and url not in to_scrape
+    )
+    # Persist the work list so an interrupted run resumes instead of starting over
+    queue = ScrapeQueue()
+    queue.discard_stale()
+    if retry_quarantined:
+        logger.info("Released %d quarantined URL(s) for retry", queue.release_quarantined())
+    queue.enqueue({u: url_categories[u] for u in to_scrape}, reset=force_rescrape or refresh)
+    work = queue.pending()
+    resumed = [(link, cats, Article.from_dict(data)) for link, cats, data in queue.finished()]
+    if resumed:
+        logger.info("Resuming: %d article(s) fetched by an interrupted run will be merged", len(resumed))
+    if len(work) > len(to_scrape):
+        logger.info("Resuming: %d URL(s) left pending by an earlier run", len(work) - len(to_scrape))
+
+    if not work and not resumed and not needs_fanout:
+        logger.info("Nothing to scrape. Use --refresh to check cached items for edits or --force to rescrape them.")
         return
 
-    fetched = []
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context()
-            page = await context.new_page()
-
-            for i, (category, link) in enumerate(to_scrape):
-                logger.info("Scraping %d/%d: %s", i + 1, len(to_scrape), link)
-                
-                # Clear cookies before each article to bypass paywall
-                await page.context.clear_cookies()
-                
-                article = await fetch_with_retries(
-                    page, link, retries=retries, timeout=timeout
-                )
-                fetched.append((category, link, article))
+    for link, cats, article in resumed:
+        await emit_article(on_article, article_entry(article, cats))
 
-            await page.close()
-            await browser.close()
+    try:
+        if work:
+            async with async_playwright() as p:
+                with telemetry.span("browser_launch"):
+                    browser = await p.chromium.launch(headless=True)
+                try:
+                    await fetch_pool(browser, work, queue, retries, timeout, telemetry, url_categories, on_article)
+                finally:
+                    await browser.close()
+    except asyncio.CancelledError:
+        logger.warning("Scrape cancelled; %d finished article(s) are kept for the next run", len(queue.finished()))
+        raise
     except Exception as e:
-        logger.exception("Fatal error during scraping run: %s", e)
-        remove_lock()
+        logger.exception("Fatal error during scraping run (finished articles are kept for the next run): %s", e)
         return
 
+    fetched = [(link, cats, Article.from_dict(data)) for link, cats, data in queue.finished()]
+    for link, cats, _ in fetched:
+        known = url_categories.setdefault(link, [])
+        known.extend(c for c in cats if c not in known)
+
     # Build resulting articles dict - only keep today's articles
     articles = {}
     for cat in today_links.keys():
         articles[cat] = []
     
-    # Filter cached articles to only keep today's
+    # Filter cached articles to only keep today's; older ones live on in the archive
     for cat, article_list in cached_articles.items():
-        today_articles = [a for a in article_list if is_today_article(a.get("date", ""))]
+        today_articles = [a for a in article_list if a.is_today()]
         if today_articles:
             articles[cat] = today_articles
 
+    # Cached stories newly listed under another category join that category too
+    for link, cats in url_categories.items():
+        cached = cached_by_url.get(link)
+        if cached is None or not cached.is_today():
+            continue
+        merged = list(cats) + [c for c in cached.categories if c not in cats]
+        for cat in cats:
+            listed = [a for a in articles[cat] if a.url == link]
+            if not listed:
+                articles[cat].append(cached)
+            for a in listed + [cached]:
+                a.categories = merged
+
     updated = 0
+    changed = 0
+    stored_urls = set()
+    # comparing against an unfingerprinted cached article means reading its body: do that off the loop
+    unprinted = [
+        cached_by_url[item[0]]
+        for item in fetched
+        if item and item[2] and item[0] in cached_by_url and not cached_by_url[item[0]].fingerprint
+    ]
+    if unprinted:
+        await run_io(fill_fingerprints, unprinted)
     for item in fetched:
         if not item:
             continue
-        category, link, article_data = item
+        link, _, article_data = item
         if not article_data:
             continue
-        articles[category] = [a for a in articles[category] if a.get("url") != link]
-        entry = {
-            "url": link,
-            "title": article_data.get("title"),
-            "date": article_data.get("date"),
-            "content": article_data.get("content"),
-            "featured_image": article_data.get("featured_image"),
-            "featured_caption": article_data.get("featured_caption"),
-        }
-        articles[category].append(entry)
+        entry = article_entry(article_data, url_categories[link])
+        previous = cached_by_url.get(link)
+        if previous is not None:
+            if entry.fingerprint == previous.fingerprint:
+                unchanged += 1
+                continue
+            changed += 1
+        for category in url_categories[link]:
+            articles[category] = [a for a in articles.get(category, []) if a.url != link]
+            articles[category].append(entry)
+        stored_urls.add(link)
         updated += 1
 
+    with telemetry.span("near_duplicates"):
+        linked = await run_io(near_duplicates.link_duplicates_cached, articles)
+    telemetry.count("near_duplicates", linked)
+    if linked:
+        logger.info("Linked %d near-duplicate article(s) to a canonical story", linked)
+
     # Save articles atomically and metadata
-    atomic_write(ARTICLES_FILE, articles)
     meta = {
         "scraped_at": time.time(),
         "scraped_at_iso": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
         "user_agent": "playwright-python",
         "total_found": len(all_tasks),
+        "unique_urls": len(unique_urls),
+        "saved_fetches": saved_fetches,
         "updated": updated,
+        "changed": changed,
+        "unchanged": unchanged,
+        "near_duplicates": linked,
+        "quarantined": [url for url, _, _ in queue.quarantined()],
     }
-    atomic_write(ARTICLES_META_FILE, meta)
+    today_articles = {a.url: a for items in articles.values() for a in items}
+    with telemetry.span("enrich"):
+        # fresh entries were enriched on extraction; this catches cached ones saved before enrichment
+        stale = [a for a in today_articles.values() if not enrich.is_enriched(a)]
+        for article in stale:
+            enrich.enrich(article)
+    telemetry.count("articles_enriched", len(stale))
+    try:
+        with telemetry.span("summarize"):
+            # one batch for the run's new and changed bodies; unchanged text comes from the summary cache
+            batch = [today_articles[url] for url in stored_urls if url in today_articles]
+            batch += [a for a in stale if a.url not in stored_urls]
+            summaries = await run_io(summarize_articles.summarize_batch, batch)
+        telemetry.count("articles_summarized", summaries["summarized"])
+    except Exception as e:
+        logger.warning("Failed to summarise articles (lead excerpts are kept): %s", e)
+    # articles.json is the headline index; bodies go to the body store first so
+    # the index never points at a body that is not on disk yet
+    with telemetry.span("file_write", file=ARTICLES_FILE.name):
+        bodies_written = await run_io(bodies.store, list(today_articles.values()), stored_urls)
+        await write_json(ARTICLES_FILE, encode_articles(articles, content=False))
+        await write_json(ARTICLES_META_FILE, meta, pretty=True)
+    queue.mark_merged([link for link, _, _ in fetched])
+    try:
+        with telemetry.span("archive_write"):
+            await run_io(
+                archive.store_articles,
+                {cat: cached_articles.get(cat, []) + articles.get(cat, []) for cat in set(cached_articles) | set(articles)},
+            )
+            await run_io(archive.prune)
+            await run_io(bodies.prune, archive.RETENTION_DAYS, list(today_articles))
+    except Exception as e:
+        logger.warning("Failed to update article archive: %s", e)
+    try:
+        with telemetry.span("search_index"):
+            search = get_search_index()
+            indexed = await run_io(search.index_articles, articles, content_fingerprint)
+            await run_io(search.prune, archive.RETENTION_DAYS)
+        telemetry.count("articles_indexed", indexed)
+    except Exception as e:
+        logger.warning("Failed to update search index: %s", e)
+    telemetry.count("articles_updated", updated)
+    telemetry.count("bodies_written", bodies_written)
+    telemetry.count("articles_changed", changed)
+    telemetry.count("articles_unchanged", unchanged)
 
     logger.info(
-        "Scrape complete. Updated %d articles. Saved to %s", updated, ARTICLES_FILE
+        "Scrape complete. Updated %d articles (%d changed, %d unchanged, %d cross-category fetches saved). Saved to %s",
+        updated,
+        changed,
+        unchanged,
+        saved_fetches,
+        ARTICLES_FILE,
     )
-    remove_lock()
 
 
-def main(force=False, categories=None, timeout=15000, retries=2):
+def main(force=False, categories=None, timeout=15000, retries=2, refresh=False):
     """
     Main entry point for article scraping when called from CLI.
     
@@ -368,6 +717,7 @@ def main(force=False, categories=None, timeout=15000, retries=2):
         categories: List of category names to scrape
         timeout: Page timeout in ms
         retries: Retries for transient failures
+        refresh: Probe cached articles and re-extract only edited ones
     """
     return asyncio.run(
         scrape_all_articles(
@@ -375,11 +725,14 @@ def main(force=False, categories=None, timeout=15000, retries=2):
             timeout=timeout,
             retries=retries,
             categories=categories,
+            refresh=refresh,
         )
     )
 
 
-async def main_async(force=False, categories=None, timeout=15000, retries=2):
+async def main_async(
+    force=False, categories=None, timeout=15000, retries=2, telemetry=None, refresh=False, on_article=None
+):
     """
     Async entry point for article scraping when called from existing event loop.
     
@@ -388,12 +741,18 @@ async def main_async(force=False, categories=None, timeout=15000, retries=2):
         categories: List of category names to scrape
         timeout: Page timeout in ms
         retries: Retries for transient failures
+        telemetry: RunTelemetry shared with the caller's run, if any
+        refresh: Probe cached articles and re-extract only edited ones
+        on_article: Async function(article) called as each article is extracted
     """
     return await scrape_all_articles(
         force_rescrape=force,
         timeout=timeout,
         retries=retries,
         categories=categories,
+        telemetry=telemetry,
+        refresh=refresh,
+        on_article=on_article,
     )
 
 if __name__ == "__main__":
@@ -403,6 +762,16 @@ if __name__ == "__main__":
     parser.add_argument(
         "--force", action="store_true", dest="force", help="Force rescrape of all links"
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Probe cached articles and re-extract only those that changed",
+    )
+    parser.add_argument(
+        "--retry-quarantined",
+        action="store_true",
+        help="Give URLs quarantined after repeated failures another chance",
+    )
     parser.add_argument("--timeout", type=int, default=15000, help="Page timeout in ms")
     parser.add_argument(
         "--retries", type=int, default=2, help="Retries for transient failures"
@@ -424,5 +793,7 @@ if __name__ == "__main__":
             timeout=args.timeout,
             retries=args.retries,
             categories=categories,
+            refresh=args.refresh,
+            retry_quarantined=args.retry_quarantined,
         )
     )
\ No newline at end of file
@@ -1,131 +1,86 @@
 import asyncio
-import json
 import os
-import tempfile
 import time
 from datetime import datetime
-from pathlib import Path
 from playwright.async_api import async_playwright
 
+try:
+    from scraper.coordination import FileLock
+    from scraper.persistence import DATA_DIR, load_json, write_json
+    from scraper.telemetry import RunTelemetry
+except ImportError:  # run as a script from scraper/
+    from coordination import FileLock
+    from persistence import DATA_DIR, load_json, write_json
+    from telemetry import RunTelemetry
+
+# Overridable so benchmarks can point the scraper at a local stand-in site
+SITE_URL = os.getenv("BORNEO_BULLETIN_URL", "https://borneobulletin.com.bn").rstrip("/")
+
 # Map categories to their pagination container IDs
 CATEGORIES = {
     "national": {
-        "url": "https://borneobulletin.com.bn/category/national/",
+        "url": f"{SITE_URL}/category/national/",
         "pagination_tdi": "#tdi_106",
     },
     "southeast": {
-        "url": "https://borneobulletin.com.bn/category/southeast/",
+        "url": f"{SITE_URL}/category/southeast/",
         "pagination_tdi": "#tdi_107",
     },
     "world": {
-        "url": "https://borneobulletin.com.bn/category/world/",
+        "url": f"{SITE_URL}/category/world/",
         "pagination_tdi": "#tdi_106",
     },
     "business": {
-        "url": "https://borneobulletin.com.bn/category/business/",
+        "url": f"{SITE_URL}/category/business/",
         "pagination_tdi": "#tdi_107",
     },
     "tech": {
-        "url": "https://borneobulletin.com.bn/category/tech/",
+        "url": f"{SITE_URL}/category/tech/",
         "pagination_tdi": "#tdi_107",
     },
     "lifstyle": {
-        "url": "https://borneobulletin.com.bn/category/lifstyle/",
+        "url": f"{SITE_URL}/category/lifstyle/",
         "pagination_tdi": "#tdi_107",
     },
     "entertainment": {
-        "url": "https://borneobulletin.com.bn/category/entertainment/",
+        "url": f"{SITE_URL}/category/entertainment/",
         "pagination_tdi": "#tdi_107",
     },
     "sports": {
-        "url": "https://borneobulletin.com.bn/category/sports/",
+        "url": f"{SITE_URL}/category/sports/",
         "pagination_tdi": "#tdi_106",
     },
     "opinion": {
-        "url": "https://borneobulletin.com.bn/category/opinion/",
+        "url": f"{SITE_URL}/category/opinion/",
         "pagination_tdi": "#tdi_106",
     },
     # Add more categories here
 }
 
-DATA_DIR = Path(__file__).parent.parent / "data"
 TODAY_LINKS_FILE = DATA_DIR / "today_links.json"
 PREVIOUS_LINKS_FILE = DATA_DIR / "previous_links.json"
 LOCK_FILE = DATA_DIR / "scrape_links.lock"
+# How long to wait for another process's link scrape before giving up
+LOCK_WAIT_SECONDS = 10 * 60
 LINKS_META_FILE = DATA_DIR / "today_links_meta.json"
 
 
-def check_and_create_lock():
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    if LOCK_FILE.exists():
-        try:
-            with open(LOCK_FILE, "r", encoding="utf-8") as f:
-                payload = json.load(f)
-            pid = int(payload.get("pid", 0))
-            if pid:
-                try:
-                    os.kill(pid, 0)
-                    print(
-                        f"Lockfile exists and process {pid} is still running. Exiting."
-                    )
-                    raise SystemExit(1)
-                except OSError:
-                    print(f"Stale lockfile found (pid {pid}). Overwriting.")
-        except Exception:
-            print("Could not read existing lockfile, overwriting.")
-
-    with open(LOCK_FILE, "w", encoding="utf-8") as f:
-        json.dump({"pid": os.getpid(), "ts": time.time()}, f)
-
-
-def remove_lock():
-    try:
-        if LOCK_FILE.exists():
-            LOCK_FILE.unlink()
-    except Exception:
-        pass
-
-
-import atexit
-
-atexit.register(remove_lock)
-LINKS_META_FILE = DATA_DIR / "today_links_meta.json"
-
-
-def atomic_write(path: Path, data):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    fd, tmp = tempfile.mkstemp(prefix=path.stem, suffix=".tmp", dir=str(path.parent))
-    try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        os.replace(tmp, str(path))
-    except Exception:
-        if os.path.exists(tmp):
-            try:
-                os.remove(tmp)
-            except Exception:
-                pass
-        raise
-
-
 TOP_ARTICLES_SELECTOR = ".vc_row_inner.tdi_80.vc_row.vc_inner.wpb_row.td-pb-row"
 TODAY_KEYWORDS = ["hour ago", "hours ago"]
 
 
-def load_previous_links():
+async def load_previous_links():
     """Load links from previous run."""
-    if PREVIOUS_LINKS_FILE.exists():
-        with open(PREVIOUS_LINKS_FILE, "r") as f:
-            return json.load(f)
-    return {}
+    return await load_json(PREVIOUS_LINKS_FILE, {})
 
 
-def save_links_to_file(all_links):
+async def save_links_to_file(all_links, telemetry: RunTelemetry = None):
     """Save all links to JSON file and compare with previous."""
+    telemetry = telemetry or RunTelemetry()
     DATA_DIR.mkdir(exist_ok=True)
 
     # Load previous links for comparison
-    previous_links = load_previous_links()
+    previous_links = await load_previous_links()
 
     # Flatten today's links to compare
     today_flat = set()
@@ -141,14 +96,17 @@ def save_links_to_file(all_links):
     removed_articles = previous_flat - today_flat
 
     # Save today's links atomically and persist metadata
-    atomic_write(TODAY_LINKS_FILE, all_links)
-    atomic_write(PREVIOUS_LINKS_FILE, all_links)
     meta = {
         "saved_at": time.time(),
         "saved_at_iso": datetime.now().isoformat(),
         "total_links": len(today_flat),
+        # same article listed under several categories counts once in total_links
+        "listed_links": sum(len(links) for links in all_links.values()),
     }
-    atomic_write(LINKS_META_FILE, meta)
+    with telemetry.span("file_write", file=TODAY_LINKS_FILE.name):
+        await write_json(TODAY_LINKS_FILE, all_links)
+        await write_json(PREVIOUS_LINKS_FILE, all_links)
+        await write_json(LINKS_META_FILE, meta, pretty=True)
 
     # Print comparison results
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -182,15 +140,18 @@ def save_links_to_file(all_links):
     }
 
 
-async def fetch_category_articles(category_name, url, pagination_selector):
+async def fetch_category_articles(category_name, url, pagination_selector, telemetry: RunTelemetry = None):
+    telemetry = telemetry or RunTelemetry()
     links = []
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.goto(url)
+        with telemetry.span("browser_launch", category=category_name):
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+        with telemetry.span("category_page", category=category_name):
+            await page.goto(url)
+            await page.wait_for_selector(TOP_ARTICLES_SELECTOR)
 
         # --- Top 5 articles ---
-        await page.wait_for_selector(TOP_ARTICLES_SELECTOR)
         top_container = await page.query_selector(TOP_ARTICLES_SELECTOR)
         top_links = await top_container.query_selector_all(".td-module-thumb a")
         for link in top_links:
@@ -241,14 +202,15 @@ async def fetch_category_articles(category_name, url, pagination_selector):
                 f"#next-page-{pagination_selector[1:]}"
             )
             if next_button:
-                # Use JavaScript click to ensure JS handler fires
-                await next_button.evaluate("el => el.click()")
-                await page.wait_for_selector(
-                    f"{pagination_selector} .td-module-thumb a"
-                )  # wait for new articles to appear
-                await page.wait_for_timeout(
-                    1000
-                )  # optional: extra wait for smooth loading
+                with telemetry.span("pagination_click", category=category_name):
+                    # Use JavaScript click to ensure JS handler fires
+                    await next_button.evaluate("el => el.click()")
+                    await page.wait_for_selector(
+                        f"{pagination_selector} .td-module-thumb a"
+                    )  # wait for new articles to appear
+                    await page.wait_for_timeout(
+                        1000
+                    )  # optional: extra wait for smooth loading
             else:
                 break
 
@@ -257,13 +219,20 @@ async def fetch_category_articles(category_name, url, pagination_selector):
     return links
 
 
-async def main(categories=None):
+async def main(categories=None, telemetry: RunTelemetry = None):
     """
     Scrape articles for specified categories or all if not specified.
-    
+    Only one link scrape runs at a time across processes; a second one waits
+    up to LOCK_WAIT_SECONDS and then raises LockTimeout.
+
     Args:
         categories: list of category names to scrape, or None for all
+        telemetry: RunTelemetry to record spans into; when omitted a run is
+            recorded and saved to the run history by this call
     """
+    owns_telemetry = telemetry is None
+    if owns_telemetry:
+        telemetry = RunTelemetry(trigger="cli:links", categories=categories)
     if categories is None:
         categories_to_scrape = CATEGORIES
     else:
@@ -271,15 +240,18 @@ async def main(categories=None):
     
     all_links = {}
     total_categories = len(categories_to_scrape)
-    
-    for idx, (category, info) in enumerate(categories_to_scrape.items(), 1):
-        print(f"\n[{idx}/{total_categories}] Fetching articles for {category}...")
-        all_links[category] = await fetch_category_articles(
-            category, info["url"], info["pagination_tdi"]
-        )
-
-    # Save and compare
-    comparison = save_links_to_file(all_links)
+
+    async with FileLock(LOCK_FILE).hold(timeout=LOCK_WAIT_SECONDS):
+        for idx, (category, info) in enumerate(categories_to_scrape.items(), 1):
+            print(f"\n[{idx}/{total_categories}] Fetching articles for {category}...")
+            all_links[category] = await fetch_category_articles(
+                category, info["url"], info["pagination_tdi"], telemetry=telemetry
+            )
+
+        # Save and compare
+        comparison = await save_links_to_file(all_links, telemetry=telemetry)
+    if owns_telemetry:
+        telemetry.save()
     return comparison
 
 
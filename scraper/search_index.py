@@ -0,0 +1,209 @@
+"""
+Full-text search over scraped articles (SQLite FTS5).
+
+`docs` holds one row per (url, category) with the content fingerprint it
+was indexed at; `articles_fts` holds the tokenised title and body under the
+same rowid. `index_articles` only looks up the urls it is given and only
+touches rows whose fingerprint changed, so a scrape run costs one lookup per
+article plus writes for new/edited ones, however large the index has grown.
+Unfiltered searches return each url once, under its best-ranked category.
+
+`date` is the article's normalised publication day ('YYYY-MM-DD'), or NULL
+when the site gave none; such rows are dated by the day they were first
+indexed (`indexed`) for day filters and retention.
+"""
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    from scraper.persistence import DATA_DIR
+except ImportError:  # run as a script from scraper/
+    from persistence import DATA_DIR
+
+logger = logging.getLogger("search_index")
+
+SEARCH_DB = DATA_DIR / "search.db"
+# urls per lookup query, under SQLite's bound-parameter limit
+LOOKUP_BATCH = 500
+
+
+def to_match_query(text: str) -> str:
+    """Turn free user text into an FTS5 query: every word must match (prefix for the last)."""
+    terms = ['"' + word.replace('"', '""') + '"' for word in text.split() if word.strip('"')]
+    if not terms:
+        return ""
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class SearchIndex:
+    def __init__(self, path: Path = SEARCH_DB):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            " id INTEGER PRIMARY KEY,"
+            " url TEXT NOT NULL,"
+            " category TEXT NOT NULL,"
+            " title TEXT,"
+            " date TEXT,"
+            " fingerprint TEXT,"
+            " indexed TEXT,"
+            " UNIQUE (url, category))"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(docs)")}
+        if "indexed" not in columns:
+            # older indexes stored the raw date text ("Unknown date" included)
+            self._conn.execute("ALTER TABLE docs ADD COLUMN indexed TEXT")
+            self._conn.execute(
+                "UPDATE docs SET indexed = ?, date = CASE"
+                " WHEN date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*' THEN substr(date, 1, 10)"
+                " ELSE NULL END",
+                (datetime.now().strftime("%Y-%m-%d"),),
+            )
+        self._conn.execute("DROP INDEX IF EXISTS docs_date")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS docs_day ON docs (COALESCE(date, indexed))")
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+            " title, content, tokenize = 'porter unicode61')"
+        )
+
+    def index_articles(self, articles: dict, fingerprint) -> int:
+        """
+        Index {category: [Article]}; `fingerprint(article)` identifies a
+        version of an article. Returns how many rows were (re)indexed.
+        """
+        indexed = 0
+        today = datetime.now().strftime("%Y-%m-%d")
+        with self._lock:
+            known = self._known({article.url for items in articles.values() for article in items if article.url})
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for category, items in articles.items():
+                    for article in items:
+                        url = article.url
+                        if not url:
+                            continue
+                        fp = article.fingerprint or fingerprint(article)
+                        existing = known.get((url, category))
+                        if existing and existing[1] == fp:
+                            continue
+                        if existing:
+                            rowid = existing[0]
+                            self._conn.execute(
+                                "UPDATE docs SET title = ?, date = ?, fingerprint = ? WHERE id = ?",
+                                (article.title, article.day or None, fp, rowid),
+                            )
+                            self._conn.execute("DELETE FROM articles_fts WHERE rowid = ?", (rowid,))
+                        else:
+                            rowid = self._conn.execute(
+                                "INSERT INTO docs (url, category, title, date, fingerprint, indexed)"
+                                " VALUES (?, ?, ?, ?, ?, ?)",
+                                (url, category, article.title, article.day or None, fp, today),
+                            ).lastrowid
+                        self._conn.execute(
+                            "INSERT INTO articles_fts (rowid, title, content) VALUES (?, ?, ?)",
+                            (rowid, article.title, article.content),
+                        )
+                        known[(url, category)] = (rowid, fp)
+                        indexed += 1
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return indexed
+
+    def _known(self, urls: set) -> dict:
+        """{(url, category): (rowid, fingerprint)} of the indexed rows for `urls`."""
+        known = {}
+        urls = list(urls)
+        for i in range(0, len(urls), LOOKUP_BATCH):
+            batch = urls[i : i + LOOKUP_BATCH]
+            rows = self._conn.execute(
+                "SELECT id, url, category, fingerprint FROM docs"
+                f" WHERE url IN ({', '.join('?' * len(batch))})",
+                batch,
+            )
+            for rowid, url, category, fp in rows:
+                known[(url, category)] = (rowid, fp)
+        return known
+
+    def search(self, query: str, category: str = None, days: int = None, limit: int = 10) -> list:
+        """
+        Rank articles matching `query` by BM25 (title weighted above body).
+        Returns dicts with url, category, title, date and a highlighted snippet;
+        without a category an article listed in several appears once.
+        """
+        match = to_match_query(query)
+        if not match:
+            return []
+        sql = (
+            "SELECT d.url, d.category, d.title, d.date,"
+            " snippet(articles_fts, 1, '**', '**', '…', 24) AS snippet,"
+            " bm25(articles_fts, 5.0, 1.0) AS rank"
+            " FROM articles_fts JOIN docs d ON d.id = articles_fts.rowid"
+            " WHERE articles_fts MATCH ?"
+        )
+        params = [match]
+        if category:
+            sql += " AND d.category = ?"
+            params.append(category)
+        if days:
+            # undated articles count from the day they were indexed
+            sql += " AND COALESCE(d.date, d.indexed) >= ?"
+            params.append((datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d"))
+        if category:
+            sql += " ORDER BY rank LIMIT ?"
+        else:
+            # FTS5 functions can't run in an aggregate, so rank in a materialised CTE and
+            # keep each url's best row (SQLite takes bare columns from the MIN() row)
+            sql = (
+                f"WITH hits AS MATERIALIZED ({sql})"
+                " SELECT url, category, title, date, snippet, MIN(rank) AS best FROM hits"
+                " GROUP BY url ORDER BY best LIMIT ?"
+            )
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"url": url, "category": cat, "title": title, "date": date, "snippet": snippet}
+            for url, cat, title, date, snippet, _ in rows
+        ]
+
+    def prune(self, retention_days: int) -> int:
+        """Remove articles dated (or, undated, first indexed) before the retention window."""
+        cutoff = (datetime.now() - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM articles_fts WHERE rowid IN"
+                    " (SELECT id FROM docs WHERE COALESCE(date, indexed) < ?)",
+                    (cutoff,),
+                )
+                removed = self._conn.execute("DELETE FROM docs WHERE COALESCE(date, indexed) < ?", (cutoff,)).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return removed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_index = None
+
+
+def get_search_index() -> SearchIndex:
+    """Process-wide SearchIndex, opened on first use."""
+    global _index
+    if _index is None:
+        _index = SearchIndex()
+    return _index
@@ -0,0 +1,295 @@
+"""
+Extractive article summaries for digests.
+
+Each article's sentences are ranked with TextRank over TF-IDF sentence
+vectors: sentences similar to many other sentences of the article score
+high, with a mild bias towards the lead (news puts the key facts first).
+The best-ranked sentences that fit in SUMMARY_CHARS are kept in their
+original order and become the article's `excerpt`.
+
+`summarize_batch()` is a pipeline stage: it takes every newly scraped
+article of a run at once, so term weights (IDF) come from the whole batch
+and each text is tokenised once. Summaries are cached by a hash of the body
+(`data/summary_cache.json`), so unchanged text is never summarised twice.
+The similarity matrix and the ranking iteration run on NumPy (a project
+dependency); where it is missing the same maths runs on sparse dicts.
+
+Run standalone to preview summaries of today's articles:
+python scraper/summarize_articles.py [--category national]
+"""
+import argparse
+import hashlib
+import logging
+import math
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+try:
+    import numpy as np
+except ImportError:  # installed with the project; the fallback is slower
+    np = None
+
+try:
+    from scraper import bodies, enrich
+    from scraper.models import decode_articles
+    from scraper.persistence import DATA_DIR, read_json, write_json_atomic
+except ImportError:  # run as a script from scraper/
+    import bodies
+    import enrich
+    from models import decode_articles
+    from persistence import DATA_DIR, read_json, write_json_atomic
+
+logger = logging.getLogger("summarize_articles")
+
+ARTICLES_FILE = DATA_DIR / "articles.json"
+CACHE_FILE = DATA_DIR / "summary_cache.json"
+# bump when the ranking changes so cached summaries are recomputed
+SUMMARY_VERSION = 1
+SUMMARY_CHARS = enrich.EXCERPT_CHARS
+CACHE_MAX_ENTRIES = 5000
+DAMPING = 0.85
+# extra teleport weight of the lead sentence; sentence i gets LEAD_BIAS / (i + 1)
+LEAD_BIAS = 1.0
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+# articles with fewer sentences than this keep their lead excerpt
+MIN_SENTENCES = 3
+
+WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because been before being below
+    between both but by can could did do does doing down during each few for from further had has have having
+    he her here hers herself him himself his how i if in into is it its itself just me more most my myself no
+    nor not now of off on once only or other our ours ourselves out over own said same says she should so some
+    such than that the their theirs them themselves then there these they this those through to too under
+    until up very was we were what when where which while who whom why will with would you your yours
+    yourself yourselves
+    """.split()
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences of `text`, paragraph by paragraph, whitespace collapsed."""
+    sentences = []
+    for paragraph in (text or "").split("\n"):
+        paragraph = " ".join(paragraph.split())
+        start = 0
+        for end in enrich.sentence_ends(paragraph) + [len(paragraph)]:
+            sentence = paragraph[start:end].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = end
+    return sentences
+
+
+def tokenize(sentence: str) -> List[str]:
+    return [w for w in WORD_RE.findall(sentence.lower()) if len(w) > 1 and w not in STOPWORDS]
+
+
+def content_key(text: str) -> str:
+    return hashlib.sha1(f"{SUMMARY_VERSION}:{SUMMARY_CHARS}:{text}".encode("utf-8")).hexdigest()
+
+
+def inverse_document_frequencies(documents: Iterable[List[Counter]]) -> Dict[str, float]:
+    """Smoothed IDF of each term, treating every sentence of every document as a document."""
+    df = Counter()
+    n = 0
+    for sentences in documents:
+        for counts in sentences:
+            df.update(counts.keys())
+            n += 1
+    return {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+
+
+def _teleport(n: int) -> list:
+    weights = [1 + LEAD_BIAS / (i + 1) for i in range(n)]
+    total = sum(weights)
+    return [w / total for w in weights]
+
+
+def _rank_numpy(counts: List[Counter], idf: Dict[str, float]) -> list:
+    vocab = {term: i for i, term in enumerate({t for c in counts for t in c})}
+    matrix = np.zeros((len(counts), len(vocab)))
+    for row, sentence in enumerate(counts):
+        for term, count in sentence.items():
+            matrix[row, vocab[term]] = count * idf.get(term, 1.0)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0)
+    out = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, out, out=np.zeros_like(similarity), where=out > 0)
+    teleport = np.array(_teleport(len(counts)))
+    # sentences similar to nothing hand their rank to the teleport distribution
+    dangling = out[:, 0] == 0
+    scores = teleport.copy()
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) * teleport + DAMPING * (transition.T @ scores + scores[dangling].sum() * teleport)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores.tolist()
+
+
+def _rank_python(counts: List[Counter], idf: Dict[str, float]) -> list:
+    vectors = []
+    for sentence in counts:
+        vector = {term: count * idf.get(term, 1.0) for term, count in sentence.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        vectors.append({term: v / norm for term, v in vector.items()})
+    n = len(vectors)
+    similarity = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            small, large = (vectors[i], vectors[j]) if len(vectors[i]) < len(vectors[j]) else (vectors[j], vectors[i])
+            value = sum(v * large.get(term, 0.0) for term, v in small.items())
+            similarity[i][j] = similarity[j][i] = value
+    out = [sum(row) for row in similarity]
+    teleport = _teleport(n)
+    scores = list(teleport)
+    for _ in range(MAX_ITERATIONS):
+        dangling = sum(scores[i] for i in range(n) if out[i] == 0)
+        updated = [
+            (1 - DAMPING) * teleport[j]
+            + DAMPING * (sum(scores[i] * similarity[i][j] / out[i] for i in range(n) if out[i]) + dangling * teleport[j])
+            for j in range(n)
+        ]
+        done = sum(abs(a - b) for a, b in zip(updated, scores)) < TOLERANCE
+        scores = updated
+        if done:
+            break
+    return scores
+
+
+def rank_sentences(counts: List[Counter], idf: Dict[str, float]) -> list:
+    """TextRank score of each sentence (given as term counts)."""
+    if np is not None:
+        return _rank_numpy(counts, idf)
+    return _rank_python(counts, idf)
+
+
+def select(sentences: List[str], scores: list, limit: int = SUMMARY_CHARS) -> str:
+    """
+    The best sentence plus whichever next-best (above-average) sentences
+    still fit in `limit` characters, in article order; the best one alone is
+    clipped if it is too long.
+    """
+    ranked = sorted(range(len(sentences)), key=lambda i: -scores[i])
+    if len(sentences[ranked[0]]) > limit:
+        return enrich.clip(sentences[ranked[0]], limit)
+    chosen = [ranked[0]]
+    used = len(sentences[ranked[0]])
+    # below-average sentences are not worth their space, however well they fit
+    threshold = sum(scores) / len(scores)
+    for i in ranked[1:]:
+        if scores[i] < threshold:
+            break
+        if used + 1 + len(sentences[i]) <= limit:
+            chosen.append(i)
+            used += 1 + len(sentences[i])
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+class SummaryCache:
+    """{content hash: summary} persisted as JSON; oldest entries are dropped past CACHE_MAX_ENTRIES."""
+
+    def __init__(self, path: Path = CACHE_FILE):
+        self.path = Path(path)
+        self._entries = None
+        self.dirty = False
+
+    @property
+    def entries(self) -> dict:
+        if self._entries is None:
+            self._entries = read_json(self.path, {}) or {}
+        return self._entries
+
+    def get(self, key: str):
+        entry = self.entries.get(key)
+        return entry["summary"] if entry else None
+
+    def put(self, key: str, summary: str):
+        self.entries[key] = {"summary": summary, "ts": time.time()}
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        entries = self.entries
+        if len(entries) > CACHE_MAX_ENTRIES:
+            newest = sorted(entries.items(), key=lambda item: item[1].get("ts", 0))[-CACHE_MAX_ENTRIES:]
+            self._entries = entries = dict(newest)
+        write_json_atomic(self.path, entries)
+        self.dirty = False
+
+
+def summarize(text: str, idf: Dict[str, float] = None, limit: int = SUMMARY_CHARS) -> str:
+    """Extractive summary of one text (IDF from its own sentences unless given)."""
+    sentences = split_sentences(text)
+    if len(sentences) < MIN_SENTENCES:
+        return enrich.make_excerpt(text, limit)
+    counts = [Counter(tokenize(s)) for s in sentences]
+    if idf is None:
+        idf = inverse_document_frequencies([counts])
+    return select(sentences, rank_sentences(counts, idf), limit)
+
+
+def summarize_batch(articles: Iterable, cache: SummaryCache = None) -> dict:
+    """
+    Summarise `articles` into their `excerpt` in one pass, reusing cached
+    summaries of unchanged bodies. Returns {"summarized", "cached", "seconds"}. Blocking.
+    """
+    start = time.perf_counter()
+    cache = cache if cache is not None else SummaryCache()
+    pending = []
+    cached = 0
+    for article in articles:
+        text = article.content
+        if not text:
+            continue
+        key = content_key(text)
+        summary = cache.get(key)
+        if summary is not None:
+            article.excerpt = summary
+            cached += 1
+        else:
+            sentences = split_sentences(text)
+            pending.append((article, key, sentences, [Counter(tokenize(s)) for s in sentences]))
+
+    idf = inverse_document_frequencies(counts for _, _, _, counts in pending)
+    for article, key, sentences, counts in pending:
+        if len(sentences) < MIN_SENTENCES:
+            summary = enrich.make_excerpt(article.content, SUMMARY_CHARS)
+        else:
+            summary = select(sentences, rank_sentences(counts, idf))
+        article.excerpt = summary
+        cache.put(key, summary)
+    try:
+        cache.save()
+    except Exception as e:
+        logger.warning("Failed to save summary cache: %s", e)
+    return {"summarized": len(pending), "cached": cached, "seconds": time.perf_counter() - start}
+
+
+def main(category: str = None):
+    articles = decode_articles(read_json(ARTICLES_FILE, {}), content_loader=bodies.load)
+    if category:
+        articles = {category: articles.get(category, [])}
+    unique = {a.url: a for items in articles.values() for a in items}
+    stats = summarize_batch(unique.values())
+    for name, items in articles.items():
+        for article in items:
+            print(f"[{name}] {article.title}\n    {article.excerpt}\n")
+    logger.info("%d summarised, %d from cache in %.2fs", stats["summarized"], stats["cached"], stats["seconds"])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+    parser = argparse.ArgumentParser(description="Preview extractive summaries of today's articles")
+    parser.add_argument("--category", help="Only this category")
+    main(parser.parse_args().category)
@@ -0,0 +1,131 @@
+"""
+Structured timing for scrape runs.
+
+A RunTelemetry collects spans (browser launch, category pages, pagination
+clicks, article fetches, file writes) and counters (retries) for one run;
+`save()` appends the run to a bounded JSONL history that `/scrape_stats`
+summarises as per-stage percentiles.
+"""
+import json
+import logging
+import math
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    from scraper.persistence import DATA_DIR
+except ImportError:  # run as a script from scraper/
+    from persistence import DATA_DIR
+
+logger = logging.getLogger("scrape_telemetry")
+
+RUNS_FILE = DATA_DIR / "scrape_runs.jsonl"
+MAX_RUNS = 200
+
+
+class RunTelemetry:
+    def __init__(self, trigger: str = "cli", categories=None):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.trigger = trigger
+        self.categories = list(categories) if categories else None
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.spans = []
+        self.counters = {}
+        self.state = {}
+
+    @contextmanager
+    def span(self, stage: str, **attrs):
+        """Time the enclosed block as one `stage` span; failures are recorded too."""
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            record = {"stage": stage, "duration": round(time.perf_counter() - start, 4)}
+            if not ok:
+                record["ok"] = False
+            if attrs:
+                record.update(attrs)
+            self.spans.append(record)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def set_state(self, name: str, value):
+        """Attach a snapshot of some component's state (e.g. a controller) to the run."""
+        self.state[name] = value
+
+    def to_dict(self, ok: bool = True) -> dict:
+        return {
+            "run_id": self.run_id,
+            "trigger": self.trigger,
+            "categories": self.categories,
+            "started_at": self.started_at,
+            "duration": round(time.perf_counter() - self._t0, 4),
+            "ok": ok,
+            "spans": self.spans,
+            "counters": self.counters,
+            "state": self.state,
+        }
+
+    def save(self, ok: bool = True, path: Path = RUNS_FILE, max_runs: int = MAX_RUNS):
+        """Append this run to the history file, keeping only the newest `max_runs`."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            lines = []
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    lines = [line for line in f if line.strip()]
+            lines.append(json.dumps(self.to_dict(ok), ensure_ascii=False) + "\n")
+            lines = lines[-max_runs:]
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(lines)
+            tmp.replace(path)
+        except Exception as e:
+            logger.warning("Failed to save scrape telemetry: %s", e)
+
+
+def load_runs(limit: int = 20, path: Path = RUNS_FILE) -> list:
+    """Return the newest `limit` runs, oldest first."""
+    if not path.exists():
+        return []
+    runs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                runs.append(json.loads(line))
+            except Exception:
+                continue
+    return runs[-limit:]
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def stage_stats(runs) -> dict:
+    """Return {stage: {"count", "p50", "p95", "total"}} across the given runs."""
+    durations = {}
+    for run in runs:
+        for span in run.get("spans", []):
+            durations.setdefault(span["stage"], []).append(span["duration"])
+        durations.setdefault("run_total", []).append(run.get("duration", 0))
+    return {
+        stage: {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "total": sum(values),
+        }
+        for stage, values in durations.items()
+    }
@@ -0,0 +1,211 @@
+"""
+Adaptive concurrency for article fetches against one site.
+
+AdaptiveThrottle is shared by all scrape workers. Each fetch runs inside
+`slot()` and reports how it went with `record()`. The concurrency limit
+follows AIMD: it grows by about one slot per limit's worth of healthy
+fetches (fast, few errors) and halves on a timeout, 429 or 5xx, at most
+once per round trip. When overload outcomes dominate the recent window,
+the circuit breaker opens and pauses every worker; after the cooldown a
+single probe fetch decides whether the run resumes or pauses again (with a
+longer cooldown). `snapshot()` is what ends up in scrape telemetry.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger("scrape_throttle")
+
+MIN_CONCURRENCY = 1
+INITIAL_CONCURRENCY = 2
+MAX_CONCURRENCY = max(1, int(os.getenv("SCRAPER_MAX_CONCURRENCY", "4")))
+# fetches slower than this (seconds, smoothed) stop the limit from growing
+TARGET_LATENCY = 8.0
+WINDOW = 20
+# growth only while the window's error rate is below this
+HEALTHY_ERROR_RATE = 0.1
+# the breaker opens when this share of the window (or this many in a row) overloaded
+BREAKER_ERROR_RATE = 0.5
+BREAKER_MIN_SAMPLES = 6
+BREAKER_CONSECUTIVE = 4
+BREAKER_COOLDOWN = 30.0
+BREAKER_MAX_COOLDOWN = 300.0
+
+OK = "ok"
+TIMEOUT = "timeout"
+THROTTLED = "throttled"  # 429
+SERVER_ERROR = "server_error"  # 5xx
+ERROR = "error"  # anything else; the page's problem, not the site's load
+OVERLOAD = {TIMEOUT, THROTTLED, SERVER_ERROR}
+
+
+class AdaptiveThrottle:
+    def __init__(
+        self,
+        initial: int = INITIAL_CONCURRENCY,
+        minimum: int = MIN_CONCURRENCY,
+        maximum: int = MAX_CONCURRENCY,
+        target_latency: float = TARGET_LATENCY,
+        window: int = WINDOW,
+        cooldown: float = BREAKER_COOLDOWN,
+        clock=time.monotonic,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.target_latency = target_latency
+        self.base_cooldown = cooldown
+        self.state = "closed"
+        self.trips = 0
+        self.increases = 0
+        self.decreases = 0
+        self.paused_seconds = 0.0
+        self._clock = clock
+        self._cooldown = cooldown
+        self._in_flight = 0
+        self._outcomes = deque(maxlen=window)
+        self._consecutive_overload = 0
+        self._latency = None
+        self._last_decrease = float("-inf")
+        self._open_until = 0.0
+        self._events = deque(maxlen=20)
+        self._t0 = clock()
+        self._cond = asyncio.Condition()
+
+    @property
+    def capacity(self) -> int:
+        """Fetches allowed in flight right now."""
+        if self.state == "open":
+            return 0
+        if self.state == "half_open":
+            return 1
+        return int(self.limit)
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for o in self._outcomes if o != OK) / len(self._outcomes)
+
+    @property
+    def overload_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for o in self._outcomes if o in OVERLOAD) / len(self._outcomes)
+
+    def _event(self, reason: str):
+        self._events.append(
+            {"t": round(self._clock() - self._t0, 2), "limit": round(self.limit, 2), "state": self.state, "reason": reason}
+        )
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for a free slot (and for the breaker to allow traffic), then hold it."""
+        while True:
+            async with self._cond:
+                delay = self._open_until - self._clock()
+                if delay <= 0:
+                    if self.state == "open":
+                        self.state = "half_open"
+                        self._event("probe")
+                        logger.info("Circuit breaker half-open: probing with one fetch")
+                    if self._in_flight < self.capacity:
+                        self._in_flight += 1
+                        break
+                    await self._cond.wait()
+                    continue
+            await asyncio.sleep(delay)
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def record(self, outcome: str, latency: float, retry_after: float = None):
+        """Feed back one fetch; call it while still holding the slot."""
+        now = self._clock()
+        self._outcomes.append(outcome)
+        if outcome == OK:
+            self._consecutive_overload = 0
+            self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+            if self.state == "half_open":
+                self.state = "closed"
+                self._cooldown = self.base_cooldown
+                self._outcomes.clear()
+                self._event("resumed")
+                logger.info("Circuit breaker closed: resuming at concurrency %d", int(self.limit))
+            elif (
+                self._in_flight >= int(self.limit)
+                and self.limit < self.maximum
+                and self._latency <= self.target_latency
+                and self.error_rate < HEALTHY_ERROR_RATE
+            ):
+                before = int(self.limit)
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                if int(self.limit) > before:
+                    self.increases += 1
+                    self._event("increase")
+                    logger.info("Site healthy (%.1fs per fetch): concurrency -> %d", self._latency, int(self.limit))
+        elif outcome in OVERLOAD:
+            self._consecutive_overload += 1
+            if self.state == "open":
+                pass  # a fetch started before the breaker opened
+            elif self.state == "half_open":
+                self._open(now, self._cooldown * 2, f"probe failed ({outcome})")
+            elif outcome == THROTTLED and retry_after:
+                self._open(now, retry_after, "429 with Retry-After", escalate=False)
+            elif self._trip_reason():
+                self._open(now, self._cooldown, self._trip_reason())
+            # one cut per round trip: fetches already in flight report the same congestion
+            elif now - self._last_decrease >= max(1.0, self._latency or 1.0):
+                self._last_decrease = now
+                before = int(self.limit)
+                self.limit = max(float(self.minimum), self.limit / 2)
+                self.decreases += 1
+                self._event(f"decrease ({outcome})")
+                if int(self.limit) < before:
+                    logger.warning("Site struggling (%s): concurrency -> %d", outcome, int(self.limit))
+        else:
+            self._consecutive_overload = 0
+
+    def _trip_reason(self) -> str | None:
+        if self._consecutive_overload >= BREAKER_CONSECUTIVE:
+            return f"{self._consecutive_overload} overloaded fetches in a row"
+        if len(self._outcomes) >= BREAKER_MIN_SAMPLES and self.overload_rate >= BREAKER_ERROR_RATE:
+            return f"{self.overload_rate:.0%} of recent fetches overloaded"
+        return None
+
+    def _open(self, now: float, seconds: float, reason: str, escalate: bool = True):
+        seconds = min(BREAKER_MAX_COOLDOWN, max(1.0, seconds))
+        if escalate:
+            self._cooldown = seconds
+        self.state = "open"
+        self.trips += 1
+        self.paused_seconds += seconds
+        self._open_until = now + seconds
+        self.limit = float(self.minimum)
+        self._last_decrease = now
+        self._consecutive_overload = 0
+        self._event(f"open: {reason}")
+        logger.warning("Circuit breaker open for %.0fs: %s", seconds, reason)
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "limit": round(self.limit, 2),
+            "min": self.minimum,
+            "max": self.maximum,
+            "in_flight": self._in_flight,
+            "latency_ewma": round(self._latency, 3) if self._latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "overload_rate": round(self.overload_rate, 3),
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "trips": self.trips,
+            "paused_seconds": round(self.paused_seconds, 1),
+            "events": list(self._events),
+        }
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+"""
+Scraper worker: runs the scrape pipeline in its own process so Chromium
+stalls and large JSON writes never block the bot's event loop.
+
+Listens on a Unix socket and speaks newline-delimited JSON. A client sends
+one request per connection:
+
+    {"op": "ping"}                                  -> {"event": "pong", "busy": false, "pid": 123}
+    {"op": "scrape", "force": false, "categories": ["national"], "stream": true}
+        -> {"event": "progress", "message": "..."}  (zero or more)
+        -> {"event": "article", "article": {...}}   (with "stream", one per extracted article)
+        -> {"event": "done", "ok": true, "run_id": "..."}
+
+Jobs run one at a time; a client that disconnects does not cancel its job.
+
+Run standalone: python -m scraper.worker [--socket data/scraper.sock]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+from pathlib import Path
+
+from scraper.models import Article
+from scraper.persistence import DATA_DIR
+from scraper.telemetry import RunTelemetry
+
+logger = logging.getLogger("scraper_worker")
+
+SOCKET_PATH = Path(os.getenv("SCRAPER_SOCKET") or DATA_DIR / "scraper.sock")
+# Unix sockets are unavailable on some platforms (older Windows); callers fall back to in-process scraping
+IPC_AVAILABLE = hasattr(socket, "AF_UNIX")
+
+
+async def _send(writer: asyncio.StreamWriter, payload: dict):
+    writer.write(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+    await writer.drain()
+
+
+class ScraperWorker:
+    def __init__(self, socket_path: Path = SOCKET_PATH):
+        self.socket_path = Path(socket_path)
+        self._job_lock = asyncio.Lock()
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = json.loads(await reader.readline() or b"{}")
+        except Exception:
+            request = {}
+        op = request.get("op")
+        try:
+            if op == "ping":
+                await _send(writer, {"event": "pong", "busy": self._job_lock.locked(), "pid": os.getpid()})
+            elif op == "scrape":
+                await self._scrape(request, writer)
+            else:
+                await _send(writer, {"event": "error", "message": f"unknown op {op!r}"})
+        except (ConnectionError, BrokenPipeError):
+            logger.debug("Client went away before %s finished", op)
+        finally:
+            writer.close()
+
+    async def _scrape(self, request: dict, writer: asyncio.StreamWriter):
+        # imported here so `ping` answers quickly and the module stays light for clients
+        from scraper.pipeline import run_pipeline
+
+        connected = True
+
+        async def progress(message):
+            nonlocal connected
+            if not connected:
+                return
+            try:
+                await _send(writer, {"event": "progress", "message": message})
+            except (ConnectionError, BrokenPipeError):
+                connected = False
+
+        async def article(entry):
+            nonlocal connected
+            if not connected:
+                return
+            try:
+                await _send(writer, {"event": "article", "article": entry.to_dict()})
+            except (ConnectionError, BrokenPipeError):
+                connected = False
+
+        categories = request.get("categories")
+        if self._job_lock.locked():
+            await progress("[SCRAPER] Waiting for the running scrape to finish...")
+        async with self._job_lock:
+            telemetry = RunTelemetry(trigger="worker", categories=categories)
+            ok = await run_pipeline(
+                bool(request.get("force")),
+                categories,
+                progress,
+                telemetry,
+                article if request.get("stream") else None,
+            )
+            telemetry.save(ok=ok)
+        if connected:
+            await _send(writer, {"event": "done", "ok": ok, "run_id": telemetry.run_id})
+
+    async def serve(self):
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            # a socket file left by a dead worker; refuse to steal one that still answers
+            if await ping(self.socket_path):
+                raise SystemExit(f"Another scraper worker is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        logger.info("Scraper worker %d listening on %s", os.getpid(), self.socket_path)
+        # stop cleanly on SIGTERM (bot shutdown, docker stop); a job in flight
+        # is cancelled and resumes from the scrape queue next time
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        try:
+            async with self._server:
+                await stop.wait()
+        finally:
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+async def ping(socket_path: Path = SOCKET_PATH, timeout: float = 2.0) -> bool:
+    """True if a worker answers on `socket_path`."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(str(socket_path)), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    try:
+        await _send(writer, {"op": "ping"})
+        reply = json.loads(await asyncio.wait_for(reader.readline(), timeout) or b"{}")
+        return reply.get("event") == "pong"
+    except Exception:
+        return False
+    finally:
+        writer.close()
+
+
+async def request_scrape(
+    force: bool = False,
+    categories: list = None,
+    progress_callback=None,
+    socket_path: Path = SOCKET_PATH,
+    article_callback=None,
+):
+    """
+    Ask the worker to run a scrape and relay its progress messages (and, with
+    `article_callback`, each article as the worker extracts it).
+    Returns the job's success, or None if no worker could be reached.
+    A worker that dies mid-job counts as a failed scrape.
+    """
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(socket_path), limit=2**20)
+    except OSError:
+        return None
+    try:
+        await _send(
+            writer,
+            {"op": "scrape", "force": force, "categories": categories, "stream": article_callback is not None},
+        )
+        while True:
+            line = await reader.readline()
+            if not line:
+                logger.error("Scraper worker closed the connection before the job finished")
+                return False
+            event = json.loads(line)
+            if event.get("event") == "progress":
+                if progress_callback:
+                    await progress_callback(event.get("message", ""))
+            elif event.get("event") == "article":
+                if article_callback:
+                    await article_callback(Article.from_dict(event.get("article") or {}))
+            elif event.get("event") == "done":
+                return bool(event.get("ok"))
+            elif event.get("event") == "error":
+                logger.error("Scraper worker error: %s", event.get("message"))
+                return False
+    finally:
+        writer.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+    parser = argparse.ArgumentParser(description="Run the scraper as a separate worker process")
+    parser.add_argument("--socket", type=Path, default=SOCKET_PATH, help="Unix socket to listen on")
+    args = parser.parse_args()
+    if not IPC_AVAILABLE:
+        raise SystemExit("Unix sockets are not available on this platform; the bot scrapes in-process instead.")
+    asyncio.run(ScraperWorker(args.socket).serve())
@@ -0,0 +1,180 @@
+"""
+Shared durable state for the bot cogs.
+
+A small SQLite key/value store: each namespace (e.g. "subscriptions",
+"schedule") maps string keys to JSON values. Cogs keep their working copy in
+memory and write only the keys a command touched, inside a transaction, so a
+change costs one row write instead of a whole-file rewrite.
+
+Commands run on the bot's event loop and mutate memory + commit without
+awaiting in between, so concurrent commands from many guild members are
+serialized naturally; the lock additionally guards callers on other threads.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from scraper.persistence import DATA_DIR, record_write
+
+logger = logging.getLogger("state_store")
+
+STATE_DB = DATA_DIR / "state.db"
+
+
+class Transaction:
+    """Write handle yielded by StateStore.transaction()."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def put(self, namespace: str, key: str, value):
+        self._conn.execute(
+            "INSERT INTO kv (namespace, key, value) VALUES (?, ?, ?) "
+            "ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value",
+            (namespace, key, json.dumps(value, ensure_ascii=False)),
+        )
+
+    def delete(self, namespace: str, key: str):
+        self._conn.execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+
+class StateStore:
+    def __init__(self, path: Path = STATE_DB):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+
+    def load(self, namespace: str) -> dict:
+        """Return every key in `namespace` as {key: value}."""
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM kv WHERE namespace = ?", (namespace,)).fetchall()
+        result = {}
+        for key, value in rows:
+            try:
+                result[key] = json.loads(value)
+            except Exception as e:
+                logger.warning("Skipping unreadable %s/%s: %s", namespace, key, e)
+        return result
+
+    def get(self, namespace: str, key: str, default=None):
+        """Return one value from `namespace`, or `default` if it is missing or unreadable."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        if row is None:
+            return default
+        try:
+            return json.loads(row[0])
+        except Exception as e:
+            logger.warning("Skipping unreadable %s/%s: %s", namespace, key, e)
+            return default
+
+    @contextmanager
+    def transaction(self):
+        """Apply every put/delete made through the yielded Transaction atomically."""
+        with self._lock:
+            start = time.perf_counter()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield Transaction(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            record_write(self._path.name, time.perf_counter() - start)
+
+    def migrate_json(self, namespace: str, legacy_file: Path, convert):
+        """
+        One-time import of a legacy JSON file into `namespace`.
+
+        `convert` maps the parsed file to {key: value}. A marker in the "meta"
+        namespace ensures the import never runs twice.
+        """
+        marker = f"migrated:{namespace}"
+        if marker in self.load("meta") or not legacy_file.exists():
+            return
+        try:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                items = convert(json.load(f))
+        except Exception as e:
+            logger.warning("Failed to migrate %s: %s", legacy_file.name, e)
+            return
+        with self.transaction() as tx:
+            for key, value in items.items():
+                tx.put(namespace, key, value)
+            tx.put("meta", marker, str(legacy_file.name))
+        logger.info("Migrated %d %s entries from %s", len(items), namespace, legacy_file.name)
+
+
+class InvertedIndex:
+    """
+    Incrementally maintained key -> members map, e.g. category -> channels.
+
+    `set()` diffs a member's old and new keys, so each update costs
+    O(changed keys) and lookups by key are O(members of that key).
+    Members registered with no keys are tracked as idle.
+    """
+
+    def __init__(self):
+        self._by_key = {}
+        self._keys = {}
+        self._idle = set()
+
+    def set(self, member, keys):
+        new = set(keys)
+        old = self._keys.get(member, set())
+        for key in old - new:
+            members = self._by_key[key]
+            members.discard(member)
+            if not members:
+                del self._by_key[key]
+        for key in new - old:
+            self._by_key.setdefault(key, set()).add(member)
+        self._keys[member] = new
+        if new:
+            self._idle.discard(member)
+        else:
+            self._idle.add(member)
+
+    def discard(self, member):
+        if member not in self._keys:
+            return
+        self.set(member, ())
+        del self._keys[member]
+        self._idle.discard(member)
+
+    def members(self, key) -> set:
+        return self._by_key.get(key, set())
+
+    def keys(self) -> set:
+        """Keys with at least one member."""
+        return set(self._by_key)
+
+    def idle(self) -> set:
+        return self._idle
+
+
+_store = None
+
+
+def get_state_store() -> StateStore:
+    """Return the process-wide StateStore, opening it on first use."""
+    global _store
+    if _store is None:
+        _store = StateStore()
+    return _store